@@ -3,6 +3,7 @@ import re
 import json
 import glob
 import shutil
+import asyncio
 import discord
 import logging
 from datetime import datetime
@@ -12,7 +13,8 @@ from discord.ext import commands
 from typing import Optional
 from cogs.admin_sync import push_config, push_earnings
 from config import settings
-from utils import file_handlers, validators
+from utils import file_handlers, validators, model_index, snapshot_store, admin_jobs
+from utils.earnings_snapshot import EarningsSnapshot
 
 logger = logging.getLogger("xof_calculator.admin_slash")
 
@@ -1108,72 +1110,31 @@ class AdminSlashCommands(commands.Cog, name="admin"):
         self, 
         interaction: discord.Interaction,
         sale_ids: Optional[list[str]] = None,
-        users: Optional[list[discord.User]] = None
+        users: Optional[list[discord.User]] = None,
+        snapshot: Optional[EarningsSnapshot] = None
     ):
-        """Helper function to remove sales by IDs or all sales for multiple users."""
-        earnings_data = await file_handlers.load_json(
-            settings.get_guild_earnings_path(interaction.guild.id),
-            {}
-        )
-
-        removed_entries = {}
-        total_removed = 0
+        """
+        Helper function to remove sales by IDs or all sales for multiple users.
 
+        A snapshot kept from the confirmation prompt is reused if the
+        earnings haven't been saved since; otherwise they are reloaded.
+        """
         try:
-            if sale_ids is None:
-                # Remove all entries for specified users
-                for user in users:
-                    user_key = f"<@{user.id}>"
-                    if user_key in earnings_data:
-                        count = len(earnings_data[user_key])
-                        if count > 0:
-                            earnings_data[user_key] = []
-                            removed_entries[user_key] = {
-                                'count': count,
-                                'user_obj': user
-                            }
-                            total_removed += count
-            else:
-                # Remove specific IDs from specified users (or all users if None)
-                sale_ids = list(set(sale_ids))
-                target_users = users or [None]  # [None] represents "all users"
-                
-                for user in target_users:
-                    if user:
-                        user_key = f"<@{user.id}>"
-                        entries = earnings_data.get(user_key, [])
-                        original_count = len(entries)
-                        earnings_data[user_key] = [e for e in entries if e["id"] not in sale_ids]
-                        removed_count = original_count - len(earnings_data[user_key])
-                        if removed_count > 0:
-                            removed_entries[user_key] = {
-                                'count': removed_count,
-                                'user_obj': user
-                            }
-                            total_removed += removed_count
-                    else:
-                        # Process all users
-                        for user_key, entries in list(earnings_data.items()):
-                            original_count = len(entries)
-                            earnings_data[user_key] = [e for e in entries if e["id"] not in sale_ids]
-                            removed_count = original_count - len(earnings_data[user_key])
-                            if removed_count > 0:
-                                removed_entries[user_key] = {
-                                    'count': removed_count,
-                                    'user_obj': None
-                                }
-                                total_removed += removed_count
-
-            if not removed_entries:
+            if snapshot is None or not snapshot.is_current():
+                snapshot = await EarningsSnapshot.load(interaction.guild.id)
+
+            user_objs = {f"<@{user.id}>": user for user in users or []}
+            matches = snapshot.match(sale_ids, list(user_objs) if users else None)
+            if not matches:
                 return (False, "❌ No matching sales found for the specified criteria.")
 
-            success = await file_handlers.save_json(
-                settings.get_guild_earnings_path(interaction.guild.id),
-                earnings_data
-            )
+            previous_fingerprint = snapshot.fingerprint
+            success = await snapshot.remove(matches)
 
             if not success:
                 return (False, "❌ Failed to save earnings data.")
+            removed_ids = [sale_id for ids in matches.values() for sale_id in ids]
+            model_index.apply_changes(interaction.guild.id, previous_fingerprint, removed_ids=removed_ids)
 
             # Build success message with proper user resolution
             message = []
@@ -1184,15 +1145,15 @@ class AdminSlashCommands(commands.Cog, name="admin"):
             else:
                 message.append("✅ All sales removed for:")
 
-            for user_key, data in removed_entries.items():
-                user_obj = data['user_obj'] or interaction.guild.get_member(int(re.search(r'\d+', user_key).group()))
+            for user_key, ids in matches.items():
+                user_obj = user_objs.get(user_key) or interaction.guild.get_member(int(re.search(r'\d+', user_key).group()))
                 if user_obj:
                     name = f"{user_obj.display_name} (@{user_obj.name})"
                 else:
                     name = f"Unknown ({user_key})"
-                message.append(f"- `{name}`: {data['count']} entries")
+                message.append(f"- `{name}`: {len(ids)} entries")
 
-            message.append(f"\nTotal removed: {total_removed} entries")
+            message.append(f"\nTotal removed: {len(removed_ids)} entries")
             return (True, "\n".join(message))
 
         except Exception as e:
@@ -1259,50 +1220,19 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                 return
             sale_id_list = list(set(sale_id_list))
 
-        # Count affected entries
-        earnings_data = await file_handlers.load_json(
-            settings.get_guild_earnings_path(interaction.guild.id),
-            {}
-        )
-
-        total_entries = 0
-        user_counts = {}
-
+        # Count affected entries from a snapshot kept for the confirm step
         try:
-            if sale_id_list:
-                # Count entries matching sale IDs
-                if user_objs:
-                    for user in user_objs:
-                        user_key = f"<@{user.id}>"
-                        entries = earnings_data.get(user_key, [])
-                        count = sum(1 for e in entries if e["id"] in sale_id_list)
-                        if count > 0:
-                            user_counts[user_key] = {
-                                'count': count,
-                                'user_obj': user
-                            }
-                            total_entries += count
-                else:
-                    # Count across all users
-                    for user_key, entries in earnings_data.items():
-                        count = sum(1 for e in entries if e["id"] in sale_id_list)
-                        if count > 0:
-                            user_counts[user_key] = {
-                                'count': count,
-                                'user_obj': interaction.guild.get_member(int(re.search(r'\d+', user_key).group()))
-                            }
-                            total_entries += count
-            else:
-                # Count all entries for specified users
-                for user in user_objs:
-                    user_key = f"<@{user.id}>"
-                    count = len(earnings_data.get(user_key, []))
-                    if count > 0:
-                        user_counts[user_key] = {
-                            'count': count,
-                            'user_obj': user
-                        }
-                        total_entries += count
+            snapshot = await EarningsSnapshot.load(interaction.guild.id)
+            matches = snapshot.match(sale_id_list, [f"<@{user.id}>" for user in user_objs] if user_objs else None)
+            user_objs_by_key = {f"<@{user.id}>": user for user in user_objs}
+            user_counts = {
+                user_key: {
+                    'count': len(ids),
+                    'user_obj': user_objs_by_key.get(user_key) or interaction.guild.get_member(int(re.search(r'\d+', user_key).group()))
+                }
+                for user_key, ids in matches.items()
+            }
+            total_entries = sum(len(ids) for ids in matches.values())
 
             if not user_counts:
                 await interaction.response.send_message(
@@ -1345,7 +1275,8 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                 success, result = await self.remove_sale_by_id(
                     interaction,
                     sale_id_list,
-                    user_objs if user_objs else None
+                    user_objs if user_objs else None,
+                    snapshot
                 )
                 await interaction.response.edit_message(content=result, view=None)
 
@@ -1420,27 +1351,37 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                 await interaction.edit_original_response(content="❌ Server's data directory not found!", view=None)
                 return
 
-            backup_files = glob.glob(os.path.join(data_dir, "*.bak"))
+            earnings_file = settings.get_guild_earnings_path(interaction.guild.id)
+            backup_files = [
+                bak_file for bak_file in glob.glob(os.path.join(data_dir, "*.bak"))
+                if os.path.basename(bak_file) != os.path.basename(earnings_file) + ".bak"
+            ]
 
             if not backup_files:
                 await interaction.edit_original_response(content="❌ No backup files found!", view=None)
                 return
 
-            restored_count = 0
-            failed_count = 0
-
-            for bak_file in backup_files:
-                earnings_file = settings.get_guild_earnings_path(interaction.guild.id)
-                if os.path.basename(bak_file) == os.path.basename(earnings_file) + ".bak":
-                    continue
+            def restore_files(job: admin_jobs.AdminJob):
+                restored_count = 0
+                failed_count = 0
+                for done, bak_file in enumerate(backup_files, start=1):
+                    try:
+                        original_file = bak_file[:-4]  # Remove .bak extension
+                        shutil.copy2(bak_file, original_file)
+                        restored_count += 1
+                    except Exception as e:
+                        print(f"Failed to restore {bak_file}: {str(e)}")
+                        failed_count += 1
+                    job.progress(done, len(backup_files))
+                return restored_count, failed_count
 
-                try:
-                    original_file = bak_file[:-4]  # Remove .bak extension
-                    shutil.copy2(bak_file, original_file)
-                    restored_count += 1
-                except Exception as e:
-                    print(f"Failed to restore {bak_file}: {str(e)}")
-                    failed_count += 1
+            try:
+                # Not cancellable: stopping halfway would mix restored and current files
+                async with admin_jobs.admin_job(interaction.guild.id, "Backup restore", interaction, cancellable=False) as job:
+                    restored_count, failed_count = await job.run(restore_files, job, status="Restoring")
+            except admin_jobs.JobBusy as e:
+                await interaction.edit_original_response(content=f"❌ Another admin job is running for this server: {e}", view=None)
+                return
 
             # Prepare the response content
             if failed_count == 0:
@@ -1918,26 +1859,31 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                     )
                     return
 
-                backup_time = datetime.now().strftime("%Y%m%d-%H%M%S")
-                backup_path = f"{target_dir}_backup_{backup_time}"
+                await interaction.response.defer(ephemeral=ephemeral)
                 try:
-                    shutil.copytree(target_dir, backup_path)
+                    async with admin_jobs.admin_job(interaction.guild.id, "Config backup", interaction) as job:
+                        snapshot = await job.run(
+                            snapshot_store.create_snapshot, interaction.guild.id, "config", target_dir,
+                            progress=job.progress, status="Backing up"
+                        )
+                    if snapshot is None:
+                        await interaction.edit_original_response(content="❌ No configuration found to backup", view=None)
+                        return
                     embed = discord.Embed(
                         title="Config Backup Created",
                         description="A backup of the current server configuration was created.",
                         color=discord.Color.green()
                     )
                     embed.add_field(
-                        name="Backup Location",
-                        value=f"`{os.path.basename(backup_path)}`",
+                        name="Backup ID",
+                        value=f"`{snapshot['id']}`",
                         inline=False
                     )
-                    await interaction.response.send_message(embed=embed, ephemeral=ephemeral)
+                    await interaction.edit_original_response(content=None, embed=embed, view=None)
+                except admin_jobs.JobBusy as e:
+                    await interaction.edit_original_response(content=f"❌ Another admin job is running for this server: {e}", view=None)
                 except Exception as e:
-                    await interaction.response.send_message(
-                        f"❌ Backup failed: {str(e)}",
-                        ephemeral=ephemeral
-                    )
+                    await interaction.edit_original_response(content=f"❌ Backup failed: {str(e)}", view=None)
                 return
 
             source_dir = os.path.join("data", "config", source_id)
@@ -1956,16 +1902,6 @@ class AdminSlashCommands(commands.Cog, name="admin"):
             skipped_files = []
             errors = []
 
-            # Backup handling
-            backup_path = None
-            if create_backup and os.path.exists(target_dir):
-                backup_time = datetime.now().strftime("%Y%m%d-%H%M%S")
-                backup_path = f"{target_dir}_backup_{backup_time}"
-                try:
-                    shutil.copytree(target_dir, backup_path)
-                except Exception as e:
-                    errors.append(f"Backup failed: {str(e)}")
-
             def should_copy(file_path: str) -> bool:
                 fname = os.path.basename(file_path).lower()
                 
@@ -1979,40 +1915,68 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                     
                 return True
 
-            # File operations
-            try:
-                for root, dirs, files in os.walk(source_dir):
-                    relative_path = os.path.relpath(root, source_dir)
-                    dest_root = os.path.join(target_dir, relative_path)
-                    
-                    os.makedirs(dest_root, exist_ok=True)
-                    
-                    for file in files:
-                        src_path = os.path.join(root, file)
-                        dest_path = os.path.join(dest_root, file)
-                        
-                        if not should_copy(src_path):
-                            skipped_files.append(file)
-                            continue
-                            
+            def copy_files(job: admin_jobs.AdminJob):
+                """Copy matching files; runs in a worker thread"""
+                try:
+                    sources = []
+                    for root, dirs, files in os.walk(source_dir):
+                        relative_path = os.path.relpath(root, source_dir)
+                        dest_root = os.path.join(target_dir, relative_path)
+                        os.makedirs(dest_root, exist_ok=True)
+                        sources.extend((os.path.join(root, file), os.path.join(dest_root, file), file) for file in files)
+                except Exception as e:
+                    errors.append(f"Directory traversal failed: {str(e)}")
+                    return
+
+                for done, (src_path, dest_path, file) in enumerate(sources, start=1):
+                    if not should_copy(src_path):
+                        skipped_files.append(file)
+                    else:
                         try:
                             shutil.copy2(src_path, dest_path)
                             copied_files.append(file)
                         except Exception as e:
                             errors.append(f"{file}: {str(e)}")
-            except Exception as e:
-                errors.append(f"Directory traversal failed: {str(e)}")
+                    job.progress(done, len(sources))
+
+            await interaction.response.defer(ephemeral=ephemeral)
+            backup_id = None
+            cancelled = False
+            try:
+                async with admin_jobs.admin_job(interaction.guild.id, "Config copy", interaction) as job:
+                    # Backup handling
+                    if create_backup and os.path.exists(target_dir):
+                        try:
+                            snapshot = await job.run(
+                                snapshot_store.create_snapshot, interaction.guild.id, "config", target_dir,
+                                progress=job.progress, status="Backing up"
+                            )
+                            backup_id = snapshot["id"] if snapshot else None
+                        except admin_jobs.JobCancelled:
+                            raise
+                        except Exception as e:
+                            errors.append(f"Backup failed: {str(e)}")
+                    job.check_cancelled()
+
+                # File operations; not cancellable, stopping halfway would leave a mix of old and copied files
+                async with admin_jobs.admin_job(interaction.guild.id, "Config copy", interaction, cancellable=False) as job:
+                    await job.run(copy_files, job, status="Copying files")
+            except admin_jobs.JobBusy as e:
+                await interaction.edit_original_response(content=f"❌ Another admin job is running for this server: {e}", view=None)
+                return
+            except admin_jobs.JobCancelled:
+                cancelled = True
 
             # Build result embed
             embed = discord.Embed(
-                title="Config Copy Results",
-                color=discord.Color.orange() if errors else discord.Color.green()
+                title="Config Copy Cancelled" if cancelled else "Config Copy Results",
+                color=discord.Color.orange() if errors or cancelled else discord.Color.green()
             )
             
-            if backup_path:
+            if backup_id:
                 embed.add_field(
                     name="Backup Created",
-                    value=f"`{os.path.basename(backup_path)}`",
+                    value=f"`{backup_id}`",
                     inline=False
                 )
                 
@@ -2037,7 +2001,7 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                     value=f"```{sample_copied}```",
                     inline=False
                 )
-            else:
+            elif not cancelled:
                 embed.add_field(
                     name="⚠️ Notice",
                     value="No files were copied based on filters",
@@ -2055,21 +2019,24 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                     inline=False
                 )
 
-            await interaction.response.send_message(embed=embed, ephemeral=ephemeral)
+            await interaction.edit_original_response(content=None, embed=embed, view=None)
 
         except Exception as e:
             logger.error(f"Config copy failed: {str(e)}", exc_info=True)
-            await interaction.response.send_message(
-                f"❌ Critical error during copy: {str(e)}",
-                ephemeral=ephemeral
-            )
+            if interaction.response.is_done():
+                await interaction.edit_original_response(content=f"❌ Critical error during copy: {str(e)}", embed=None, view=None)
+            else:
+                await interaction.response.send_message(
+                    f"❌ Critical error during copy: {str(e)}",
+                    ephemeral=ephemeral
+                )
 
     @app_commands.command(name="manage-backups", description="Manage configuration or earnings backups")
     @app_commands.default_permissions(administrator=True)
     @app_commands.describe(
         backup_type="Type of backups to manage",
         action="Action to perform",
-        backup_ids="Comma-separated backup IDs to remove (for 'remove' action)"
+        backup_ids="Comma-separated backup IDs (to remove, or one ID to restore)"
     )
     @app_commands.choices(backup_type=[
         app_commands.Choice(name="Configuration", value="config"),
@@ -2077,7 +2044,8 @@ class AdminSlashCommands(commands.Cog, name="admin"):
     ])
     @app_commands.choices(action=[
         app_commands.Choice(name="List", value="list"),
-        app_commands.Choice(name="Remove", value="remove")
+        app_commands.Choice(name="Remove", value="remove"),
+        app_commands.Choice(name="Restore", value="restore")
     ])
     async def manage_backups(
         self,
@@ -2091,31 +2059,34 @@ class AdminSlashCommands(commands.Cog, name="admin"):
         guild_id = str(interaction.guild.id)
         
         try:
-            # Determine paths based on backup type
+            # Snapshots come from the manifest index; directories from older versions are still listed and removable
             if backup_type == "config":
-                base_dir = os.path.join("data", "config")
+                base_dir = settings.CONFIG_DIR
                 pattern = f"{guild_id}_backup_*"
                 backup_name = "Configuration"
             else:
-                base_dir = os.path.join("data", "earnings")
+                base_dir = settings.EARNINGS_DIR
                 pattern = f"{guild_id}_earnings_backup_*"
                 backup_name = "Earnings"
 
+            def legacy_path(backup_id: str) -> str:
+                return os.path.join(base_dir, f"{guild_id}_{'earnings_' if backup_type == 'earnings' else ''}backup_{backup_id}")
+
             if action == "list":
-                backup_dirs = glob.glob(os.path.join(base_dir, pattern))
+                snapshots = await asyncio.to_thread(snapshot_store.list_snapshots, guild_id, backup_type)
                 backups = []
                 
-                for dir_path in backup_dirs:
-                    dir_name = os.path.basename(dir_path)
-                    backup_id = dir_name.split("_backup_")[-1]
-                    
+                for snapshot in snapshots:
+                    formatted_date = datetime.fromisoformat(snapshot["created_at"]).strftime("%Y-%m-%d %H:%M:%S")
+                    backups.append((snapshot["id"], f"{snapshot['files']} files, {snapshot['size'] / 1024:,.1f} KiB", formatted_date))
+
+                for dir_path in glob.glob(os.path.join(base_dir, pattern)):
+                    backup_id = os.path.basename(dir_path).split("_backup_")[-1]
                     try:
-                        dt = datetime.strptime(backup_id, "%Y%m%d-%H%M%S")
-                        formatted_date = dt.strftime("%Y-%m-%d %H:%M:%S")
+                        formatted_date = datetime.strptime(backup_id, "%Y%m%d-%H%M%S").strftime("%Y-%m-%d %H:%M:%S")
                     except ValueError:
                         formatted_date = "Unknown date"
-                    
-                    backups.append((backup_id, dir_name, formatted_date))
+                    backups.append((backup_id, "Legacy directory backup", formatted_date))
                 
                 # Sort by date
                 backups.sort(key=lambda x: x[0], reverse=True)
@@ -2129,10 +2100,10 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                     embed.description = "No backups found"
                 else:
                     backup_list = []
-                    for bid, dir_name, date in backups:
-                        backup_list.append(f"• **{bid}**\n  Created: {date}\n  Directory: `{dir_name}`")
+                    for bid, details, date in backups:
+                        backup_list.append(f"• **{bid}**\n  Created: {date}\n  Contents: {details}")
                     
-                    embed.description = "\n\n".join(backup_list)
+                    embed.description = "\n\n".join(backup_list)[:4096]
                     embed.set_footer(text=f"Total {backup_name.lower()} backups: {len(backups)}")
                 
                 await interaction.response.send_message(embed=embed, ephemeral=ephemeral)
@@ -2146,27 +2117,35 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                     return
                     
                 backup_id_list = [bid.strip() for bid in backup_ids.split(',')]
-                removed = []
-                errors = []
-                
-                for backup_id in backup_id_list:
-                    # Validate ID format
-                    if not re.fullmatch(r"\d{8}-\d{6}", backup_id):
-                        errors.append(f"Invalid ID: {backup_id}")
-                        continue
-                    
-                    dir_name = f"{guild_id}_{'earnings_' if backup_type == 'earnings' else ''}backup_{backup_id}"
-                    backup_path = os.path.join(base_dir, dir_name)
-                    
-                    if not os.path.exists(backup_path):
-                        errors.append(f"Backup {backup_id} not found")
-                        continue
-                    
-                    try:
-                        shutil.rmtree(backup_path)
-                        removed.append(backup_id)
-                    except Exception as e:
-                        errors.append(f"Failed to remove {backup_id}: {str(e)}")
+                errors = [f"Invalid ID: {bid}" for bid in backup_id_list if not re.fullmatch(r"\d{8}-\d{6}", bid)]
+                valid_ids = [bid for bid in backup_id_list if re.fullmatch(r"\d{8}-\d{6}", bid)]
+
+                await interaction.response.defer(ephemeral=ephemeral)
+                try:
+                    async with admin_jobs.admin_job(interaction.guild.id, f"{backup_name} backup removal", interaction) as job:
+                        removed, missing = await job.run(
+                            snapshot_store.delete_snapshots, guild_id, backup_type, valid_ids,
+                            status="Removing snapshots"
+                        )
+                        for done, backup_id in enumerate(missing, start=1):
+                            backup_path = legacy_path(backup_id)
+                            if not os.path.exists(backup_path):
+                                errors.append(f"Backup {backup_id} not found")
+                                continue
+
+                            try:
+                                await job.run(shutil.rmtree, backup_path, status="Removing legacy backups")
+                                removed.append(backup_id)
+                            except admin_jobs.JobCancelled:
+                                raise
+                            except Exception as e:
+                                errors.append(f"Failed to remove {backup_id}: {str(e)}")
+                            job.progress(done, len(missing))
+                except admin_jobs.JobBusy as e:
+                    await interaction.edit_original_response(content=f"❌ Another admin job is running for this server: {e}", view=None)
+                    return
+                except admin_jobs.JobCancelled:
+                    errors.append("Cancelled before all backups were removed")
                 
                 # Build results embed
                 embed = discord.Embed(
@@ -2188,14 +2167,73 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                         inline=False
                     )
                 
-                await interaction.response.send_message(embed=embed, ephemeral=ephemeral)
+                await interaction.edit_original_response(content=None, embed=embed, view=None)
+
+            elif action == "restore":
+                backup_id = backup_ids.strip() if backup_ids else ""
+                if not re.fullmatch(r"\d{8}-\d{6}", backup_id):
+                    await interaction.response.send_message(
+                        "❌ Please provide exactly one backup ID to restore",
+                        ephemeral=ephemeral
+                    )
+                    return
+
+                snapshots = await asyncio.to_thread(snapshot_store.list_snapshots, guild_id, backup_type)
+                if not any(snapshot["id"] == backup_id for snapshot in snapshots):
+                    await interaction.response.send_message(f"❌ Backup {backup_id} not found", ephemeral=ephemeral)
+                    return
+
+                view = discord.ui.View()
+                view.add_item(discord.ui.Button(label="Confirm", style=discord.ButtonStyle.danger, custom_id="confirm_restore_snapshot"))
+                view.add_item(discord.ui.Button(label="Cancel", style=discord.ButtonStyle.success, custom_id="cancel_restore_snapshot"))
+
+                async def confirm_callback(interaction: discord.Interaction):
+                    await interaction.response.defer(ephemeral=ephemeral)
+                    target_dir = os.path.join(base_dir, guild_id)
+                    try:
+                        # Not cancellable: a partial restore would mix two snapshots
+                        async with admin_jobs.admin_job(interaction.guild.id, f"{backup_name} restore", interaction, cancellable=False) as job:
+                            restored = await job.run(
+                                snapshot_store.restore_snapshot, guild_id, backup_type, backup_id, target_dir,
+                                progress=job.progress, status="Restoring"
+                            )
+                    except admin_jobs.JobBusy as e:
+                        await interaction.edit_original_response(content=f"❌ Another admin job is running for this server: {e}", view=None)
+                        return
+                    except Exception as e:
+                        logger.error(f"Backup restore failed: {str(e)}", exc_info=True)
+                        await interaction.edit_original_response(content=f"❌ Restore failed: {str(e)}", view=None)
+                        return
+
+                    if backup_type == "config":
+                        await push_config(guild_id)
+                    else:
+                        await push_earnings(guild_id)
+                    await interaction.edit_original_response(
+                        content=f"✅ Restored {len(restored)} files from {backup_name.lower()} backup `{backup_id}`.",
+                        view=None
+                    )
+
+                async def cancel_callback(interaction: discord.Interaction):
+                    await interaction.response.edit_message(content="❌ Canceled.", view=None)
+
+                view.children[0].callback = confirm_callback
+                view.children[1].callback = cancel_callback
+                await interaction.response.send_message(
+                    content=f"‼️🚨‼ Are you sure you want to restore {backup_name.lower()} backup `{backup_id}`? Current files will be overwritten.",
+                    view=view,
+                    ephemeral=ephemeral
+                )
         
         except Exception as e:
             logger.error(f"Backup management error: {str(e)}", exc_info=True)
-            await interaction.response.send_message(
-                f"❌ Critical error: {str(e)}",
-                ephemeral=ephemeral
-            )
+            if interaction.response.is_done():
+                await interaction.edit_original_response(content=f"❌ Critical error: {str(e)}", embed=None, view=None)
+            else:
+                await interaction.response.send_message(
+                    f"❌ Critical error: {str(e)}",
+                    ephemeral=ephemeral
+                )
 
     @app_commands.command(name="copy-earnings-from-the-server", description="Copy earnings data from another server (WARNING: Overwrites current data)")
     @app_commands.default_permissions(administrator=True)
@@ -2235,13 +2273,14 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                     )
                     return
 
-                backup_time = datetime.now().strftime("%Y%m%d-%H%M%S")
-                backup_dir_name = f"{interaction.guild.id}_earnings_backup_{backup_time}"
-                backup_path = os.path.join("data", "earnings", backup_dir_name)
-                
+                await interaction.response.defer(ephemeral=ephemeral)
                 try:
-                    os.makedirs(backup_path, exist_ok=True)
-                    shutil.copy2(target_file, os.path.join(backup_path, "earnings.json"))
+                    async with admin_jobs.admin_job(interaction.guild.id, "Earnings backup", interaction) as job:
+                        snapshot = await job.run(
+                            snapshot_store.create_snapshot, interaction.guild.id, "earnings", target_dir,
+                            lambda path: path == settings.EARNINGS_FILE,
+                            progress=job.progress, status="Backing up"
+                        )
                     
                     embed = discord.Embed(
                         title="✅ Earnings Backup Created",
@@ -2249,22 +2288,23 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                         color=discord.Color.green()
                     )
                     embed.add_field(
-                        name="Backup Location",
-                        value=f"`{backup_dir_name}`",
+                        name="Backup ID",
+                        value=f"`{snapshot['id']}`",
                         inline=False
                     )
-                    await interaction.response.send_message(embed=embed, ephemeral=ephemeral)
+                    await interaction.edit_original_response(content=None, embed=embed, view=None)
+                except admin_jobs.JobBusy as e:
+                    await interaction.edit_original_response(content=f"❌ Another admin job is running for this server: {e}", view=None)
+                except admin_jobs.JobCancelled:
+                    await interaction.edit_original_response(content="Backup cancelled", view=None)
                 except Exception as e:
-                    await interaction.response.send_message(
-                        f"❌ Backup failed: {str(e)}",
-                        ephemeral=ephemeral
-                    )
+                    await interaction.edit_original_response(content=f"❌ Backup failed: {str(e)}", view=None)
                 return
 
             source_path = os.path.join("data", "earnings", source_id, "earnings.json")
             target_dir = os.path.join("data", "earnings", str(interaction.guild.id))
             target_path = os.path.join(target_dir, "earnings.json")
-            backup_path = None
+            backup_id = None
 
             if not os.path.exists(source_path):
                 await interaction.response.send_message(
@@ -2273,24 +2313,37 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                 )
                 return
 
-            # Backup handling
-            if create_backup and os.path.exists(target_path):
-                backup_time = datetime.now().strftime("%Y%m%d-%H%M%S")
-                backup_dir_name = f"{interaction.guild.id}_earnings_backup_{backup_time}"
-                backup_path = os.path.join("data", "earnings", backup_dir_name)
-                try:
-                    os.makedirs(backup_path, exist_ok=True)
-                    shutil.copy2(target_path, os.path.join(backup_path, "earnings.json"))
-                except Exception as e:
-                    await interaction.response.send_message(
-                        f"⚠️ Backup failed: {str(e)}",
-                        ephemeral=ephemeral
-                    )
-                    return
+            def load_source():
+                with open(source_path, 'r') as f:
+                    return json.load(f)
 
-            # Load source data for confirmation
-            with open(source_path, 'r') as f:
-                data = json.load(f)
+            await interaction.response.defer(ephemeral=ephemeral)
+            try:
+                async with admin_jobs.admin_job(interaction.guild.id, "Earnings copy", interaction) as job:
+                    # Backup handling
+                    if create_backup and os.path.exists(target_path):
+                        try:
+                            snapshot = await job.run(
+                                snapshot_store.create_snapshot, interaction.guild.id, "earnings", target_dir,
+                                lambda path: path == settings.EARNINGS_FILE,
+                                progress=job.progress, status="Backing up"
+                            )
+                            backup_id = snapshot["id"]
+                        except admin_jobs.JobCancelled:
+                            raise
+                        except Exception as e:
+                            await interaction.edit_original_response(content=f"⚠️ Backup failed: {str(e)}", view=None)
+                            return
+
+                    # Load source data for confirmation
+                    data = await job.run(load_source, status="Reading source earnings")
+            except admin_jobs.JobBusy as e:
+                await interaction.edit_original_response(content=f"❌ Another admin job is running for this server: {e}", view=None)
+                return
+            except admin_jobs.JobCancelled:
+                content = "Operation cancelled" + (f" (backup `{backup_id}` was kept)" if backup_id else "")
+                await interaction.edit_original_response(content=content, view=None)
+                return
             
             entry_count = sum(len(entries) for entries in data.values()) if isinstance(data, dict) else len(data)
 
@@ -2317,23 +2370,31 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                 description=f"This will replace current data with `{entry_count}` entries from `{source_id}`",
                 color=discord.Color.orange()
             )
-            if backup_path:
+            if backup_id:
                 initial_embed.add_field(
                     name="Backup Created",
-                    value=f"`{os.path.basename(backup_path)}`",
+                    value=f"`{backup_id}`",
                     inline=False
                 )
             
             view = FinalConfirmationView()
-            await interaction.response.send_message(embed=initial_embed, view=view, ephemeral=ephemeral)
+            await interaction.edit_original_response(content=None, embed=initial_embed, view=view)
             await view.wait()
             
             if not view.confirmed:
                 return
 
-            # Perform copy
-            os.makedirs(target_dir, exist_ok=True)
-            shutil.copyfile(source_path, target_path)
+            def copy_file():
+                os.makedirs(target_dir, exist_ok=True)
+                shutil.copyfile(source_path, target_path)
+
+            # Perform copy; a single file copy has no safe point to stop at
+            try:
+                async with admin_jobs.admin_job(interaction.guild.id, "Earnings copy", interaction, cancellable=False) as job:
+                    await job.run(copy_file, status="Copying")
+            except admin_jobs.JobBusy as e:
+                await interaction.edit_original_response(content=f"❌ Another admin job is running for this server: {e}", embed=None, view=None)
+                return
 
             # Results embed
             success_embed = discord.Embed(
@@ -2341,10 +2402,10 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                 description=f"Successfully copied `{entry_count}` entries from `{source_id}`",
                 color=discord.Color.green()
             )
-            if backup_path:
+            if backup_id:
                 success_embed.add_field(
                     name="Backup Created",
-                    value=f"`{os.path.basename(backup_path)}`",
+                    value=f"`{backup_id}`",
                     inline=False
                 )
             
@@ -2352,10 +2413,13 @@ class AdminSlashCommands(commands.Cog, name="admin"):
 
         except Exception as e:
             logger.error(f"Earnings copy failed: {str(e)}", exc_info=True)
-            await interaction.response.send_message(
-                f"❌ Critical error: {str(e)}",
-                ephemeral=ephemeral
-            )
+            if interaction.response.is_done():
+                await interaction.edit_original_response(content=f"❌ Critical error: {str(e)}", embed=None, view=None)
+            else:
+                await interaction.response.send_message(
+                    f"❌ Critical error: {str(e)}",
+                    ephemeral=ephemeral
+                )
 
     @app_commands.command(name="view-config", description="View complete server configuration")
     @app_commands.default_permissions(administrator=True)
@@ -2403,10 +2467,9 @@ class AdminSlashCommands(commands.Cog, name="admin"):
             
             return chunks or [(title, "**[No entries]**")]
 
-        async def load_config_section(loader, formatter, section_name: str, use_code_block: bool = True):
-            """Load and format a config section with code block option"""
+        def load_config_section(raw_data, formatter, section_name: str, use_code_block: bool = True):
+            """Format a loaded config section with code block option"""
             try:
-                raw_data = await loader()
                 if not raw_data:
                     return chunk_content("", f"{section_name}\n", use_code_block)
                 formatted = formatter(raw_data)
@@ -2415,13 +2478,9 @@ class AdminSlashCommands(commands.Cog, name="admin"):
                 logger.error(f"Config error in {section_name}: {str(e)}")
                 return chunk_content("", f"{section_name} Error", use_code_block)
 
-        async def format_compensation(data_type: str, interaction: discord.Interaction) -> list[str]:
+        def format_compensation(data_type: str, comp_data: dict) -> list[str]:
             """Format compensation data without code blocks (for mentions)"""
             try:
-                from config import settings
-                comp_data = await file_handlers.load_json(
-                    settings.get_guild_commission_path(interaction.guild.id), {}
-                )
                 lines = []
                 section_data = comp_data.get(data_type, {})
                 if not isinstance(section_data, dict):
@@ -2463,47 +2522,57 @@ class AdminSlashCommands(commands.Cog, name="admin"):
         #endregion
 
         #region Configuration Loaders
+        # One guild_configs lookup (or concurrent file reads) for every section
+        configs = await file_handlers.load_guild_configs(guild_id, {
+            settings.ROLE_DATA_FILE: {},
+            settings.SHIFT_DATA_FILE: [],
+            settings.PERIOD_DATA_FILE: [],
+            settings.BONUS_RULES_FILE: [],
+            settings.MODELS_DATA_FILE: [],
+            settings.DISPLAY_SETTINGS_FILE: {},
+            settings.COMMISSION_SETTINGS_FILE: {},
+        })
         config_sections = []
         
         # Role Percentages
-        config_sections.extend(await load_config_section(
-            lambda: file_handlers.load_json(settings.get_guild_roles_path(guild_id), {}),
+        config_sections.extend(load_config_section(
+            configs[settings.ROLE_DATA_FILE],
             lambda d: [f"{interaction.guild.get_role(int(k)) or k}: {v}%" for k, v in d.items()],
             "Role Cuts",
             use_code_block=True
         ))
 
         # Shifts
-        config_sections.extend(await load_config_section(
-            lambda: file_handlers.load_json(settings.get_guild_shifts_path(guild_id), []),
+        config_sections.extend(load_config_section(
+            configs[settings.SHIFT_DATA_FILE],
             lambda d: [f"• {s}" for s in d],
             "Shifts"
         ))
 
         # Periods
-        config_sections.extend(await load_config_section(
-            lambda: file_handlers.load_json(settings.get_guild_periods_path(guild_id), []),
+        config_sections.extend(load_config_section(
+            configs[settings.PERIOD_DATA_FILE],
             lambda d: [f"• {p}" for p in d],
             "Periods"
         ))
 
         # Bonus Rules
-        config_sections.extend(await load_config_section(
-            lambda: file_handlers.load_json(settings.get_guild_bonus_rules_path(guild_id), []),
+        config_sections.extend(load_config_section(
+            configs[settings.BONUS_RULES_FILE],
             lambda d: [f"${r['from']}-${r['to']}: ${r['amount']}" for r in d],
             "Bonuses"
         ))
 
         # Models
-        config_sections.extend(await load_config_section(
-            lambda: file_handlers.load_json(settings.get_guild_models_path(guild_id), []),
+        config_sections.extend(load_config_section(
+            configs[settings.MODELS_DATA_FILE],
             lambda d: [f"• {m}" for m in d],
             "Models"
         ))
 
         # Display Settings
-        config_sections.extend(await load_config_section(
-            lambda: file_handlers.load_json(settings.get_guild_display_path(guild_id), {}),
+        config_sections.extend(load_config_section(
+            configs[settings.DISPLAY_SETTINGS_FILE],
             lambda d: [
                 f"Ephemeral: {d.get('ephemeral_responses', True)}",
                 f"Show Average: {d.get('show_average', True)}",
@@ -2515,14 +2584,14 @@ class AdminSlashCommands(commands.Cog, name="admin"):
         ))
 
         # Compensation Data
-        config_sections.extend(await load_config_section(
-            lambda: format_compensation("roles", interaction),
+        config_sections.extend(load_config_section(
+            format_compensation("roles", configs[settings.COMMISSION_SETTINGS_FILE]),
             lambda d: d,
             "Role Compensation",
             use_code_block=False  # Disable code block
         ))
-        config_sections.extend(await load_config_section(
-            lambda: format_compensation("users", interaction),
+        config_sections.extend(load_config_section(
+            format_compensation("users", configs[settings.COMMISSION_SETTINGS_FILE]),
             lambda d: d,
             "User Compensation",
             use_code_block=False  # Disable code block
@@ -1,9 +1,12 @@
+import asyncio
 import logging
-from typing import Any, Dict, List
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 import discord
+from pymongo import UpdateOne
 from discord import Interaction, app_commands
 from discord.ext import commands
-from utils import file_handlers
+from utils import earnings_sync, file_handlers
 from config import settings
 from utils.db import get_current_mongo_client
 
@@ -102,11 +105,116 @@ class SyncCommands(commands.Cog, name="sync"):
         except Exception as e:
             logger.error(f"Error during sync operation: {e}")
             await interaction.response.send_message(f"❌ An error occurred: {e}", ephemeral=ephemeral)
-    
+
+    # Incremental updates keep the collections current between full syncs
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        await upsert_guild_document("guild_members", str(member.guild.id), member_document(member))
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        # Kept, flagged as departed, so reports can still name the member
+        await mark_member_departed(str(member.guild.id), member.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if member_document(before) != member_document(after):
+            await upsert_guild_document("guild_members", str(after.guild.id), member_document(after))
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        if before.name == after.name and before.display_name == after.display_name:
+            return
+        for guild in self.bot.guilds:
+            member = guild.get_member(after.id)
+            if member is not None:
+                await upsert_guild_document("guild_members", str(guild.id), member_document(member))
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        await upsert_guild_document("guild_roles", str(role.guild.id), role_document(role))
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        await delete_guild_document("guild_roles", str(role.guild.id), role.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.name != after.name:
+            await upsert_guild_document("guild_roles", str(after.guild.id), role_document(after))
+
+def member_document(member: discord.Member) -> Dict[str, Any]:
+    """Stored fields of a guild member"""
+    return {"id": member.id, "name": member.name, "display_name": member.display_name, "present": True}
+
+def role_document(role: discord.Role) -> Dict[str, Any]:
+    """Stored fields of a guild role"""
+    return {"id": role.id, "name": role.name}
+
+def _departed_update() -> Dict[str, Any]:
+    return {"$set": {"present": False, "left_at": datetime.now(timezone.utc).isoformat()}}
+
+def _write_guild_documents(collection: str, guild_id: str, documents: List[Dict[str, Any]], prune: bool, keep_departed: bool = False):
+    db = get_current_mongo_client().get_database()
+    if documents:
+        db[collection].bulk_write([
+            UpdateOne(
+                {"id": document["id"], "guild_id": guild_id},
+                {"$set": {**document, "guild_id": guild_id}},
+                upsert=True
+            )
+            for document in documents
+        ], ordered=False)
+    if prune:
+        stale = {"guild_id": guild_id, "id": {"$nin": [document["id"] for document in documents]}}
+        if keep_departed:
+            # Flag documents that are no longer in the guild, keeping their names
+            db[collection].update_many({**stale, "present": {"$ne": False}}, _departed_update())
+        else:
+            # Remove documents that no longer exist in the guild
+            db[collection].delete_many(stale)
+
+async def upsert_guild_document(collection: str, guild_id: str, document: Dict[str, Any]):
+    """Insert or update one member or role document; a no-op without MongoDB"""
+    try:
+        await asyncio.to_thread(_write_guild_documents, collection, guild_id, [document], False)
+    except RuntimeError:
+        pass
+    except Exception as e:
+        logger.error(f"Error updating {collection} document {document['id']} for guild_id {guild_id}: {e}")
+
+async def delete_guild_document(collection: str, guild_id: str, document_id: int):
+    """Delete one member or role document; a no-op without MongoDB"""
+    def delete():
+        get_current_mongo_client().get_database()[collection].delete_one({"id": document_id, "guild_id": guild_id})
+
+    try:
+        await asyncio.to_thread(delete)
+    except RuntimeError:
+        pass
+    except Exception as e:
+        logger.error(f"Error deleting {collection} document {document_id} for guild_id {guild_id}: {e}")
+
+async def mark_member_departed(guild_id: str, member_id: int):
+    """Flag a member document as departed; a no-op without MongoDB"""
+    def update():
+        get_current_mongo_client().get_database()["guild_members"].update_one({"id": member_id, "guild_id": guild_id}, _departed_update())
+
+    try:
+        await asyncio.to_thread(update)
+    except RuntimeError:
+        pass
+    except Exception as e:
+        logger.error(f"Error marking guild_members document {member_id} as departed for guild_id {guild_id}: {e}")
+
 async def sync_guild_members_and_roles(guild_id: str, members: List[Dict[str, Any]], roles: List[Dict[str, Any]]) -> bool:
     """
     Sync all current guild members and their IDs, as well as all roles and their IDs, to the database.
-    Ensure that only existing members and roles remain in the database.
+    Roles no longer in the guild are removed; departed members are kept and
+    flagged with present=False so reports can still name them.
+
+    Each collection is written with one batched bulk_write of upserts and a
+    single update_many or delete_many for documents no longer in the guild.
 
     Args:
         guild_id: The ID of the guild.
@@ -117,30 +225,13 @@ async def sync_guild_members_and_roles(guild_id: str, members: List[Dict[str, An
         True if the sync was successful, False otherwise.
     """
     try:
-        client = get_current_mongo_client()
-        db = client.get_database()
-
-        # Sync members
-        member_ids = [member["id"] for member in members]
-        for member in members:
-            db["guild_members"].update_one(
-                {"id": member["id"], "guild_id": guild_id},
-                {"$set": {"name": member["name"], "display_name": member.get("display_name", ""), "guild_id": guild_id}},
-                upsert=True
-            )
-        # Remove members that no longer exist in the guild
-        db["guild_members"].delete_many({"guild_id": guild_id, "id": {"$nin": member_ids}})
-
-        # Sync roles
-        role_ids = [role["id"] for role in roles]
-        for role in roles:
-            db["guild_roles"].update_one(
-                {"id": role["id"], "guild_id": guild_id},
-                {"$set": {"name": role["name"], "guild_id": guild_id}},
-                upsert=True
-            )
-        # Remove roles that no longer exist in the guild
-        db["guild_roles"].delete_many({"guild_id": guild_id, "id": {"$nin": role_ids}})
+        members = [
+            {"id": member["id"], "name": member["name"], "display_name": member.get("display_name", ""), "present": True}
+            for member in members
+        ]
+        roles = [{"id": role["id"], "name": role["name"]} for role in roles]
+        await asyncio.to_thread(_write_guild_documents, "guild_members", guild_id, members, True, True)
+        await asyncio.to_thread(_write_guild_documents, "guild_roles", guild_id, roles, True)
 
         logger.info(f"Successfully synced members and roles for guild_id: {guild_id}")
         return True
@@ -195,7 +286,12 @@ async def pull_config(guild_id: str):
             await file_handlers.save_json(file_path, data)  # Save to MongoDB
 
 async def push_earnings(guild_id: str):
-    """Push earnings data to the database."""
+    """
+    Push earnings changes to the database.
+
+    Only entries added, edited or removed since the last sync are sent, in
+    one bulk write (see earnings_sync.push_changes).
+    """
     file_path = settings.get_guild_earnings_path(guild_id)
     data = await file_handlers.load_json_from_file(file_path, default={})
 
@@ -207,56 +303,49 @@ async def push_earnings(guild_id: str):
         client = get_current_mongo_client()
         db = client.get_database()
 
-        if not data:  # If data is empty, remove all entries for the guild_id
-            result = db["earnings"].delete_many({"guild_id": str(guild_id)})
-            logger.info(f"Removed {result.deleted_count} earnings entries for guild_id: {guild_id}")
-            return
-
-        for user_mention, entries in data.items():
-            for entry in entries:
-                entry["user_mention"] = user_mention
-                entry["guild_id"] = str(guild_id)
-                entry["models"] = entry["models"] if isinstance(entry["models"], list) else [entry["models"]]
-
-                db["earnings"].update_one(
-                    {"id": entry["id"], "guild_id": str(guild_id)},
-                    {"$set": entry},
-                    upsert=True
-                )
-        logger.info("Earnings data successfully pushed to the database.")
+        pushed = await asyncio.to_thread(earnings_sync.push_changes, db, guild_id, data)
+        logger.info(f"Pushed {pushed} earnings changes to the database for guild_id: {guild_id}")
     except Exception as e:
         logger.error(f"Error pushing earnings data to the database: {e}")
 
+def _prepare_pulled_entry(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    entry["models"] = entry["models"] if isinstance(entry["models"], list) else [entry["models"]]
+    try:
+        entry["date"] = file_handlers.normalize_date_format(entry["date"])
+    except ValueError as e:
+        logger.error(f"Skipping entry with invalid date: {entry}. Error: {e}")
+        return None
+    return entry
+
 async def pull_earnings(guild_id: str):
-    """Pull earnings data from the database."""
+    """
+    Pull earnings changes from the database.
+
+    Changes newer than the guild's sync watermark are streamed and applied
+    to the local file. Without a sync state the file is rebuilt from the
+    database, as a full pull.
+    """
     file_path = settings.get_guild_earnings_path(guild_id)
 
     try:
         client = get_current_mongo_client()
         db = client.get_database()
 
-        data = list(db["earnings"].find({"guild_id": str(guild_id)}))
-        for entry in data:
-            entry.pop("_id", None)
-            entry["models"] = entry["models"] if isinstance(entry["models"], list) else [entry["models"]]
-            try:
-                entry["date"] = file_handlers.normalize_date_format(entry["date"])
-            except ValueError as e:
-                logger.error(f"Skipping entry with invalid date: {entry}. Error: {e}")
-                continue
-
-        earnings_dict = {}
-        for entry in data:
-            user_mention = entry.get("user_mention", "unknown_sender")
-            if user_mention not in earnings_dict:
-                earnings_dict[user_mention] = []
-            earnings_dict[user_mention].append(entry)
-
-        if earnings_dict:
-            await file_handlers.save_json_to_file(file_path, earnings_dict)
-            logger.info("Earnings data successfully pulled from the database.")
+        if earnings_sync.load_state(guild_id)["watermark"]:
+            data = await file_handlers.load_json_from_file(file_path, default={})
+        else:
+            data = {}
+
+        pulled, state = await asyncio.to_thread(earnings_sync.pull_changes, db, guild_id, data, _prepare_pulled_entry)
+        if pulled:
+            # Keep the old watermark if the file wasn't written, so the next pull retries
+            if not await file_handlers.save_json_to_file(file_path, data):
+                logger.error(f"Could not save pulled earnings for guild_id: {guild_id}")
+                return
+            logger.info(f"Pulled {pulled} earnings changes from the database for guild_id: {guild_id}")
         else:
-            logger.warning("No earnings data found in the database.")
+            logger.info(f"No new earnings changes in the database for guild_id: {guild_id}")
+        await asyncio.to_thread(earnings_sync.save_state, guild_id, state)
     except Exception as e:
         logger.error(f"Error pulling earnings data from the database: {e}")
 
@@ -277,11 +366,12 @@ async def get_roles_and_members_from_interaction(interaction: Interaction):
     if not guild:
         raise ValueError("Interaction does not belong to a guild.")
 
-    # Fetch roles
-    roles = [{"id": role.id, "name": role.name} for role in guild.roles]
+    # Roles and members come from the gateway cache (the members intent is enabled)
+    if not guild.chunked:
+        await guild.chunk()
 
-    # Fetch members
-    members = [{"id": member.id, "name": member.name, "display_name": member.display_name} async for member in guild.fetch_members(limit=None)]
+    roles = [role_document(role) for role in guild.roles]
+    members = [member_document(member) for member in guild.members]
 
     return roles, members
 
@@ -7,7 +7,7 @@ from decimal import Decimal
 from datetime import datetime
 from discord.ext import commands
 from typing import Optional, List, Dict
-from utils import file_handlers, validators, calculations, generator_uuid
+from utils import file_handlers, validators, calculations, generator_uuid, model_index
 
 logger = logging.getLogger("xof_calculator.calculator")
 
@@ -142,11 +142,14 @@ class CalculatorCommands(commands.Cog):
         earnings_data[sender].append(new_entry)
         
         # Save updated earnings data
-        success = await file_handlers.save_json(settings.get_guild_earnings_path(ctx.guild.id), earnings_data)
+        earnings_path = settings.get_guild_earnings_path(ctx.guild.id)
+        previous_fingerprint = file_handlers.get_file_fingerprint(earnings_path)
+        success = await file_handlers.save_json(earnings_path, earnings_data)
         if not success:
             logger.error(f"Failed to save earnings data for {sender}")
             await ctx.send("⚠ Calculation completed but failed to save data. Please try again.")
             return
+        model_index.apply_changes(ctx.guild.id, previous_fingerprint, added=[(sender, new_entry)])
         
         # Create embed
         embed = discord.Embed(title="📊 Earnings Calculation", color=0x009933)
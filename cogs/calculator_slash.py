@@ -1,15 +1,18 @@
-import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 import discord
 import zipfile
 import logging
+import asyncio
+import base64
 import io
 import re
+import math
 
 from reportlab.platypus import PageBreak, SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from utils import file_handlers, validators, calculations
+from utils import file_handlers, validators, calculations, charts, pdf_builder, xlsx_writer, embed_packer, summaries, model_index, shift_log, bonus_ledger
+from utils.members import MemberDirectory
 from reportlab.lib.styles import getSampleStyleSheet
 from decimal import Decimal, InvalidOperation
 from reportlab.lib.pagesizes import letter
@@ -27,11 +30,43 @@ SUPPORTED_EXPORTS = ["none", "txt", "csv", "json", "xlsx", "pdf", "png", "zip"]
 # All available formats
 ALL_ZIP_FORMATS = ['csv', 'json', 'xlsx', 'pdf', 'png', 'txt', 'html', 'markdown'] # TODO: Option to set default zip exports in settings
 MAX_ENTRIES = 5000000
+# Fixed parts of a list entry; list_entry_length relies on them
+LIST_ENTRY_START = "```diff\n+ Entry #"
+LIST_ENTRY_END = "```"
+LIST_LABELS = {
+    "id": "🔑 Sale ID: ",
+    "user": "👤 User:    ",
+    "date": "📅 Date:    ",
+    "period": "⌛ Period:  ",
+    "role": "🎯 Role:    ",
+    "gross": "💰 Gross:   ",
+    "cut": "💸 Cut:     ",
+}
+
+def _digits(number: int) -> int:
+    """Characters of a non-negative integer in decimal"""
+    digits = 1
+    while number >= 10:
+        number //= 10
+        digits += 1
+    return digits
+
+def _fixed2_width(value) -> int:
+    """Characters of f"{value:.2f}" for a finite number"""
+    value = float(value)
+    negative = math.copysign(1.0, value) < 0
+    return negative + _digits(int(abs(round(value, 2)))) + 3
+
+def _role_label(entry) -> str:
+    """An entry's role as listed; capitalizing can change its length (e.g. 'ß' -> 'Ss')"""
+    return str(entry.get('role', 'N/A')).capitalize()
+
+TABLE_HEADER = "  # |   Date     |   Role    |  Gross   |   Cut    \n----|------------|-----------|----------|----------\n"
 
 logger = logging.getLogger("xof_calculator.calculator")
 
 class HoursWorkedModal(ui.Modal, title="Enter Hours Worked"):
-    def __init__(self, cog, period, shift, role, gross_revenue, compensation_type, ephemeral):
+    def __init__(self, cog, period, shift, role, gross_revenue, compensation_type, ephemeral, default_hours: Optional[str] = None):
         super().__init__()
         self.cog = cog
         self.period = period
@@ -44,6 +79,7 @@ class HoursWorkedModal(ui.Modal, title="Enter Hours Worked"):
         self.hours_input = ui.TextInput(
             label="Hours Worked (e.g. 8)",
             placeholder="Enter number of hours...",
+            default=default_hours,
             required=True
         )
         self.add_item(self.hours_input)
@@ -150,7 +186,7 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
         })
         return settings_data.get("bot_name", "Shift Calculator")
 
-    async def generate_export_file(self, user_earnings, interaction, user, export_format, zip_formats=None, all_data=False):
+    async def generate_export_file(self, user_earnings, interaction, user, export_format, zip_formats=None, all_data=False, members=None):
         """
         Generate export file based on format choice with improved visualizations.
         
@@ -159,6 +195,7 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
             user: User object with display_name attribute
             export_format: String indicating the desired export format
             zip_formats: List of formats to include when export_format is "zip" (default: all available formats)
+            members: MemberDirectory already resolved for this request (optional)
                 
         Returns:
             discord.File: File object ready for Discord attachment
@@ -171,6 +208,8 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
         
         # Convert earnings to DataFrame for easier manipulation
         df = pd.DataFrame(user_earnings)
+        # Identifies this dataset for the shared chart cache
+        dataset_version = charts.dataset_version(user_earnings)
         
         # If zip_formats not specified, use all formats
         if zip_formats is None:
@@ -181,17 +220,17 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
         if export_format == "zip":
             with zipfile.ZipFile(buffer, 'w') as zip_file:
                 for fmt in zip_formats:
-                    fmt_buffer = await self._generate_format_buffer(df, interaction, user, fmt, user_earnings, all_data)
+                    fmt_buffer = await self._generate_format_buffer(df, interaction, user, fmt, user_earnings, all_data, dataset_version, members)
                     zip_file.writestr(f"{base_name}.{fmt}", fmt_buffer.getvalue())
                     fmt_buffer.close()
         else:
             # Handle single format export
-            buffer = await self._generate_format_buffer(df, interaction, user, export_format, user_earnings, all_data)
+            buffer = await self._generate_format_buffer(df, interaction, user, export_format, user_earnings, all_data, dataset_version, members)
         
         buffer.seek(0)
         return discord.File(buffer, filename=f"{base_name}.{export_format}")
 
-    async def _generate_format_buffer(self, df, interaction, user, format_type, user_earnings, all_data=False):
+    async def _generate_format_buffer(self, df, interaction, user, format_type, user_earnings, all_data=False, dataset_version=None, members=None):
         """
         Helper method to generate a specific format export buffer.
         
@@ -201,11 +240,15 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
             format_type: String indicating the desired export format
             user_earnings: Original list of earnings data
             all_data: Boolean indicating if this is a full report with multiple users
+            dataset_version: Chart cache version of user_earnings (computed if omitted)
+            members: MemberDirectory for the users in user_earnings (optional)
             
         Returns:
             io.BytesIO: Buffer containing the exported data
         """
         buffer = io.BytesIO()
+        if dataset_version is None:
+            dataset_version = charts.dataset_version(user_earnings)
         
         try:
             if format_type == "csv":
@@ -213,15 +256,15 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
             elif format_type == "json":
                 await self._generate_json(df, buffer, all_data)
             elif format_type == "xlsx":
-                await self._generate_excel(df, buffer, all_data)
+                await self._generate_excel(df, buffer, user_earnings, all_data)
             elif format_type == "pdf":
-                await self._generate_pdf(df, interaction, user, buffer, user_earnings, all_data)
+                await self._generate_pdf(df, interaction, user, buffer, user_earnings, all_data, dataset_version, members)
             elif format_type == "png":
-                await self._generate_png(df, user, buffer, user_earnings, all_data)
+                await self._generate_png(df, user, buffer, user_earnings, all_data, dataset_version)
             elif format_type == "html":
-                await self._generate_html(df, interaction, user, buffer, user_earnings, all_data)
+                await self._generate_html(df, interaction, user, buffer, user_earnings, all_data, dataset_version)
             elif format_type == "markdown":
-                await self._generate_markdown(df, interaction, user, buffer, user_earnings, all_data)
+                await self._generate_markdown(df, interaction, user, buffer, user_earnings, all_data, dataset_version)
             else:  # txt
                 await self._generate_txt(df, interaction, user, buffer, user_earnings, all_data)
         except Exception as e:
@@ -250,69 +293,35 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
         json_data = df.to_json(orient='records', date_format='iso', indent=2)
         buffer.write(json_data.encode('utf-8'))
 
-    async def _generate_excel(self, df, buffer, all_data=False):
+    async def _generate_excel(self, df, buffer, user_earnings, all_data=False):
         """Generate Excel format export with formatting."""
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            # Reorder columns if showing user data
-            if all_data and 'display_name' in df.columns:
-                df = df[['user', 'date', 'role', 
-                        'hours_worked', 'gross_revenue', 'total_cut']]
-            else:
-                df = df[['date', 'role', 
-                        'hours_worked', 'gross_revenue', 'total_cut']]
+        # Reorder columns if showing user data
+        if all_data and 'display_name' in df.columns:
+            columns = ['user', 'date', 'role', 
+                    'hours_worked', 'gross_revenue', 'total_cut']
+        else:
+            columns = ['date', 'role', 
+                    'hours_worked', 'gross_revenue', 'total_cut']
+
+        # Rows are streamed from the raw entries in a worker thread so large
+        # exports neither block the event loop nor hold a full workbook in memory
+        await asyncio.to_thread(
+            xlsx_writer.write_earnings_workbook,
+            buffer,
+            user_earnings,
+            columns,
+            settings.XLSX_WIDTH_SAMPLE_ROWS
+        )
 
-            if 'models' in df.columns:
-                df = df.drop(columns=['models', 'shift']).copy()
-                
-            # Main Earnings sheet
-            df.fillna('null', inplace=True)
-            df.to_excel(writer, index=False, sheet_name='Earnings')
-                
-            # Add a summary sheet with numeric values
-            total_gross = df['gross_revenue'].sum()
-            total_earnings = df['total_cut'].sum()
-            total_hours = df['hours_worked'].sum()
-            summary = pd.DataFrame({
-                'Metric': ['Total Gross Revenue', 'Total Earnings', 'Total Hours Worked'],
-                'Value': [total_gross, total_earnings, total_hours]
-            })
-            summary.to_excel(writer, index=False, sheet_name='Summary')
-            
-            # Add a pivot table by role
-            if 'role' in df.columns:
-                pivot = pd.pivot_table(df, 
-                                    values=['gross_revenue', 'total_cut', 'hours_worked'],
-                                    index=['role'],
-                                    aggfunc='sum')
-                pivot.to_excel(writer, sheet_name='By Role')
-            
-            # Access the workbook and sheets for formatting
-            workbook = writer.book
-            summary_sheet = writer.sheets['Summary']
-            
-            # Apply number formatting to Summary sheet
-            for row in summary_sheet.iter_rows(min_row=2, max_row=3, min_col=2, max_col=2):
-                for cell in row:
-                    cell.number_format = '"$"#,##0.00'  # Currency format for revenue and earnings
-            summary_sheet.cell(row=4, column=2).number_format = '0.0'  # Decimal format for hours
-            
-            # Apply styling and formatting to all sheets
-            for worksheet in writer.sheets.values():
-                for col in worksheet.columns:
-                    max_length = 0
-                    column = col[0].column_letter
-                    for cell in col:
-                        if cell.value is not None:
-                            max_length = max(max_length, len(str(cell.value)))
-                    worksheet.column_dimensions[column].width = max_length + 2
-
-    async def _generate_pdf(self, df, interaction, user, buffer, user_earnings, all_data=False):
+    async def _generate_pdf(self, df, interaction, user, buffer, user_earnings, all_data=False, dataset_version=None, members=None):
         """Generate complete PDF report with aggregated charts and individual breakdowns"""
+        styles = getSampleStyleSheet()
         try:
             doc = SimpleDocTemplate(buffer, pagesize=letter)
             elements = []
-            styles = getSampleStyleSheet()
-            PAGE_WIDTH = 468  # Standard letter width in points
+            PAGE_WIDTH = pdf_builder.PAGE_WIDTH
+            row_budget = settings.PDF_DETAIL_ROW_BUDGET
+            chart_budget = settings.PDF_CHART_PAGE_BUDGET
 
             # ======================
             # 1. Title Section
@@ -359,19 +368,17 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
             elements.append(Spacer(1, 24))
 
             # ======================
-            # 3. Detailed Table (Original Version)
+            # 3. Detailed Table (chunked, capped by row budget)
             # ======================
             elements.append(Paragraph("Detailed Earnings", styles["Heading2"]))
             elements.append(Spacer(1, 12))
             headers = ["#", "User", "Date", "Role", "Shift", "Hours", "Gross Revenue", "Earnings"] if all_data else ["#", "Date", "Role", "Shift", "Hours", "Gross Revenue", "Earnings"]
-            data = [headers]
-            
-            # col_widths = [30, 120, 80, 60, 50, 70, 70] if all_data else [30, 80, 60, 50, 70, 70]
+            data = []
             
-            for i, entry in enumerate(user_earnings, 1):
+            for i, entry in enumerate(user_earnings[:row_budget], 1):
                 row = [
                     str(i),
-                    f"{entry.get('display_name', '')} (@{entry.get('username', '')})",
+                    pdf_builder.wrap_cell(f"{entry.get('display_name', '')} (@{entry.get('username', '')})"),
                     entry['date'],
                     entry['role'],
                     entry['shift'].capitalize(),
@@ -389,23 +396,12 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
                 ]
                 data.append(row)
 
-            # Original table formatting
-            detail_table = Table(data, colWidths=([40] + [None]*len(headers[1:])) if all_data else None)
-            detail_table.setStyle(TableStyle([
-                ('BACKGROUND', (0,0), (-1,0), colors.grey),
-                ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-                ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-                ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0,0), (-1,0), 12),
-                ('BACKGROUND', (0,1), (-1,-1), colors.beige),
-                ('GRID', (0,0), (-1,-1), 1, colors.black),
-                ('ALIGN', (4,1), (-1,-1), 'CENTER'),
-                ('FONTSIZE', (0,1), (-1,-1), 9),
-                ('FONTSIZE', (0,1), (-1,-1), 9),  # More readable body text
-                ('PADDING', (0,0), (-1,-1), 3),    # Cell padding
-                ('VALIGN', (0,0), (-1,-1), 'MIDDLE'), # Vertical alignment
-            ]))
-            elements.append(detail_table)
+            elements.extend(pdf_builder.build_detail_tables(
+                headers,
+                data,
+                settings.PDF_DETAIL_CHUNK_ROWS,
+                pdf_builder.DETAIL_COL_WIDTHS_ALL if all_data else pdf_builder.DETAIL_COL_WIDTHS_USER
+            ))
             elements.append(Spacer(1, 24))
 
             # ======================
@@ -415,122 +411,133 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
             elements.append(Paragraph("Earnings Analysis", styles["Heading2"]))
             elements.append(Spacer(1, 12))
 
+            chart_specs = []
+            chart_members = []
+            skipped_chart_members = []
+
             if all_data:
                 processed_df = pd.DataFrame(user_earnings)
                 processed_df['user_id'] = processed_df['user_id'].astype(str)
                 processed_df['user_id'] = processed_df['user_id'].str.extract(r'(\d+)').fillna('0').astype(np.int64)
                 processed_df['date'] = pd.to_datetime(processed_df['date'], dayfirst=True)
-                processed_df['member'] = processed_df['user_id'].apply(
-                    lambda x: interaction.guild.get_member(int(x)) if interaction and x != 0 else None
-                )
+                processed_df['gross_revenue'] = processed_df['gross_revenue'].astype(float)
+                processed_df['total_cut'] = processed_df['total_cut'].astype(float)
+                processed_df = processed_df.sort_values('date')
+
+                user_ids = [int(user_id) for user_id in processed_df['user_id'].unique() if user_id != 0]
+                if members is None and interaction:
+                    members = await MemberDirectory.build(interaction.guild, user_ids)
+                members = {user_id: members.get(user_id) if members else None for user_id in user_ids}
+                valid_df = processed_df[processed_df['user_id'].map(lambda x: members.get(x) is not None)]
+                user_groups = {user_id: group for user_id, group in valid_df.groupby('user_id')}
 
                 # 4a. Aggregated Timeline Chart
-                chart_buffer1 = io.BytesIO()
-                with plt.rc_context():
-                    fig1, ax1 = plt.subplots(figsize=(7, 3.5))
-                    agg_df = processed_df.groupby('date').agg({
-                        'gross_revenue': 'sum',
-                        'total_cut': 'sum'
-                    }).reset_index()
-                    
-                    ax1.plot(agg_df['date'], agg_df['gross_revenue'], 'o-', label='Total Gross')
-                    ax1.plot(agg_df['date'], agg_df['total_cut'], 'o-', label='Total Earnings')
-                    ax1.set_title("Aggregated Earnings Timeline")
-                    ax1.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m/%y'))
-                    plt.xticks(rotation=45)
-                    ax1.legend()
-                    ax1.grid(True, linestyle='--', alpha=0.7)
-                    plt.tight_layout()
-                    plt.savefig(chart_buffer1, format='png', dpi=150, bbox_inches='tight')
-                    plt.close(fig1)
-                
+                agg_df = processed_df.groupby('date').agg({
+                    'gross_revenue': 'sum',
+                    'total_cut': 'sum'
+                }).reset_index()
+                chart_specs.append({
+                    "title": "Aggregated Earnings Timeline",
+                    "figsize": (7, 3.5),
+                    "series": [
+                        ("Total Gross", agg_df['date'].dt.to_pydatetime().tolist(), agg_df['gross_revenue'].tolist()),
+                        ("Total Earnings", agg_df['date'].dt.to_pydatetime().tolist(), agg_df['total_cut'].tolist())
+                    ]
+                })
+
                 # 4b. User Comparison Chart with internal legend
-                chart_buffer2 = io.BytesIO()
-                with plt.rc_context():
-                    fig2, ax2 = plt.subplots(figsize=(7, 4))  # Slightly taller for legend
-                    valid_members = processed_df[processed_df['member'].notnull()]
-                    sorted_members = sorted(
-                        valid_members['member'].unique(),
-                        key=lambda m: m.display_name.lower()
-                    )
-                    
-                    for member in sorted_members:
-                        group = valid_members[valid_members['member'] == member]
-                        group = group.sort_values('date')
-                        ax2.plot(group['date'], group['gross_revenue'], 'o-', label=f"{member.display_name} (@{member.name})")
-                    
-                    ax2.set_title("Users Revenue Comparison")
-                    ax2.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m/%y'))
-                    plt.xticks(rotation=45)
-                    # Legend inside plot
-                    ax2.legend(loc='upper center', bbox_to_anchor=(0.5, -0.45),
-                        ncol=3, frameon=True, shadow=True)
-                    ax2.grid(True, linestyle='--', alpha=0.7)
-                    plt.tight_layout()
-                    plt.savefig(chart_buffer2, format='png', dpi=150, bbox_inches='tight')
-                    plt.close(fig2)
-
-                elements.append(Image(chart_buffer1, width=450, height=200))
-                elements.append(Spacer(1, 12))
-                elements.append(Image(chart_buffer2, width=450, height=250))
-            
+                sorted_user_ids = sorted(user_groups, key=lambda x: members[x].display_name.lower())
+                chart_specs.append({
+                    "title": "Users Revenue Comparison",
+                    "figsize": (7, 4),  # Slightly taller for legend
+                    "legend": {"loc": "upper center", "bbox_to_anchor": (0.5, -0.45), "ncol": 3, "frameon": True, "shadow": True},
+                    "series": [
+                        (
+                            f"{members[user_id].display_name} (@{members[user_id].name})",
+                            user_groups[user_id]['date'].dt.to_pydatetime().tolist(),
+                            user_groups[user_id]['gross_revenue'].tolist()
+                        )
+                        for user_id in sorted_user_ids
+                    ]
+                })
+
+                # 5. Individual chart pages, highest grossing users first, capped by chart budget
+                ranked_user_ids = sorted(user_groups, key=lambda x: user_groups[x]['gross_revenue'].sum(), reverse=True)
+                for user_id in ranked_user_ids[chart_budget:]:
+                    skipped_chart_members.append(f"{members[user_id].display_name} (@{members[user_id].name})")
+                for user_id in ranked_user_ids[:chart_budget]:
+                    member = members[user_id]
+                    user_data = user_groups[user_id]
+                    dates = user_data['date'].dt.to_pydatetime().tolist()
+                    chart_members.append(member)
+                    chart_specs.append({
+                        "title": f"{member.display_name}'s Earnings",
+                        "series": [
+                            ("Gross Revenue", dates, user_data['gross_revenue'].tolist()),
+                            ("Earnings", dates, user_data['total_cut'].tolist())
+                        ]
+                    })
             else:
-                chart_buffer = io.BytesIO()
-                with plt.rc_context():
-                    fig, ax = plt.subplots(figsize=(7, 4))
-                    dates = [datetime.strptime(e['date'], '%d/%m/%Y') for e in user_earnings]
-                    gross = [float(e['gross_revenue']) for e in user_earnings]
-                    earnings = [float(e['total_cut']) for e in user_earnings]
-                    ax.plot(dates, gross, 'o-', label='Gross Revenue')
-                    ax.plot(dates, earnings, 'o-', label='Earnings')
-                    ax.set_title(f'{user.display_name}\'s Earnings')
-                    ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m/%y'))
-                    plt.xticks(rotation=45)
-                    ax.legend()
-                    ax.grid(True, linestyle='--', alpha=0.7)
-                    plt.tight_layout()
-                    plt.savefig(chart_buffer, format='png', dpi=150, bbox_inches='tight')
-                    plt.close(fig)
-                
-                elements.append(Image(chart_buffer, width=450, height=250))
+                sorted_earnings = sorted(user_earnings, key=lambda e: datetime.strptime(e['date'], '%d/%m/%Y'))
+                dates = [datetime.strptime(e['date'], '%d/%m/%Y') for e in sorted_earnings]
+                chart_specs.append({
+                    "title": f"{user.display_name}'s Earnings",
+                    "series": [
+                        ("Gross Revenue", dates, [float(e['gross_revenue']) for e in sorted_earnings]),
+                        ("Earnings", dates, [float(e['total_cut']) for e in sorted_earnings])
+                    ]
+                })
+
+            # Render charts not already cached in parallel workers, off the event loop
+            chart_images = await charts.render_cached(chart_specs, dataset_version or charts.dataset_version(user_earnings))
 
-            # ======================
-            # 5. Individual Breakdowns
-            # ======================
             if all_data:
+                elements.append(Image(io.BytesIO(chart_images[0]), width=450, height=200))
+                elements.append(Spacer(1, 12))
+                elements.append(Image(io.BytesIO(chart_images[1]), width=450, height=250))
+
+                # ======================
+                # 5. Individual Breakdowns
+                # ======================
                 elements.append(PageBreak())
                 elements.append(Paragraph("Individual User Breakdowns", styles["Heading2"]))
-                
-                valid_members = [m for m in processed_df['member'].unique() if m is not None]
-                
-                for member in valid_members:
+
+                for member, image in zip(chart_members, chart_images[2:]):
                     elements.append(Paragraph(f"{member.display_name} (@{member.name})", styles["Heading3"]))
-                    
-                    user_data = processed_df[processed_df['member'] == member]
-                    dates = user_data['date'].dt.to_pydatetime()
-                    gross = user_data['gross_revenue'].astype(float)
-                    earnings = user_data['total_cut'].astype(float)
-
-                    fig, ax = plt.subplots(figsize=(7, 4))
-                    ax.plot(dates, gross, 'o-', label='Gross Revenue')
-                    ax.plot(dates, earnings, 'o-', label='Earnings')
-                    ax.set_title(f'{member.display_name}\'s Earnings')
-                    ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m/%y'))
-                    plt.xticks(rotation=45)
-                    ax.legend()
-                    ax.grid(True, linestyle='--', alpha=0.7)
-                    plt.tight_layout()
-                    
-                    user_buffer = io.BytesIO()
-                    plt.savefig(user_buffer, format='png', dpi=150)
-                    plt.close(fig)
-                    
-                    elements.append(Image(user_buffer, width=450, height=250))
+                    elements.append(Image(io.BytesIO(image), width=450, height=250))
                     elements.append(Spacer(1, 12))
+            else:
+                elements.append(Image(io.BytesIO(chart_images[0]), width=450, height=250))
 
-            doc.build(elements)
+            # ======================
+            # 6. Summary Appendix (only when a budget was exceeded)
+            # ======================
+            if len(user_earnings) > row_budget or skipped_chart_members:
+                group_column = 'user' if all_data and 'user' in df.columns else 'role'
+                grouped = df.fillna({group_column: 'Unknown'}).groupby(group_column).agg(
+                    entries=('gross_revenue', 'size'),
+                    hours=('hours_worked', 'sum'),
+                    gross=('gross_revenue', 'sum'),
+                    earnings=('total_cut', 'sum')
+                ).sort_values('gross', ascending=False)
+                group_totals = [
+                    [str(name), f"{int(row.entries)}", f"{float(row.hours):.1f}", f"${float(row.gross):,.2f}", f"${float(row.earnings):,.2f}"]
+                    for name, row in grouped.iterrows()
+                ]
+                elements.append(PageBreak())
+                elements.extend(pdf_builder.build_summary_appendix(
+                    styles,
+                    len(user_earnings),
+                    min(len(user_earnings), row_budget),
+                    "User" if group_column == 'user' else "Role",
+                    group_totals,
+                    skipped_chart_members
+                ))
+
+            await asyncio.to_thread(doc.build, elements)
 
         except Exception as e:
+            logger.error(f"PDF generation failed: {e}", exc_info=True)
             error_buffer = io.BytesIO()
             doc = SimpleDocTemplate(error_buffer, pagesize=letter)
             elements = [
@@ -540,57 +547,76 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
             ]
             doc.build(elements)
             error_buffer.seek(0)
+            buffer.seek(0)
+            buffer.truncate()
             buffer.write(error_buffer.read())
             buffer.seek(0)
 
-    async def _generate_png(self, df, user, buffer, user_earnings, all_data=False):
+    def _build_overview_chart_spec(self, df, user, user_earnings, all_data=False):
+        """
+        Build the overview chart shared by the PNG, HTML and Markdown exports.
+
+        Args:
+            df: DataFrame with earnings data
+            user: User object with display_name attribute
+            user_earnings: Original list of earnings data
+            all_data: Boolean indicating if this is a full report with multiple users
+
+        Returns:
+            Chart specification for charts.render_cached
+        """
+        # Validate and sort data
+        if not user_earnings:
+            raise ValueError("No earnings data to plot")
+
+        if all_data:
+            # Group by user if showing all data
+            user_df = df[['user', 'date', 'gross_revenue']].copy()
+            user_df['date'] = pd.to_datetime(user_df['date'], format='%d/%m/%Y')
+            user_df = user_df.sort_values('date')
+            spec = {
+                "title": 'Gross Revenue by User Over Time',
+                "legend": {"loc": "upper left"},
+                "series": [
+                    (user_id, group['date'].dt.to_pydatetime().tolist(), group['gross_revenue'].astype(float).tolist())
+                    for user_id, group in user_df.groupby('user')
+                ]
+            }
+        else:
+            # Sort entries by date ascending
+            user_df = df[['date', 'gross_revenue', 'total_cut']].dropna(subset=['date']).copy()
+            user_df['date'] = pd.to_datetime(user_df['date'], format='%d/%m/%Y')
+            user_df = user_df.sort_values('date', kind='stable')
+            dates = user_df['date'].dt.to_pydatetime().tolist()
+            spec = {
+                "title": f'Earnings for {user.display_name}',
+                "styles": ['b-o', 'r-o'],
+                "series": [
+                    ('Gross Revenue', dates, user_df['gross_revenue'].astype(float).tolist()),
+                    ('Earnings', dates, user_df['total_cut'].astype(float).tolist())
+                ]
+            }
+        spec["figsize"] = (12, 6)
+        return spec
+
+    async def _get_overview_chart_base64(self, df, user, user_earnings, all_data, dataset_version):
+        """Return the overview chart as base64 PNG for embedding, or None if it can't be drawn"""
+        try:
+            spec = self._build_overview_chart_spec(df, user, user_earnings, all_data)
+            image = (await charts.render_cached([spec], dataset_version or charts.dataset_version(user_earnings)))[0]
+            return base64.b64encode(image).decode('ascii')
+        except Exception as e:
+            logger.warning(f"Could not embed overview chart: {e}")
+            return None
+
+    async def _generate_png(self, df, user, buffer, user_earnings, all_data=False, dataset_version=None):
         """Generate PNG format export"""
         try:
-            with plt.rc_context():  # Isolate plot settings
-                fig, ax = plt.subplots(figsize=(12, 6))
-                
-                # Validate and sort data
-                if not user_earnings:
-                    raise ValueError("No earnings data to plot")
-                    
-                # Sort entries by date ascending
-                sorted_earnings = sorted(
-                    [e for e in user_earnings if 'date' in e],
-                    key=lambda x: datetime.strptime(x['date'], '%d/%m/%Y')
-                )
+            spec = self._build_overview_chart_spec(df, user, user_earnings, all_data)
 
-                # Create date objects
-                dates = [datetime.strptime(e['date'], '%d/%m/%Y') for e in sorted_earnings]
-                
-                if all_data:
-                    # Group by user if showing all data
-                    for user_id, group in df.groupby('user'):
-                        user_dates = [datetime.strptime(d, '%d/%m/%Y') for d in group['date']]
-                        ax.plot(user_dates, group['gross_revenue'], 'o-', label=user_id)
-                    ax.set_title('Gross Revenue by User Over Time')
-                    ax.legend(loc='upper left')
-                else:
-                    # Plot individual user data
-                    ax.plot(dates, 
-                            [float(e['gross_revenue']) for e in sorted_earnings], 
-                            'b-o', label='Gross Revenue')
-                    ax.plot(dates, 
-                            [float(e['total_cut']) for e in sorted_earnings], 
-                            'r-o', label='Earnings')
-                    ax.set_title(f'Earnings for {user.display_name}')
-
-                # Format dates with 2-digit year (e.g., 2025 → 25)
-                ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m/%y'))  # %y for 2-digit year
-                fig.autofmt_xdate(rotation=45)  # Auto-rotate and space labels
-                
-                # Add legend and grid
-                ax.legend()
-                ax.grid(True, linestyle='--', alpha=0.7)
-                plt.tight_layout()
-                
-                # Save to buffer
-                plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-                plt.close(fig)
+            # Shared with the HTML/Markdown exports through the chart cache
+            image = (await charts.render_cached([spec], dataset_version or charts.dataset_version(user_earnings)))[0]
+            buffer.write(image)
                 
         except Exception as e:
             # Create error plot as fallback
@@ -601,9 +627,11 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
             plt.close()
             buffer.seek(0)
 
-    async def _generate_html(self, df, interaction, user, buffer, user_earnings, all_data=False):
+    async def _generate_html(self, df, interaction, user, buffer, user_earnings, all_data=False, dataset_version=None):
         """Generate HTML format export"""
         agency_name = await self.get_agency_name(interaction.guild.id)
+        chart_base64 = await self._get_overview_chart_base64(df, user, user_earnings, all_data, dataset_version)
+        chart_section = f'<h2>Earnings Chart</h2>\n            <img src="data:image/png;base64,{chart_base64}" alt="Earnings chart" style="max-width: 100%;">' if chart_base64 else ""
         report_title = f"{agency_name} Full Earnings Report" if all_data else f"{agency_name} Earnings Report for {user.display_name}"
         user_column = ""
         
@@ -676,6 +704,8 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
                 <p class="summary-item"><strong>Total Hours Worked:</strong> {df['hours_worked'].sum():.1f}</p>
             </div>
             
+            {chart_section}
+            
             <h2>Detailed Earnings</h2>
             <table>
                 <tr>
@@ -746,7 +776,7 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
         buffer.write(html_content.encode('utf-8'))
 
 
-    async def _generate_markdown(self, df, interaction, user, buffer, user_earnings, all_data):
+    async def _generate_markdown(self, df, interaction, user, buffer, user_earnings, all_data, dataset_version=None):
         """Generate Markdown format export
 
         Args:
@@ -755,8 +785,10 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
             buffer: Output buffer to write markdown content
             user_earnings: List of user earnings entries
             all_data: Boolean indicating if this is a full report or user-specific
+            dataset_version: Chart cache version of user_earnings
         """
         agency_name = await self.get_agency_name(interaction.guild.id)
+        chart_base64 = await self._get_overview_chart_base64(df, user, user_earnings, all_data, dataset_version)
         report_title = f"{agency_name} Full Earnings Report" if all_data else f"{agency_name} Earnings Report for {user.display_name}"
         current_date = datetime.now()
 
@@ -816,6 +848,10 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
             else:
                 md_content += f"| {i} | {entry['date']} | {entry['role']} | {entry['shift'].capitalize()} | {hours:.1f} | ${gross_revenue:.2f} | ${total_cut:.2f} |\n"
 
+        # Overview chart, embedded inline
+        if chart_base64:
+            md_content += f"\n## Earnings Chart\n\n![Earnings chart](data:image/png;base64,{chart_base64})\n"
+
         # Role Summary Table (for both cases)
         md_content += "\n## Earnings by Role\n\n"
         md_content += "| Role | Total Earnings | Hours Worked | Percentage of Total |\n"
@@ -967,7 +1003,20 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
         if compensation_type == "commission":
             await self.start_period_selection_with_hours(interaction, compensation_type, Decimal(0))
         else:
-            modal = HoursWorkedModal(self, None, None, None, None, compensation_type, ephemeral)
+            # Prefill with the user's last clocked shift, if it ended recently
+            since = int(datetime.now().timestamp()) - settings.SHIFT_PREFILL_WINDOW_HOURS * 3600
+            # The modal has to open within Discord's 3 second window, so a cold shift index
+            # gets a short budget; shielded so the load still finishes for the next workflow
+            try:
+                last_shift = await asyncio.wait_for(
+                    asyncio.shield(shift_log.latest_shift(interaction.guild_id, interaction.user.id, since=since)),
+                    timeout=settings.SHIFT_PREFILL_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"Shift index for guild {interaction.guild_id} not ready, opening hours modal without prefill")
+                last_shift = None
+            default_hours = f"{last_shift.hours_worked:.2f}" if last_shift else None
+            modal = HoursWorkedModal(self, None, None, None, None, compensation_type, ephemeral, default_hours)
             await interaction.response.send_modal(modal)
 
     async def start_period_selection_with_hours(self, interaction: discord.Interaction, compensation_type: str, hours_worked: Decimal):
@@ -1187,23 +1236,13 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
         models_list = ", ".join(selected_models) if selected_models else ""
 
         # NOTE: Load active bonuses and penalties from clock system
-        clock_data = await file_handlers.load_json(settings.get_guild_clock_data_path(interaction.guild_id), {})
-        user_bonuses_penalties = clock_data.get("bonuses_penalties", {}).get(str(interaction.user.id), [])
+        ledger = await bonus_ledger.load(interaction.guild_id, interaction.user.id)
+        active_bonuses = ledger.of_type("bonus")
+        active_penalties = ledger.of_type("penalty")
 
         # NOTE: Calculate total additional bonuses and penalties
-        total_additional_bonus = Decimal(0)
-        total_additional_penalty = Decimal(0)
-
-        active_bonuses = []
-        active_penalties = []
-
-        for item in user_bonuses_penalties:
-            if item["type"] == "bonus":
-                total_additional_bonus += Decimal(str(item["amount"]))
-                active_bonuses.append(item)
-            elif item["type"] == "penalty":
-                total_additional_penalty += Decimal(str(item["amount"]))
-                active_penalties.append(item)
+        total_additional_bonus = sum((Decimal(str(item["amount"])) for item in active_bonuses), Decimal(0))
+        total_additional_penalty = sum((Decimal(str(item["amount"])) for item in active_penalties), Decimal(0))
 
         # NOTE: Apply bonuses and penalties to the total cut
         original_total_cut = Decimal(str(results["total_cut"]))
@@ -1377,32 +1416,26 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
         }
         
         earnings_data[sender].append(new_entry)
-
-        # NOTE: Remove used bonuses and penalties from clock system
-        if "active_bonuses" in results or "active_penalties" in results:
-            clock_data = await file_handlers.load_json(settings.get_guild_clock_data_path(interaction.guild.id), {})
-            user_bonuses_penalties = clock_data.get("bonuses_penalties", {}).get(str(interaction.user.id), [])
-            
-            # Remove all active bonuses and penalties that were applied
-            updated_items = [
-                item for item in user_bonuses_penalties 
-                if item not in results.get("active_bonuses", []) and item not in results.get("active_penalties", [])
-            ]
-            
-            clock_data["bonuses_penalties"][str(interaction.user.id)] = updated_items
-            await file_handlers.save_json(settings.get_guild_clock_data_path(interaction.guild.id), clock_data)
-        # NOTE: End
         
         # Log final calculation
         hours_worked_text = f", Hours Worked={results.get('hours_worked', 'N/A')}" if "hours_worked" in results else ""
         logger.info(f"Final calculation for {interaction.user.name} ({interaction.user.id}): Gross=${results['gross_revenue']}, Total Cut=${results['total_cut']}, Period={results['period']}, Shift={results['shift']}, Role={results['role']}{hours_worked_text}")
         
         # Save updated earnings data
-        success = await file_handlers.save_json(settings.get_guild_earnings_path(interaction.guild.id), earnings_data)
+        earnings_path = settings.get_guild_earnings_path(interaction.guild.id)
+        previous_fingerprint = file_handlers.get_file_fingerprint(earnings_path)
+        success = await file_handlers.save_json(earnings_path, earnings_data)
         if not success:
             logger.error(f"Failed to save earnings data for {sender}")
             await interaction.followup.send("⚠ Calculation failed to save data. Please try again.", ephemeral=ephemeral)
             return
+        model_index.apply_changes(interaction.guild.id, previous_fingerprint, added=[(sender, new_entry)])
+
+        # NOTE: Consume the applied bonuses and penalties by ID and archive them, now that the sale is saved
+        applied_ids = [item["id"] for item in results.get("active_bonuses", []) + results.get("active_penalties", [])]
+        if applied_ids:
+            await bonus_ledger.consume(interaction.guild.id, interaction.user.id, applied_ids, unique_id)
+        # NOTE: End
         
         # Check if average display is enabled
         guild_settings_file = settings.get_guild_display_path(guild_id)
@@ -1498,165 +1531,108 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
             view=None
         )
 
-    async def create_list_embed(self, interaction, user_earnings, embed, all_data=False, period=False):
-        """Creates properly sized list entries that respect Discord's 1024 character limit per field."""
-        embeds = [embed]
-        current_embed = embed
-        field_count = 0
-        MAX_FIELDS_PER_EMBED = 8  # Reduced from 20 to stay within limits
-        
-        for idx, entry in enumerate(user_earnings, start=1):
-            gross_revenue = float(entry['gross_revenue'])
-            total_cut = float(entry['total_cut'])
-            entry_id = entry['id']
-            
-            # Create entry text
-            entry_text = f"```diff\n+ Entry #{idx}\n"
+    def format_list_entry(self, interaction, idx, entry, all_data=False, period=False, show_ids=False):
+        """Format a single earnings entry as a list field value."""
+        gross_revenue = float(entry['gross_revenue'])
+        total_cut = float(entry['total_cut'])
+        entry_id = entry['id']
+        
+        # Create entry text
+        entry_text = f"{LIST_ENTRY_START}{idx}\n"
+
+        if show_ids:
+            entry_text += f"{LIST_LABELS['id']}{entry_id}\n"
+        
+        # Add username if all_data is True and user_id is available
+        if all_data and 'user_id' in entry:
+            entry_text += f"{LIST_LABELS['user']}{entry.get('user') or 'Unknown'}\n"
+        
+        entry_text += f"{LIST_LABELS['date']}{entry.get('date', 'N/A')}\n"
+        if period:
+            entry_text += f"{LIST_LABELS['period']}{entry.get('period', 'N/A')}\n"
+        entry_text += f"{LIST_LABELS['role']}{_role_label(entry)}\n"
+        entry_text += f"{LIST_LABELS['gross']}${gross_revenue:.2f}\n"
+        entry_text += f"{LIST_LABELS['cut']}${total_cut:.2f}\n"
+        entry_text += LIST_ENTRY_END
+        return entry_text
+
+    def list_entry_length(self, idx, entry, all_data=False, period=False, show_ids=False):
+        """Length of format_list_entry's output, computed without building it."""
+        length = len(LIST_ENTRY_START) + _digits(idx) + 1
+        if show_ids:
+            length += len(LIST_LABELS['id']) + len(str(entry['id'])) + 1
+        if all_data and 'user_id' in entry:
+            length += len(LIST_LABELS['user']) + len(str(entry.get('user') or 'Unknown')) + 1
+        length += len(LIST_LABELS['date']) + len(str(entry.get('date', 'N/A'))) + 1
+        if period:
+            length += len(LIST_LABELS['period']) + len(str(entry.get('period', 'N/A'))) + 1
+        length += len(LIST_LABELS['role']) + len(_role_label(entry)) + 1
+        length += len(LIST_LABELS['gross']) + 1 + _fixed2_width(entry['gross_revenue']) + 1
+        length += len(LIST_LABELS['cut']) + 1 + _fixed2_width(entry['total_cut']) + 1
+        return length + len(LIST_ENTRY_END)
+
+    def format_table_row(self, index, entry):
+        """Format a single earnings entry as a fixed-width table line."""
+        gross_revenue = float(entry['gross_revenue'])
+        total_cut = float(entry['total_cut'])
+        
+        # Get the date safely
+        date_str = str(entry.get('date', 'N/A'))
+        date_display = date_str[:10] if len(date_str) >= 10 else date_str
+        
+        # Get the role safely
+        role_str = str(entry.get('role', 'N/A')).capitalize()
+        role_display = role_str[:9] if len(role_str) >= 9 else role_str.ljust(9)
+        
+        # Use fixed width formatting to align columns properly
+        return f"{index:3} | {date_display} | {role_display} |  {gross_revenue:7.2f} |  {total_cut:7.2f}\n"
+
+    def table_row_length(self, index, entry):
+        """Length of format_table_row's output, computed without building it."""
+        date_length = min(len(str(entry.get('date', 'N/A'))), 10)
+        return (
+            max(3, _digits(index)) + 3 + date_length + 3 + 9 + 4
+            + max(7, _fixed2_width(entry['gross_revenue'])) + 4
+            + max(7, _fixed2_width(entry['total_cut'])) + 1
+        )
 
-            if interaction.user.guild_permissions.administrator and await self.get_show_ids(interaction.guild.id):
-                entry_text += f"🔑 Sale ID: {entry_id}\n"
-            
-            # Add username if all_data is True and user_id is available
-            if all_data and 'user_id' in entry:
-                # user_id = entry['user_id'].strip('<@>')
-                # user = interaction.guild.get_member(int(user_id))
-                user = interaction.guild.get_member(entry['user_id'])
-                entry_text += f"👤 User:    {f'{user.display_name} (@{user.name})' if user else 'Unknown'}\n"
-            
-            entry_text += f"📅 Date:    {entry.get('date', 'N/A')}\n"
-            if period:
-                entry_text += f"⌛ Period:  {entry.get('period', 'N/A')}\n"
-            entry_text += f"🎯 Role:    {entry.get('role', 'N/A').capitalize()}\n"
-            entry_text += f"💰 Gross:   ${gross_revenue:.2f}\n"
-            entry_text += f"💸 Cut:     ${total_cut:.2f}\n"
-            entry_text += "```"
-            
-            # Check if we need a new embed due to field limits
-            if field_count >= MAX_FIELDS_PER_EMBED:
-                # Create new embed
-                current_embed = discord.Embed(
-                    title=f"{embed.title} (continued)",
-                    color=embed.color,
-                    timestamp=interaction.created_at
-                )
-                embeds.append(current_embed)
-                field_count = 0
-            
-            current_embed.add_field(name=f"", value=entry_text, inline=False)
-            field_count += 1
-        
-        # Add totals to last embed
-        total_gross = sum(float(entry['gross_revenue']) for entry in user_earnings)
-        total_cut_sum = sum(float(entry['total_cut']) for entry in user_earnings)
-        
-        # Add totals field to the last embed
-        if field_count >= MAX_FIELDS_PER_EMBED - 2:
-            # Create a new embed if we're close to the limit
-            summary_embed = discord.Embed(
-                title=f"{embed.title} (Summary)",
-                color=embed.color,
-                timestamp=interaction.created_at
-            )
-            embeds.append(summary_embed)
-            last_embed = summary_embed
+    def format_table_chunk(self, entries, start_index, include_header=True):
+        """Format consecutive earnings entries as a fixed-width table field value."""
+        table_text = "```\n" + (TABLE_HEADER if include_header else "")
+        for j, entry in enumerate(entries, start=start_index):
+            table_text += self.format_table_row(j, entry)
+        table_text += "```"
+        return table_text
+
+    def totals_fields(self, total_gross, total_cut_sum):
+        """Total Gross / Total Cut fields shown after a listing."""
+        return [
+            ("Total Gross", f"```\n${total_gross:.2f}\n```", True),
+            ("Total Cut", f"```\n${total_cut_sum:.2f}\n```", True)
+        ]
+
+    def build_totals_embed(self, interaction, user, all_data, total_gross, total_cut_sum):
+        """Build the earnings summary embed with gross and cut totals."""
+        summary_for_text = None
+        if not all_data:
+            summary_for_text = f"{interaction.user.display_name}"
         else:
-            last_embed = embeds[-1]
-        
-        last_embed.add_field(name="Total Gross", value=f"```\n${total_gross:.2f}\n```", inline=True)
-        last_embed.add_field(name="Total Cut", value=f"```\n${total_cut_sum:.2f}\n```", inline=True)
-        
-        return embeds
+            summary_for_text = f"(All Users)"
 
-    async def create_table_embed(self, interaction, user_earnings, embed, all_data=False):
-        """Creates a table display that respects Discord's field character limits."""
-        rows_per_chunk = 6  # Further reduced to ensure we stay within limits
-        embeds = [embed]
-        current_embed = embed
-        field_count = 0
-        MAX_FIELDS_PER_EMBED = 5  # Further reduced to keep embed size smaller
-        
-        # Calculate totals first
-        total_gross = sum(float(entry['gross_revenue']) for entry in user_earnings)
-        total_cut_sum = sum(float(entry['total_cut']) for entry in user_earnings)
-        
-        # Process entries in chunks
-        for i in range(0, len(user_earnings), rows_per_chunk):
-            chunk = user_earnings[i:i+rows_per_chunk]
-            
-            if i == 0:
-                table_text = "```\n  # |   Date     |   Role    |  Gross   |   Cut    \n----|------------|-----------|----------|----------\n"
-            else:
-                table_text = "```"
-            
-            # Add rows to this chunk
-            for j, entry in enumerate(chunk, start=i+1):
-                gross_revenue = float(entry['gross_revenue'])
-                total_cut = float(entry['total_cut'])
-                
-                # Get the date safely
-                date_str = str(entry.get('date', 'N/A'))
-                date_display = date_str[:10] if len(date_str) >= 10 else date_str
-                
-                # Get the role safely
-                role_str = str(entry.get('role', 'N/A')).capitalize()
-                role_display = role_str[:9] if len(role_str) >= 9 else role_str.ljust(9)
-                
-                # Use fixed width formatting to align columns properly
-                row = f"{j:3} | {date_display} | {role_display} |  {gross_revenue:7.2f} |  {total_cut:7.2f}\n"
-                
-                table_text += row
-            
-            table_text += "```"
-            
-            # Check if we need a new embed
-            if field_count >= MAX_FIELDS_PER_EMBED:
-                # Create new embed
-                current_embed = discord.Embed(
-                    title=f"{embed.title} (continued)",
-                    color=embed.color,
-                    timestamp=interaction.created_at
-                )
-                embeds.append(current_embed)
-                field_count = 0
-            
-            # Add the chunk as a field
-            chunk_start = i + 1
-            chunk_end = min(i + rows_per_chunk, len(user_earnings))
-            current_embed.add_field(
-                name=f"", 
-                # name=f"Entries {chunk_start}-{chunk_end}", 
-                value=table_text, 
-                inline=False
-            )
-            field_count += 1
-        
-        # Always add totals to a new embed to ensure we don't exceed limits
-        summary_embed = discord.Embed(
-            title=f"{embed.title} (Summary)",
-            color=embed.color,
+        embed = discord.Embed(
+            title=f"📊 Earnings Summary - {summary_for_text}",
+            color=0x2ECC71,
             timestamp=interaction.created_at
         )
-        embeds.append(summary_embed)
-        
-        summary_embed.add_field(name="Total Gross", value=f"```\n {total_gross:.2f}\n```", inline=True)
-        summary_embed.add_field(name="Total Cut", value=f"```\n {total_cut_sum:.2f}\n```", inline=True)
-        
-        return embeds
 
-    async def send_paginated_embeds(self, interaction, embeds, ephemeral=True):
-        """Sends multiple embeds as separate messages with page numbering."""
-        if not embeds:
-            await interaction.followup.send("No data to display.", ephemeral=ephemeral)
-            return
-        
-        total_pages = len(embeds)
-        
-        for i, embed in enumerate(embeds, start=1):
-            # Add page number to footer
-            embed.set_footer(text=f"Page {i}/{total_pages} • Today at {datetime.now().strftime('%I:%M %p')}")
-            
-            # Send the embed
-            await interaction.followup.send(embed=embed, ephemeral=ephemeral)
+        if user and user.avatar:
+            embed.set_thumbnail(url=user.avatar.url)
+        elif interaction.user.avatar:
+                embed.set_thumbnail(url=interaction.user.avatar.url)
+
+        embed.add_field(name="Total Gross", value=f"```\n${total_gross:.2f}\n```", inline=True)
+        embed.add_field(name="Total Cut", value=f"```\n${total_cut_sum:.2f}\n```", inline=True)
+        return embed
 
     def parse_mentions(self, send_to_str: str, guild: discord.Guild) -> tuple[list[discord.Member], list[discord.Role]]:
         """Parse user and role mentions from a string"""
@@ -1835,40 +1811,56 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
             # Validate entries count
             entries = min(max(entries, 1), MAX_ENTRIES)
 
+            # Totals only: aggregate server-side instead of loading every entry
+            if not display_entries and export == "none" and not send_to and entries == MAX_ENTRIES:
+                try:
+                    from_date = datetime.strptime(range_from, "%d/%m/%Y") if range_from else None
+                    to_date = datetime.now() if range_to == "~" else (
+                        datetime.strptime(range_to, "%d/%m/%Y") if range_to else None
+                    )
+                    if to_date:
+                        to_date = to_date.replace(hour=23, minute=59, second=59)
+                except ValueError:
+                    return await interaction.followup.send("❌ Invalid date format. Use dd/mm/yyyy.", ephemeral=ephemeral)
+
+                summary = await summaries.summarize(
+                    interaction.guild.id,
+                    period=period,
+                    user_mention=None if all_data else (user or interaction.user).mention,
+                    from_date=from_date,
+                    to_date=to_date
+                )
+                totals = summary["totals"]
+                if not totals["count"]:
+                    return await interaction.followup.send(
+                        "❌ No earnings data found for the period: " + period if period else "❌ No earnings data found.",
+                        ephemeral=ephemeral
+                    )
+                embed = self.build_totals_embed(interaction, user, all_data, totals["gross"], totals["cut"])
+                return await interaction.followup.send(embed=embed, ephemeral=ephemeral)
+
             # Load and filter data
-            earnings_data = await file_handlers.load_json(settings.get_guild_earnings_path(interaction.guild.id), {}) 
             user_earnings = None
+            members = None
 
             if not all_data:
-                if user:
-                    user_earnings = earnings_data.get(user.mention, [])
-                else:
-                    user_earnings = earnings_data.get(interaction.user.mention, [])
+                # Only the user's entries are streamed
+                target_mention = user.mention if user else interaction.user.mention
+                user_earnings = [entry async for _, entry in file_handlers.iter_earnings(interaction.guild.id, user_mention=target_mention)]
             else:
-                # When all_data is True, add user_id to each entry
-                user_earnings = [
-                    {
-                        **entry, 
+                earnings_data = await file_handlers.load_earnings(interaction.guild.id)
+                # When all_data is True, add user info to each entry, resolving each user once
+                members = await MemberDirectory.build(interaction.guild, earnings_data.keys())
+                user_earnings = []
+                for user_id, user_entries in earnings_data.items():
+                    member = members.get(user_id)
+                    user_info = {
                         'user_id': int(user_id.strip('<@>')),
-                        'display_name': (
-                            interaction.guild.get_member(int(user_id.strip('<@>'))).display_name
-                            if interaction.guild.get_member(int(user_id.strip('<@>')))
-                            else None
-                        ),
-                        'username': (
-                            interaction.guild.get_member(int(user_id.strip('<@>'))).name
-                            if interaction.guild.get_member(int(user_id.strip('<@>')))
-                            else None
-                        ),
-                        'user': (
-                            f"{interaction.guild.get_member(int(user_id.strip('<@>'))).display_name} (@{interaction.guild.get_member(int(user_id.strip('<@>'))).name})"
-                            if interaction.guild.get_member(int(user_id.strip('<@>')))
-                            else None
-                        ),
-                    } 
-                    for user_id, entries in earnings_data.items() 
-                    for entry in entries
-                ]
+                        'display_name': member.display_name if member else None,
+                        'username': member.name if member else None,
+                        'user': member.label if member else None,
+                    }
+                    user_earnings.extend({**entry, **user_info} for entry in user_entries)
 
             # Date filtering
             if range_from or range_to:
@@ -1919,25 +1911,6 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
                     ephemeral=ephemeral
                 )
 
-            summary_for_text = None
-            if not all_data:
-                summary_for_text = f"{interaction.user.display_name}"
-            else:
-                summary_for_text = f"(All Users)"
-
-            # Create embed
-            embed = discord.Embed(
-                title=f"📊 Earnings Summary - {summary_for_text}",
-                color=0x2ECC71,
-                timestamp=interaction.created_at
-            )
-
-            if user and user.avatar:
-                embed.set_thumbnail(url=user.avatar.url)
-            elif interaction.user.avatar:
-                    embed.set_thumbnail(url=interaction.user.avatar.url)
-
-
             total_gross = 0
             total_cut_sum = 0
             for index, entry in enumerate(user_earnings, start=1):
@@ -1945,28 +1918,32 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
                 total_cut = float(entry['total_cut'])
                 total_gross += gross_revenue
                 total_cut_sum += total_cut
-            embed.add_field(name="Total Gross", value=f"```\n${total_gross:.2f}\n```", inline=True)
-            embed.add_field(name="Total Cut", value=f"```\n${total_cut_sum:.2f}\n```", inline=True)
+
+            # Create embed
+            embed = self.build_totals_embed(interaction, user, all_data, total_gross, total_cut_sum)
 
             await interaction.followup.send(embed=embed, ephemeral=ephemeral)
 
             if display_entries:
-                base_embed = discord.Embed(
-                    title=f"📊 Earnings {('Table' if as_table else 'List')} {(' - ' + period.upper() if period else '')}",
-                    color=0x2ECC71,
-                    timestamp=interaction.created_at
-                )
-
-                embeds = await self.create_table_embed(interaction, user_earnings, base_embed, all_data) if as_table \
-                    else await self.create_list_embed(interaction, user_earnings, base_embed, all_data, period is None)
-                
                 if all_data and not interaction.user.guild_permissions.administrator:
                     await interaction.followup.send(
                         "🔍 You are comparing your revenue with others. 🔓 Admin exception granted.",
                         ephemeral=ephemeral
                     )
                 else:
-                    await self.send_paginated_embeds(interaction, embeds, ephemeral=ephemeral)
+                    # One message, edited in place as pages are viewed
+                    paginator = EarningsPaginatorView(
+                        self,
+                        interaction,
+                        user_earnings,
+                        title=f"📊 Earnings {('Table' if as_table else 'List')} {(' - ' + period.upper() if period else '')}",
+                        as_table=as_table,
+                        all_data=all_data,
+                        show_period=period is None,
+                        show_ids=interaction.user.guild_permissions.administrator and await self.get_show_ids(interaction.guild.id),
+                        totals=(total_gross, total_cut_sum)
+                    )
+                    await paginator.start(ephemeral=ephemeral)
                 
             else:
                 pass
@@ -2004,7 +1981,7 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
             file = None
             if export != "none":
                 try:
-                    file = await self.generate_export_file(user_earnings, interaction, interaction.user, export, zip_formats_list if export == "zip" else None, all_data)
+                    file = await self.generate_export_file(user_earnings, interaction, interaction.user, export, zip_formats_list if export == "zip" else None, all_data, members)
                 except Exception as e:
                     return await interaction.followup.send(f"❌ Export failed: {str(e)}", ephemeral=ephemeral)
 
@@ -2039,7 +2016,7 @@ class CalculatorSlashCommands(commands.GroupCog, name="calculate"):
                         file = None
                         if export != "none":
                             try:
-                                file = await self.generate_export_file(user_earnings, interaction, interaction.user, export, zip_formats_list if export == "zip" else None, all_data)
+                                file = await self.generate_export_file(user_earnings, interaction, interaction.user, export, zip_formats_list if export == "zip" else None, all_data, members)
                             except Exception as e:
                                 return await interaction.followup.send(f"❌ Export failed: {str(e)}", ephemeral=ephemeral)
                         
@@ -2346,5 +2323,179 @@ class ConfirmationView(ui.View):
         # Just cancel the workflow
         await interaction.response.edit_message(content="❌ Calculation cancelled.", embed=None, view=None)
 
+class PageJumpModal(ui.Modal, title="Jump to Page"):
+    def __init__(self, paginator):
+        super().__init__()
+        self.paginator = paginator
+        
+        self.page_input = ui.TextInput(
+            label=f"Page number (1-{paginator.page_count})",
+            placeholder="Enter page number...",
+            required=True,
+            max_length=6
+        )
+        self.add_item(self.page_input)
+    
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            page = int(self.page_input.value)
+            if not 1 <= page <= self.paginator.page_count:
+                raise ValueError
+        except ValueError:
+            await interaction.response.send_message(
+                f"❌ Enter a page between 1 and {self.paginator.page_count}.",
+                ephemeral=True
+            )
+            return
+        
+        await self.paginator.show_page(interaction, page - 1)
+
+class EarningsPaginatorView(ui.View):
+    """
+    Single-message paginator for earnings entries.
+
+    Page boundaries are planned once from measured field lengths, packing as
+    many entries per page as Discord's embed limits allow (see
+    utils.embed_packer). Pages themselves are rendered on demand from a
+    cursor over the filtered entries, so only the page being shown is ever
+    built, and the whole history costs one message plus one edit per page
+    actually viewed. The view expires after settings.PAGINATOR_TTL seconds
+    without interaction.
+    """
+    def __init__(self, cog, interaction, entries, title, as_table=False, all_data=False,
+                 show_period=False, show_ids=False, totals=None):
+        super().__init__(timeout=settings.PAGINATOR_TTL)
+        self.cog = cog
+        self.interaction = interaction
+        self.entries = entries
+        self.title = title
+        self.as_table = as_table
+        self.all_data = all_data
+        self.show_period = show_period
+        self.show_ids = show_ids
+        self.totals_fields = cog.totals_fields(*totals) if totals else []
+        self.cursor = 0
+        self.message = None
+        
+        # Measure every field once to plan page boundaries, without rendering it; only offsets are kept
+        if as_table:
+            row_lengths = [cog.table_row_length(j, entry) for j, entry in enumerate(entries, start=1)]
+            overhead = len("```\n") + len(TABLE_HEADER) + len("```")
+            self.field_row_starts = [0]
+            field_lengths = []
+            for count in embed_packer.group_lines(row_lengths, overhead):
+                start = self.field_row_starts[-1]
+                field_lengths.append(overhead + sum(row_lengths[start:start + count]))
+                self.field_row_starts.append(start + count)
+        else:
+            field_lengths = [
+                cog.list_entry_length(idx, entry, all_data, show_period, show_ids)
+                for idx, entry in enumerate(entries, start=1)
+            ]
+        self.entry_field_count = len(field_lengths)
+        field_lengths.extend(embed_packer.field_length(name, value) for name, value, _ in self.totals_fields)
+        
+        self.plan = embed_packer.layout(field_lengths, len(f"{title} (continued)"))
+        self.page_field_starts = [0]
+        for embed_counts in self.plan:
+            self.page_field_starts.append(self.page_field_starts[-1] + sum(embed_counts))
+        self.page_count = len(self.plan)
+        
+        self.first_button = ui.Button(label="⏮", style=discord.ButtonStyle.secondary)
+        self.first_button.callback = lambda i: self.show_page(i, 0)
+        self.add_item(self.first_button)
+        
+        self.prev_button = ui.Button(label="◀", style=discord.ButtonStyle.primary)
+        self.prev_button.callback = lambda i: self.show_page(i, self.cursor - 1)
+        self.add_item(self.prev_button)
+        
+        self.jump_button = ui.Button(label=f"1/{self.page_count}", style=discord.ButtonStyle.secondary)
+        self.jump_button.callback = self.on_jump
+        self.add_item(self.jump_button)
+        
+        self.next_button = ui.Button(label="▶", style=discord.ButtonStyle.primary)
+        self.next_button.callback = lambda i: self.show_page(i, self.cursor + 1)
+        self.add_item(self.next_button)
+        
+        self.last_button = ui.Button(label="⏭", style=discord.ButtonStyle.secondary)
+        self.last_button.callback = lambda i: self.show_page(i, self.page_count - 1)
+        self.add_item(self.last_button)
+    
+    def _field(self, index):
+        """Render the field at a global field index"""
+        if index >= self.entry_field_count:
+            return self.totals_fields[index - self.entry_field_count]
+        if self.as_table:
+            start, end = self.field_row_starts[index], self.field_row_starts[index + 1]
+            return ("", self.cog.format_table_chunk(self.entries[start:end], start + 1), False)
+        entry = self.entries[index]
+        return ("", self.cog.format_list_entry(self.interaction, index + 1, entry, self.all_data, self.show_period, self.show_ids), False)
+    
+    def render_page(self) -> List[discord.Embed]:
+        """Build the embeds for the page at the cursor"""
+        fields = [
+            self._field(index)
+            for index in range(self.page_field_starts[self.cursor], self.page_field_starts[self.cursor + 1])
+        ]
+        embeds = embed_packer.build_messages(
+            fields,
+            lambda _: discord.Embed(
+                title=self.title if self.cursor == 0 else f"{self.title} (continued)",
+                color=0x2ECC71,
+                timestamp=self.interaction.created_at
+            ),
+            plan=[self.plan[self.cursor]]
+        )[0]
+        embeds[-1].set_footer(text=f"Page {self.cursor + 1}/{self.page_count} • {len(self.entries)} entries")
+        return embeds
+    
+    def _update_buttons(self):
+        at_start = self.cursor == 0
+        at_end = self.cursor == self.page_count - 1
+        self.first_button.disabled = at_start
+        self.prev_button.disabled = at_start
+        self.next_button.disabled = at_end
+        self.last_button.disabled = at_end
+        self.jump_button.label = f"{self.cursor + 1}/{self.page_count}"
+        self.jump_button.disabled = self.page_count == 1
+    
+    async def start(self, ephemeral=True):
+        """Send the first page"""
+        self._update_buttons()
+        self.message = await self.interaction.followup.send(
+            embeds=self.render_page(),
+            view=self if self.page_count > 1 else discord.utils.MISSING,
+            ephemeral=ephemeral,
+            wait=True
+        )
+        if self.page_count == 1:
+            self.stop()
+    
+    async def show_page(self, interaction: discord.Interaction, page: int):
+        """Move the cursor and edit the message in place"""
+        self.cursor = min(max(page, 0), self.page_count - 1)
+        self._update_buttons()
+        await interaction.response.edit_message(embeds=self.render_page(), view=self)
+    
+    async def on_jump(self, interaction: discord.Interaction):
+        await interaction.response.send_modal(PageJumpModal(self))
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.interaction.user.id:
+            await interaction.response.send_message("❌ Only the person who ran this command can change pages.", ephemeral=True)
+            return False
+        return True
+    
+    async def on_timeout(self):
+        # Drop the entries and disable the controls once the view expires
+        self.entries = []
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException as e:
+                logger.debug(f"Could not disable expired paginator: {e}")
+
 async def setup(bot):
     await bot.add_cog(CalculatorSlashCommands(bot))
\ No newline at end of file
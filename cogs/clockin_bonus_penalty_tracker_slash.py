@@ -1,13 +1,22 @@
 import discord
 from discord import app_commands, ui
-from discord.ext import commands, tasks
+from discord.ext import commands
+import copy
+import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
 import uuid
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 from config import settings # Assuming this exists and has DEFAULT_DISPLAY_SETTINGS, DEFAULT_CLOCK_DATA
 from utils import file_handlers # Assuming this exists for load/save JSON
+from utils import clock_store
+from utils import shift_log
+from utils import bonus_ledger
+from utils import guild_state
+from utils.guild_state import GuildState
+from utils.deadlines import DeadlineScheduler
+from utils.alert_delivery import AlertDelivery
 
 logger = logging.getLogger("xof_calculator.clock_in_tracker_slash")
 
@@ -70,38 +79,43 @@ def split_long_text(text: str, max_len: int = 4096):
 class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
     def __init__(self, bot):
         self.bot = bot
-        self.check_break_overstays.start()
+        # (guild_id, user_id) -> when the user's break alert is next due
+        self.break_deadlines = DeadlineScheduler()
+        self.break_alert_task: Optional[asyncio.Task] = None
+        self.alerts = AlertDelivery()
 
-    def cog_unload(self):
-        self.check_break_overstays.cancel()
+    async def cog_load(self):
+        self.break_alert_task = asyncio.create_task(self.run_break_alerts())
+
+    async def cog_unload(self):
+        if self.break_alert_task:
+            self.break_alert_task.cancel()
 
     async def get_guild_display_settings(self, guild_id: int) -> Dict[str, Any]:
         file_path = settings.get_guild_display_path(guild_id)
         return await file_handlers.load_json(file_path, settings.DEFAULT_DISPLAY_SETTINGS)
 
     async def get_clock_data(self, guild_id: int) -> Dict[str, Any]:
-        path = settings.get_guild_clock_data_path(guild_id)
-        return await file_handlers.load_json(path, settings.DEFAULT_CLOCK_DATA)
+        return await clock_store.load(guild_id)
 
-    async def save_clock_data(self, guild_id: int, data: Dict[str, Any]):
-        path = settings.get_guild_clock_data_path(guild_id)
-        await file_handlers.save_json(path, data)
+    async def get_guild_state(self, guild_id: int) -> GuildState:
+        return await guild_state.load(guild_id)
 
     async def get_user_clock_state(self, clock_data: Dict[str, Any], user_id: int) -> Dict[str, Any]:
         user_id_str = str(user_id)
         if user_id_str not in clock_data["users"]:
-            clock_data["users"][user_id_str] = DEFAULT_USER_CLOCK_STATE.copy()
+            clock_data["users"][user_id_str] = copy.deepcopy(DEFAULT_USER_CLOCK_STATE)
         # Ensure all keys from default exist for older user data
         for key, default_value in DEFAULT_USER_CLOCK_STATE.items():
             if key not in clock_data["users"][user_id_str]:
-                clock_data["users"][user_id_str][key] = default_value
+                clock_data["users"][user_id_str][key] = copy.deepcopy(default_value)
         return clock_data["users"][user_id_str]
 
-    async def has_bonus_penalty_permission(self, interaction: discord.Interaction) -> bool:
+    async def has_bonus_penalty_permission(self, interaction: discord.Interaction, state: Optional[GuildState] = None) -> bool:
         if interaction.user.guild_permissions.administrator:
             return True
-        clock_data = await self.get_clock_data(interaction.guild_id)
-        manager_roles_ids = clock_data.get("settings", {}).get("bonus_penalty_manager_roles", [])
+        state = state or await self.get_guild_state(interaction.guild_id)
+        manager_roles_ids = state.manager_role_ids
         member: discord.Member = interaction.user
         for role_id_str in manager_roles_ids:
             try:
@@ -117,11 +131,14 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
 
     async def send_response(
         self, interaction: discord.Interaction, message: Optional[str] = None,
-        embed: Optional[discord.Embed] = None, ephemeral: Optional[bool] = None
+        embed: Optional[discord.Embed] = None, ephemeral: Optional[bool] = None,
+        state: Optional[GuildState] = None
     ):
         actual_ephemeral: bool
         if ephemeral is not None:
             actual_ephemeral = ephemeral
+        elif state is not None:
+            actual_ephemeral = state.ephemeral
         else:
             display_settings = await self.get_guild_display_settings(interaction.guild_id)
             actual_ephemeral = display_settings.get('ephemeral_responses', True)
@@ -161,48 +178,42 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
     @clock_settings_group.command(name="set-max-breaks", description="Set the maximum number of breaks allowed per shift.")
     @app_commands.describe(count="Maximum breaks (0 for unlimited).")
     async def set_max_breaks(self, interaction: discord.Interaction, count: app_commands.Range[int, 0, 20]):
-        clock_data = await self.get_clock_data(interaction.guild_id)
-        clock_data.setdefault("settings", settings.DEFAULT_CLOCK_DATA["settings"].copy())
-        clock_data["settings"]["max_breaks_per_shift"] = count
-        await self.save_clock_data(interaction.guild_id, clock_data)
-        await self.send_response(interaction, message=f"🛠️ Maximum breaks per shift updated to **{count if count > 0 else 'unlimited'}**.")
+        state = await self.get_guild_state(interaction.guild_id)
+        await clock_store.save_settings(interaction.guild_id, max_breaks_per_shift=count)
+        await self.send_response(interaction, message=f"🛠️ Maximum breaks per shift updated to **{count if count > 0 else 'unlimited'}**.", state=state)
 
     @clock_settings_group.command(name="set-max-break-duration", description="Set max allowed duration for a single break (in minutes).")
     @app_commands.describe(minutes="Max duration in minutes (0 for unlimited).")
     async def set_max_break_duration(self, interaction: discord.Interaction, minutes: app_commands.Range[int, 0, 1440]):
-        clock_data = await self.get_clock_data(interaction.guild_id)
-        clock_data.setdefault("settings", settings.DEFAULT_CLOCK_DATA["settings"].copy())
-        clock_data["settings"]["max_break_duration_minutes"] = minutes
-        await self.save_clock_data(interaction.guild_id, clock_data)
+        state = await self.get_guild_state(interaction.guild_id)
+        await clock_store.save_settings(interaction.guild_id, max_break_duration_minutes=minutes)
         duration_text = f"**{minutes} minutes**" if minutes > 0 else "**unlimited**"
-        await self.send_response(interaction, message=f"🛠️ Maximum break duration set to {duration_text}.")
+        await self.send_response(interaction, message=f"🛠️ Maximum break duration set to {duration_text}.", state=state)
 
     @clock_settings_group.command(name="add-manager-role", description="Allow a role to manage bonuses and penalties.")
     @app_commands.describe(role="The role to grant manager permissions.")
     async def add_manager_role(self, interaction: discord.Interaction, role: discord.Role):
-        # display_settings = await self.get_guild_display_settings(interaction.guild_id) # Not used for ephemeral here, admin command
-        # ephemeral = display_settings.get('ephemeral_responses', True)
-        clock_data = await self.get_clock_data(interaction.guild_id)
+        state = await self.get_guild_state(interaction.guild_id)
+        clock_data = state.clock
         clock_data.setdefault("settings", settings.DEFAULT_CLOCK_DATA["settings"].copy())
         manager_roles = clock_data["settings"].setdefault("bonus_penalty_manager_roles", [])
         if str(role.id) not in manager_roles:
             manager_roles.append(str(role.id))
-            await self.save_clock_data(interaction.guild_id, clock_data)
-            await self.send_response(interaction, message=f"🛠️ Role {role.mention} can now manage bonuses/penalties.")
+            await clock_store.save_settings(interaction.guild_id, bonus_penalty_manager_roles=manager_roles)
+            await self.send_response(interaction, message=f"🛠️ Role {role.mention} can now manage bonuses/penalties.", state=state)
         else:
             await self.send_response(interaction, message=f"⚠️ Role {role.mention} is already a manager.", ephemeral=True) # Explicit ephemeral for warning
 
     @clock_settings_group.command(name="remove-manager-role", description="Revoke manager permissions for bonuses/penalties.")
     @app_commands.describe(role="The role to remove manager permissions from.")
     async def remove_manager_role(self, interaction: discord.Interaction, role: discord.Role):
-        # display_settings = await self.get_guild_display_settings(interaction.guild_id) # Not used for ephemeral here, admin command
-        # ephemeral = display_settings.get('ephemeral_responses', True)
-        clock_data = await self.get_clock_data(interaction.guild_id)
+        state = await self.get_guild_state(interaction.guild_id)
+        clock_data = state.clock
         manager_roles = clock_data.get("settings", {}).get("bonus_penalty_manager_roles", [])
         if str(role.id) in manager_roles:
             manager_roles.remove(str(role.id))
-            await self.save_clock_data(interaction.guild_id, clock_data)
-            await self.send_response(interaction, message=f"🛠️ Role {role.mention} can no longer manage bonuses/penalties.")
+            await clock_store.save_settings(interaction.guild_id, bonus_penalty_manager_roles=manager_roles)
+            await self.send_response(interaction, message=f"🛠️ Role {role.mention} can no longer manage bonuses/penalties.", state=state)
         else:
             await self.send_response(interaction, message=f"⚠️ Role {role.mention} was not a manager.", ephemeral=True) # Explicit ephemeral for warning
             
@@ -219,7 +230,8 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
 
     @clock_settings_group.command(name="view", description="View current clock system configuration.")
     async def view_clock_settings(self, interaction: discord.Interaction):
-        clock_data = await self.get_clock_data(interaction.guild_id)
+        state = await self.get_guild_state(interaction.guild_id)
+        clock_data = state.clock
         settings_data = clock_data.get("settings", settings.DEFAULT_CLOCK_DATA["settings"].copy())
 
         max_breaks_val = settings_data.get("max_breaks_per_shift", 3)
@@ -252,14 +264,14 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
             ),
             inline=False
         )
-        await self.send_response(interaction, embed=embed)
+        await self.send_response(interaction, embed=embed, state=state)
 
     # --- Main Clocking Commands ---
     @app_commands.command(name="clock-in", description="Clock in to start your shift.")
     async def clock_in(self, interaction: discord.Interaction):
-        display_settings = await self.get_guild_display_settings(interaction.guild_id)
-        ephemeral_default = display_settings.get('ephemeral_responses', True) # For private messages
-        clock_data = await self.get_clock_data(interaction.guild_id)
+        state = await self.get_guild_state(interaction.guild_id)
+        ephemeral_default = state.ephemeral # For private messages
+        clock_data = state.clock
         user_state = await self.get_user_clock_state(clock_data, interaction.user.id)
 
         if user_state["status"] == "clocked_in":
@@ -279,7 +291,7 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
         user_state["expected_break_end_time_iso"] = None
         user_state["overstay_alert_message_id"] = None
         user_state["break_interaction_channel_id"] = None
-        await self.save_clock_data(interaction.guild_id, clock_data)
+        await clock_store.save_user_state(interaction.guild_id, interaction.user.id, user_state)
         
         # if await self.should_display_public_clock_event(interaction.guild_id): # TODO: Remove
         embed = discord.Embed(
@@ -292,9 +304,9 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
 
     @app_commands.command(name="clock-out", description="Clock out to end your shift.")
     async def clock_out(self, interaction: discord.Interaction):
-        display_settings = await self.get_guild_display_settings(interaction.guild_id)
-        ephemeral_default = display_settings.get('ephemeral_responses', True) # For private messages
-        clock_data = await self.get_clock_data(interaction.guild_id)
+        state = await self.get_guild_state(interaction.guild_id)
+        ephemeral_default = state.ephemeral # For private messages
+        clock_data = state.clock
         user_state = await self.get_user_clock_state(clock_data, interaction.user.id)
 
         if user_state["status"] == "clocked_out":
@@ -326,8 +338,8 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
         if not user_state["clock_in_time"]:
             await self.send_response(interaction, message="❌ Error: Clock-in time missing. Please contact an admin.", ephemeral=True) # Error, likely ephemeral
             logger.error(f"User {interaction.user.id} clock_out error: clock_in_time missing. State: {user_state}")
-            user_state.update(DEFAULT_USER_CLOCK_STATE.copy())
-            await self.save_clock_data(interaction.guild_id, clock_data)
+            user_state.update(copy.deepcopy(DEFAULT_USER_CLOCK_STATE))
+            await clock_store.save_user_state(interaction.guild_id, interaction.user.id, user_state)
             return
             
         clock_in_dt = datetime.fromisoformat(user_state["clock_in_time"])
@@ -376,15 +388,23 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
 
         await self.send_response(interaction, embed=embed, ephemeral=False) # Public event
 
+        await shift_log.append(interaction.guild_id, shift_log.Shift(
+            interaction.user.id,
+            int(clock_in_dt.timestamp()),
+            int(now_utc.timestamp()),
+            int(original_accumulated_break_duration),
+            int(total_break_overage)
+        ))
+
         # Now reset user state for next shift
-        user_state.update(DEFAULT_USER_CLOCK_STATE.copy())
-        await self.save_clock_data(interaction.guild_id, clock_data)
+        user_state.update(copy.deepcopy(DEFAULT_USER_CLOCK_STATE))
+        await clock_store.save_user_state(interaction.guild_id, interaction.user.id, user_state)
 
     @app_commands.command(name="break", description="Start a break (must be clocked in).")
     async def start_break(self, interaction: discord.Interaction):
-        display_settings = await self.get_guild_display_settings(interaction.guild_id)
-        ephemeral_default = display_settings.get('ephemeral_responses', True)
-        clock_data = await self.get_clock_data(interaction.guild_id)
+        state = await self.get_guild_state(interaction.guild_id)
+        ephemeral_default = state.ephemeral
+        clock_data = state.clock
         user_state = await self.get_user_clock_state(clock_data, interaction.user.id)
         guild_settings = clock_data.get("settings", {})
         max_breaks_config = guild_settings.get("max_breaks_per_shift", 3)
@@ -413,7 +433,9 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
             user_state["expected_break_end_time_iso"] = None 
         user_state["overstay_alert_message_id"] = None 
 
-        await self.save_clock_data(interaction.guild_id, clock_data)
+        await clock_store.save_user_state(interaction.guild_id, interaction.user.id, user_state)
+        if user_state["expected_break_end_time_iso"]:
+            self.break_deadlines.schedule((interaction.guild_id, interaction.user.id), (current_time_utc + timedelta(minutes=max_break_duration_minutes)).timestamp())
 
         # if await self.should_display_public_clock_event(interaction.guild_id): # TODO: Remove
         embed = discord.Embed(
@@ -426,28 +448,18 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
             # await self.send_response(interaction, message=f"⏸️ Break started at <t:{int(current_time_utc.timestamp())}:T>.", ephemeral=ephemeral_default)
 
     async def _cleanup_overstay_alert(self, guild_id: int, user_id: int, user_state: Dict[str, Any], clock_data: Dict[str, Any], save_data: bool = True):
+        self.break_deadlines.cancel((guild_id, user_id))
         updated = False
         if user_state.get("overstay_alert_message_id") and user_state.get("break_interaction_channel_id"):
             guild = self.bot.get_guild(guild_id)
             if guild:
-                # Ensure channel is fetchable and of correct type
-                channel_id = user_state["break_interaction_channel_id"]
-                try:
-                    channel = await guild.fetch_channel(channel_id) # fetch_channel can get any type
-                    if not isinstance(channel, discord.TextChannel): # Explicitly check for TextChannel
-                         logger.warning(f"Break interaction channel {channel_id} for user {user_id} is not a TextChannel. Type: {type(channel)}")
-                         channel = None # Invalidate channel if not TextChannel
-                except (discord.NotFound, discord.Forbidden): # Channel not found or no permissions
-                    logger.warning(f"Could not fetch break interaction channel {channel_id} for user {user_id} during overstay cleanup.")
-                    channel = None # Invalidate channel
-                
-                if channel and isinstance(channel, discord.TextChannel):
+                channel = await self.alerts.get_text_channel(guild, user_state["break_interaction_channel_id"])
+                if channel:
                     try:
-                        msg_to_delete = await channel.fetch_message(user_state["overstay_alert_message_id"])
-                        await msg_to_delete.delete()
-                        logger.info(f"Deleted overstay alert message {user_state['overstay_alert_message_id']} for user {user_id}")
-                    except discord.NotFound:
-                        logger.info(f"Overstay alert message {user_state['overstay_alert_message_id']} for user {user_id} not found during cleanup.")
+                        if await self.alerts.delete(channel, user_state["overstay_alert_message_id"]):
+                            logger.info(f"Deleted overstay alert message {user_state['overstay_alert_message_id']} for user {user_id}")
+                        else:
+                            logger.info(f"Overstay alert message {user_state['overstay_alert_message_id']} for user {user_id} not found during cleanup.")
                     except discord.Forbidden:
                         logger.warning(f"Bot lacks permissions to delete overstay alert message {user_state['overstay_alert_message_id']} in channel {channel.id} for user {user_id}.")
                     except Exception as e:
@@ -462,15 +474,15 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
         # Not clearing it here allows alerts to be re-sent to the same channel if the user goes on break again quickly.
             
         if updated and save_data:
-            await self.save_clock_data(guild_id, clock_data)
+            await clock_store.save_user_state(guild_id, user_id, user_state)
         return updated
 
 
     @app_commands.command(name="back", description="Return from your break.")
     async def end_break(self, interaction: discord.Interaction):
-        display_settings = await self.get_guild_display_settings(interaction.guild_id)
-        ephemeral_default = display_settings.get('ephemeral_responses', True)
-        clock_data = await self.get_clock_data(interaction.guild_id)
+        state = await self.get_guild_state(interaction.guild_id)
+        ephemeral_default = state.ephemeral
+        clock_data = state.clock
         user_state = await self.get_user_clock_state(clock_data, interaction.user.id)
         settings_data = clock_data.get("settings", {})
         max_break_duration_minutes = settings_data.get("max_break_duration_minutes", 0)
@@ -482,7 +494,7 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
             await self.send_response(interaction, message="❌ Error: Break start time missing. Please contact an admin.", ephemeral=True) # Error, likely ephemeral
             logger.error(f"User {interaction.user.id} end_break error: break_start_time missing. State: {user_state}")
             user_state["status"] = "clocked_in" 
-            await self.save_clock_data(interaction.guild_id, clock_data)
+            await clock_store.save_user_state(interaction.guild_id, interaction.user.id, user_state)
             return
 
         now_utc = datetime.now(timezone.utc)
@@ -523,7 +535,7 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
         else:
             breaks_display += " (Unlimited)"
 
-        await self.save_clock_data(interaction.guild_id, clock_data)
+        await clock_store.save_user_state(interaction.guild_id, interaction.user.id, user_state)
         
         # if await self.should_display_public_clock_event(interaction.guild_id): # TODO: Remove
         embed = discord.Embed(
@@ -558,25 +570,23 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
 
     async def _add_bonus_penalty(self, interaction: discord.Interaction, user: discord.User, amount: float, item_type: str, reason: Optional[str] = None):
         # Admin commands usually are not ephemeral by default, but this one's response is an embed that might be better public
-        # display_settings = await self.get_guild_display_settings(interaction.guild_id)
-        # ephemeral = display_settings.get('ephemeral_responses', True)
-        if not await self.has_bonus_penalty_permission(interaction):
+        state = await self.get_guild_state(interaction.guild_id)
+        if not await self.has_bonus_penalty_permission(interaction, state):
             await self.send_response(interaction, message="❌ You do not have permission to manage bonuses/penalties.", ephemeral=True) # Permission error, ephemeral
             return
         if amount <= 0:
             await self.send_response(interaction, message=f"❌ Amount must be positive.", ephemeral=True) # Input error, ephemeral
             return
 
-        clock_data = await self.get_clock_data(interaction.guild_id)
-        user_bp_list = clock_data["bonuses_penalties"].setdefault(str(user.id), [])
+        ledger = bonus_ledger.from_clock_data(state.clock, user.id)
         item_id = str(uuid.uuid4())
         new_item = {
             "id": item_id, "type": item_type, "amount": round(amount, 2),
             "reason": reason, "timestamp": datetime.now(timezone.utc).isoformat(),
             "giver_id": str(interaction.user.id)
         }
-        user_bp_list.append(new_item)
-        await self.save_clock_data(interaction.guild_id, clock_data)
+        ledger.add(new_item)
+        await bonus_ledger.save(interaction.guild_id, user.id, ledger)
         
         action_verb = "Added" if item_type == "bonus" else "Applied"
         embed_color = discord.Color.green() if item_type == "bonus" else discord.Color.red()
@@ -594,38 +604,40 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
         embed.add_field(name="Amount", value=f"${amount:.2f}", inline=False)
         embed.add_field(name="Reason", value=reason_display, inline=False)
         embed.set_footer(text=f"By: {interaction.user.display_name}")
-        await self.send_response(interaction, embed=embed)
+        await self.send_response(interaction, embed=embed, state=state)
         return
 
     async def _remove_bonus_penalty(self, interaction: discord.Interaction, user: discord.User, item_id_prefix: str, item_type: str):
-        # display_settings = await self.get_guild_display_settings(interaction.guild_id)
-        # ephemeral = display_settings.get('ephemeral_responses', True)
-        if not await self.has_bonus_penalty_permission(interaction):
+        state = await self.get_guild_state(interaction.guild_id)
+        if not await self.has_bonus_penalty_permission(interaction, state):
             await self.send_response(interaction, message="❌ You do not have permission to manage bonuses/penalties.", ephemeral=True) # Permission error, ephemeral
             return
 
-        clock_data = await self.get_clock_data(interaction.guild_id)
-        user_bp_list = clock_data["bonuses_penalties"].get(str(user.id), [])
-        item_to_remove = next((item for item in user_bp_list if item["id"].startswith(item_id_prefix) and item["type"] == item_type), None)
-        
+        ledger = bonus_ledger.from_clock_data(state.clock, user.id)
+        matches = ledger.find(item_id_prefix, item_type)
+        if len(matches) > 1:
+            await self.send_response(interaction, message=f"❌ {len(matches)} {item_type} items for {user.mention} have an ID starting with `{item_id_prefix}`. Please use a longer ID.", ephemeral=True) # Error, ephemeral
+            return
+        item_to_remove = matches[0] if matches else None
+
         if item_to_remove:
-            user_bp_list.remove(item_to_remove)
-            await self.save_clock_data(interaction.guild_id, clock_data)
+            ledger.remove(item_to_remove["id"])
+            await bonus_ledger.save(interaction.guild_id, user.id, ledger)
             embed = discord.Embed(
                 title=f"{item_type.capitalize()} Removed",
                 description=f"Removed **${item_to_remove['amount']:.2f}** {item_type} (ID: `{item_to_remove['id'][:8]}`) from {user.mention}.",
                 color=discord.Color.dark_grey(), timestamp=datetime.now(timezone.utc)
             )
             embed.set_footer(text=f"By: {interaction.user.display_name}")
-            await self.send_response(interaction, embed=embed) # Uses guild default ephemeral
+            await self.send_response(interaction, embed=embed, state=state) # Uses guild default ephemeral
         else:
             await self.send_response(interaction, message=f"❌ No {item_type} found for {user.mention} with ID starting with `{item_id_prefix}`.", ephemeral=True) # Error, ephemeral
 
     async def _list_bonus_penalty(self, interaction: discord.Interaction, target_user: Optional[discord.User], item_type: str):
         # If no user is provided, show a summary for all users with at least one bonus/penalty
-        clock_data = await self.get_clock_data(interaction.guild_id)
-        display_settings = await self.get_guild_display_settings(interaction.guild_id) # For ephemeral setting
-        ephemeral = display_settings.get('ephemeral_responses', True)
+        state = await self.get_guild_state(interaction.guild_id)
+        clock_data = state.clock
+        ephemeral = state.ephemeral
 
         if target_user is None:
             # Build a detailed list for all users with at least one bonus/penalty
@@ -773,128 +785,118 @@ class ClockInTrackerSlash(commands.Cog, name="clock_in_tracker"):
     async def list_penalties(self, interaction: discord.Interaction, user: Optional[discord.User] = None):
         await self._list_bonus_penalty(interaction, user, "penalty")
 
-    # --- Background Task for Break Overstays ---
-    @tasks.loop(seconds=15.0)
-    async def check_break_overstays(self):
-        if not self.bot.is_ready():
+    # --- Break Overstay Alerts ---
+    async def run_break_alerts(self):
+        """Rebuild break deadlines from storage once, then deliver alerts as they come due"""
+        await self.bot.wait_until_ready()
+        for guild in self.bot.guilds:
+            try:
+                clock_data = await self.get_clock_data(guild.id)
+                for user_id_str, user_state in clock_data.get("users", {}).items():
+                    if user_state.get("status") == "on_break" and user_state.get("expected_break_end_time_iso"):
+                        expected_end_dt = datetime.fromisoformat(user_state["expected_break_end_time_iso"])
+                        self.break_deadlines.schedule((guild.id, int(user_id_str)), expected_end_dt.timestamp())
+            except Exception as e:
+                logger.error(f"Error loading break deadlines for guild {guild.id}: {e}", exc_info=True)
+        logger.info(f"Break overstay scheduler is now running with {len(self.break_deadlines)} pending breaks.")
+        await self.break_deadlines.run(self.handle_break_deadline)
+
+    async def handle_break_deadline(self, key: Tuple[int, int]):
+        """Send or refresh the overstay alert for one user, then schedule the next refresh"""
+        guild_id, user_id = key
+        guild = self.bot.get_guild(guild_id)
+        if not guild:
+            return
+
+        clock_data = await self.get_clock_data(guild_id)
+        max_break_min_config = clock_data.get("settings", {}).get("max_break_duration_minutes", 0)
+        user_state = clock_data.get("users", {}).get(str(user_id))
+        if max_break_min_config <= 0 or not user_state:
+            return
+        if not (user_state.get("status") == "on_break" and
+                user_state.get("break_start_time") and
+                user_state.get("expected_break_end_time_iso") and
+                user_state.get("break_interaction_channel_id")):
             return
 
         now_utc = datetime.now(timezone.utc)
+        expected_end_dt = datetime.fromisoformat(user_state["expected_break_end_time_iso"])
+        if now_utc < expected_end_dt:
+            # Break was restarted with a later deadline
+            self.break_deadlines.schedule(key, expected_end_dt.timestamp())
+            return
 
-        for guild in self.bot.guilds:
+        # Keep the alert's "Exceeded By" current until the user is back
+        self.break_deadlines.schedule(key, now_utc.timestamp() + settings.BREAK_ALERT_REFRESH_SECONDS)
+
+        member = guild.get_member(user_id) 
+        user_obj = None
+        if member:
+            user_obj = member
+        else:
             try:
-                clock_data = await self.get_clock_data(guild.id)
-                guild_settings = clock_data.get("settings", {})
-                max_break_min_config = guild_settings.get("max_break_duration_minutes", 0)
+                user_obj = await self.bot.fetch_user(user_id)
+            except discord.NotFound:
+                logger.warning(f"Could not find user {user_id} for overstay alert in guild {guild.id}.")
+                return # Skip if user cannot be found for mention
+        
+        alert_channel = await self.alerts.get_text_channel(guild, user_state["break_interaction_channel_id"])
+        if not alert_channel:
+            return # Already logged; retried at the next refresh
 
-                if max_break_min_config <= 0: 
-                    continue
+        overstay_duration = now_utc - expected_end_dt
+        formatted_overstay = format_timedelta(overstay_duration, show_seconds=True)
+        
+        embed_title = "⚠️ Break Limit Exceeded Alert"
+        embed_desc = (
+            f"{user_obj.mention} you have exceeded your allowed break time of "
+            f"**{max_break_min_config} minutes**."
+        )
+        embed_color = discord.Color.orange()
 
-                users_data = clock_data.get("users", {})
-                guild_data_modified = False
+        alert_embed = discord.Embed(
+            title=embed_title,
+            description=embed_desc,
+            color=embed_color,
+            timestamp=now_utc
+        )
+        alert_embed.add_field(name="", value=f"Exceeded By **{formatted_overstay}**", inline=False)
+        alert_embed.set_footer(text=f"User: {user_obj.display_name} ({user_obj.name})")
 
-                for user_id_str, user_state in users_data.items():
-                    user_id = int(user_id_str)
-                    if user_state.get("status") == "on_break" and \
-                       user_state.get("break_start_time") and \
-                       user_state.get("expected_break_end_time_iso") and \
-                       user_state.get("break_interaction_channel_id"):
-                        
-                        expected_end_dt = datetime.fromisoformat(user_state["expected_break_end_time_iso"])
-                        
-                        if now_utc > expected_end_dt:
-                            member = guild.get_member(user_id) 
-                            user_obj = None
-                            if member:
-                                user_obj = member
-                            else:
-                                try:
-                                    user_obj = await self.bot.fetch_user(user_id)
-                                except discord.NotFound:
-                                    logger.warning(f"Could not find user {user_id} for overstay alert in guild {guild.id}.")
-                                    continue # Skip if user cannot be found for mention
-                            
-                            alert_channel_id = user_state["break_interaction_channel_id"]
-                            alert_channel = None
-                            try:
-                                # Fetch channel to ensure it's up-to-date and exists
-                                fetched_ch = await guild.fetch_channel(alert_channel_id)
-                                if isinstance(fetched_ch, discord.TextChannel):
-                                    alert_channel = fetched_ch
-                                else:
-                                    logger.warning(f"Break overstay alert channel {alert_channel_id} is not a TextChannel for user {user_id} in guild {guild.id}. Type: {type(fetched_ch)}")
-                            except (discord.NotFound, discord.Forbidden):
-                                logger.warning(f"Break overstay alert channel {alert_channel_id} not found or no permission for user {user_id} in guild {guild.id}.")
-                                # Potentially clear user_state["break_interaction_channel_id"] here if it's persistently bad?
-                                # For now, just skip sending the alert for this cycle.
-                                continue
-
-                            if not alert_channel:
-                                continue # Already logged
-
-                            overstay_duration = now_utc - expected_end_dt
-                            formatted_overstay = format_timedelta(overstay_duration, show_seconds=True)
-                            
-                            embed_title = "⚠️ Break Limit Exceeded Alert"
-                            embed_desc = (
-                                f"{user_obj.mention} you have exceeded your allowed break time of "
-                                f"**{max_break_min_config} minutes**."
-                            )
-                            embed_color = discord.Color.orange()
-
-                            alert_embed = discord.Embed(
-                                title=embed_title,
-                                description=embed_desc,
-                                color=embed_color,
-                                timestamp=now_utc
-                            )
-                            alert_embed.add_field(name="", value=f"Exceeded By **{formatted_overstay}**", inline=False)
-                            alert_embed.set_footer(text=f"User: {user_obj.display_name} ({user_obj.name})")
-
-                            try:
-                                if user_state.get("overstay_alert_message_id"):
-                                    # Try to fetch and edit the existing alert message
-                                    msg = await alert_channel.fetch_message(user_state["overstay_alert_message_id"])
-                                    await msg.edit(embed=alert_embed)  # Removed redundant mention
-                                else:
-                                    # Send a new alert message and store its ID
-                                    msg = await alert_channel.send(embed=alert_embed)  # Removed redundant mention
-                                    user_state["overstay_alert_message_id"] = msg.id
-                                    guild_data_modified = True
-
-                            except discord.NotFound:
-                                # The old message was deleted or not found; send a new alert
-                                logger.info(
-                                    f"Overstay alert message {user_state.get('overstay_alert_message_id')} for user {user_id} not found. Sending a new one."
-                                )
-                                msg = await alert_channel.send(embed=alert_embed)  # Removed redundant mention
-                                user_state["overstay_alert_message_id"] = msg.id
-                                guild_data_modified = True
-
-                            except discord.Forbidden:
-                                # Bot lacks permission to send or edit messages in the channel
-                                logger.warning(
-                                    f"Bot lacks permission to send/edit overstay alert in channel {alert_channel.id} for user {user_id}."
-                                )
-
-                            except Exception as e:
-                                # Catch-all for unexpected errors
-                                logger.error(
-                                    f"Error handling overstay alert for user {user_id} in guild {guild.id}: {e}",
-                                    exc_info=True
-                                )
-
-                
-                if guild_data_modified:
-                    await self.save_clock_data(guild.id, clock_data)
+        new_message_id = None
+        try:
+            # Edits the stored alert by ID, or sends a new one if there is none or it was deleted
+            message_id = await self.alerts.edit_or_send(alert_channel, user_state.get("overstay_alert_message_id"), embed=alert_embed)
+            if message_id != user_state.get("overstay_alert_message_id"):
+                new_message_id = message_id
+
+        except discord.Forbidden:
+            # Bot lacks permission to send or edit messages in the channel
+            logger.warning(
+                f"Bot lacks permission to send/edit overstay alert in channel {alert_channel.id} for user {user_id}."
+            )
 
-            except Exception as e:
-                logger.error(f"Error in check_break_overstays task for guild {guild.id}: {e}", exc_info=True)
+        except Exception as e:
+            # Catch-all for unexpected errors
+            logger.error(
+                f"Error handling overstay alert for user {user_id} in guild {guild.id}: {e}",
+                exc_info=True
+            )
 
-    @check_break_overstays.before_loop
-    async def before_check_break_overstays(self):
-        await self.bot.wait_until_ready()
-        logger.info("Break overstay checker task is now ready and running.")
+        if new_message_id is not None:
+            # /back or /clock-out may have run while the alert was being sent: only keep
+            # the alert if the user is still on the same break
+            current_state = (await self.get_clock_data(guild_id)).get("users", {}).get(str(user_id)) or {}
+            if (current_state.get("status") == "on_break" and
+                    current_state.get("break_start_time") == user_state.get("break_start_time")):
+                # Only the alert ID is written, leaving the rest of the user's state as is
+                await clock_store.set_paths(guild.id, {("users", str(user_id), "overstay_alert_message_id"): new_message_id})
+            else:
+                try:
+                    await self.alerts.delete(alert_channel, new_message_id)
+                except discord.Forbidden:
+                    logger.warning(f"Bot lacks permissions to delete stale overstay alert {new_message_id} in channel {alert_channel.id} for user {user_id}.")
+        logger.debug(f"Alert delivery counters: {self.alerts.snapshot()}")
 
 
 async def setup(bot):
@@ -145,7 +145,11 @@ class HelpSlashCommands(commands.Cog):
 
             # Report Commands
             report_commands = "\n".join([
-                "`/view-earnings` - View your earnings"
+                "`/view-earnings` - View your earnings",
+                "`/summary` - Interactive earnings summary with period, role, shift and user drill-downs",
+                "`/leaderboard` - Rank users by gross, cut, hours, sales or revenue per hour",
+                "`/model-report` - Revenue attributed to each model, or to one model's chatters",
+                "`/shift-history` - Clocked shifts and hours worked per user over a time window"
             ])
             embed.add_field(name="Report Commands", value=report_commands, inline=False)
 
@@ -6,7 +6,7 @@ from config import settings
 from typing import Optional
 from datetime import datetime
 from discord.ext import commands
-from utils import file_handlers, validators, calculations
+from utils import file_handlers, validators, calculations, summaries
 
 logger = logging.getLogger("xof_calculator.reports")
 
@@ -48,44 +48,30 @@ class ReportCommands(commands.Cog):
             await ctx.send(f"❌ Invalid to_date format. Please use {settings.DATE_FORMAT}.")
             return
         
-        # Load earnings data
-        earnings_data = await file_handlers.load_json(settings.get_guild_earnings_path(ctx.guild.id), {})
-        
-        # Collect all entries for the period
-        all_entries = []
-        for sender, entries in earnings_data.items():
-            for entry in entries:
-                if entry.get("period", "").lower() == period.lower():
-                    # Add sender to entry
-                    entry_with_sender = entry.copy()
-                    entry_with_sender["sender"] = sender
-                    all_entries.append(entry_with_sender)
-        
-        if not all_entries:
-            logger.info(f"No earnings found for period '{period}' in guild {guild_id}")
-            await ctx.send(f"No earnings recorded for {period}.")
-            return
-        
         # Filter by date range if provided
+        from_date_obj = to_date_obj = None
         if from_date and to_date:
             from_date_obj = datetime.strptime(from_date, settings.DATE_FORMAT)
             to_date_obj = datetime.strptime(to_date, settings.DATE_FORMAT)
-            
-            all_entries = [
-                entry for entry in all_entries
-                if from_date_obj <= datetime.strptime(entry.get("date", "01/01/1970"), settings.DATE_FORMAT) <= to_date_obj
-            ]
         
-        if not all_entries:
-            logger.info(f"No earnings found for period '{period}' in date range {from_date} - {to_date}")
-            await ctx.send(f"No earnings recorded for {period} in the specified date range.")
+        # Aggregate server-side when MongoDB is configured, locally otherwise
+        summary = await summaries.summarize(ctx.guild.id, period=period, from_date=from_date_obj, to_date=to_date_obj)
+        totals = summary["totals"]
+        
+        if not totals["count"]:
+            if from_date_obj:
+                logger.info(f"No earnings found for period '{period}' in date range {from_date} - {to_date}")
+                await ctx.send(f"No earnings recorded for {period} in the specified date range.")
+            else:
+                logger.info(f"No earnings found for period '{period}' in guild {guild_id}")
+                await ctx.send(f"No earnings recorded for {period}.")
             return
         
         # Prepare summary data
-        total_gross = sum(entry.get("gross_revenue", 0) for entry in all_entries)
-        total_paid = sum(entry.get("total_cut", 0) for entry in all_entries)
-        user_count = len(set(entry.get("sender") for entry in all_entries))
-        entry_count = len(all_entries)
+        total_gross = totals["gross"]
+        total_paid = totals["cut"]
+        user_count = totals["users"]
+        entry_count = totals["count"]
         
         # Log summary results
         logger.info(f"Summary report for period '{period}': {entry_count} entries, {user_count} users, ${total_gross} gross, ${total_paid} total cut")
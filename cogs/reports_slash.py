@@ -0,0 +1,490 @@
+import discord
+import logging
+
+from discord import ui, app_commands
+from discord.ext import commands
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from config import settings
+from utils import file_handlers, leaderboard, model_index, shift_log, summaries
+from utils.members import MemberDirectory
+
+logger = logging.getLogger("xof_calculator.reports_slash")
+
+# Select options per dimension; Discord allows 25, one is "All"
+MAX_SELECT_VALUES = 24
+# Breakdown lines shown in the summary embed
+MAX_BREAKDOWN_LINES = 20
+# Autocomplete suggestions Discord accepts
+MAX_AUTOCOMPLETE_CHOICES = 25
+
+DIMENSION_LABELS = {
+    "period": "Period",
+    "role": "Role",
+    "shift": "Shift",
+    "user": "User",
+    "bucket": "Date",
+}
+
+class SummaryCubeView(ui.View):
+    """
+    Drill-down view over a precomputed summary cube.
+
+    Filter and breakdown selects only re-slice the cube held by the view;
+    the earnings ledger is never read again.
+    """
+    FILTER_DIMENSIONS = ("period", "role", "shift", "user")
+
+    def __init__(self, author_id, cube, members, title, bucket=None):
+        super().__init__(timeout=settings.PAGINATOR_TTL)
+        self.author_id = author_id
+        self.cube = cube
+        self.members = members
+        self.title = title
+        self.bucket = bucket
+        self.filters = {}
+        self.group_by = "bucket" if bucket else "user"
+        self.message = None
+
+        # Candidate values per dimension, highest gross first
+        self.values = {}
+        for dimension in self.FILTER_DIMENSIONS:
+            groups = summaries.rollup_cube(cube, group_by=dimension)["groups"]
+            self.values[dimension] = sorted(groups, key=lambda value: groups[value]["gross"], reverse=True)[:MAX_SELECT_VALUES]
+
+        for dimension in self.FILTER_DIMENSIONS:
+            self.add_item(self._filter_select(dimension))
+        self.add_item(self._group_select())
+
+    def label_for(self, dimension, value) -> str:
+        """Human readable label for a cube value"""
+        if value is None:
+            return "None"
+        if dimension == "user":
+            member = self.members.get(value)
+            return member.label if member else str(value)
+        return str(value)
+
+    def _filter_select(self, dimension) -> ui.Select:
+        options = [discord.SelectOption(label=f"All {DIMENSION_LABELS[dimension].lower()}s", value="*", default=True)]
+        options.extend(
+            discord.SelectOption(label=self.label_for(dimension, value)[:100], value=str(index))
+            for index, value in enumerate(self.values[dimension])
+        )
+        select = ui.Select(placeholder=f"Filter by {DIMENSION_LABELS[dimension].lower()}", options=options)
+
+        async def callback(interaction: discord.Interaction):
+            choice = select.values[0]
+            if choice == "*":
+                self.filters.pop(dimension, None)
+            else:
+                self.filters[dimension] = self.values[dimension][int(choice)]
+            for option in select.options:
+                option.default = option.value == choice
+            await interaction.response.edit_message(embed=self.render(), view=self)
+
+        select.callback = callback
+        return select
+
+    def _group_select(self) -> ui.Select:
+        dimensions = [dimension for dimension in ("period", "role", "shift", "user", "bucket") if dimension != "bucket" or self.bucket]
+        options = [
+            discord.SelectOption(
+                label=f"Break down by {(self.bucket if dimension == 'bucket' else DIMENSION_LABELS[dimension]).lower()}",
+                value=dimension,
+                default=dimension == self.group_by
+            )
+            for dimension in dimensions
+        ]
+        select = ui.Select(placeholder="Break down by...", options=options)
+
+        async def callback(interaction: discord.Interaction):
+            self.group_by = select.values[0]
+            for option in select.options:
+                option.default = option.value == self.group_by
+            await interaction.response.edit_message(embed=self.render(), view=self)
+
+        select.callback = callback
+        return select
+
+    def render(self) -> discord.Embed:
+        """Render the current slice of the cube"""
+        rollup = summaries.rollup_cube(self.cube, self.filters, self.group_by)
+        totals = rollup["totals"]
+
+        scope = ", ".join(f"{DIMENSION_LABELS[d]}: {self.label_for(d, v)}" for d, v in self.filters.items()) or "All earnings"
+        embed = discord.Embed(title=self.title, description=scope, color=discord.Color.blue())
+        embed.add_field(name="Total Entries", value=str(totals["count"]), inline=True)
+        embed.add_field(name="Total Users", value=str(totals["users"]), inline=True)
+        embed.add_field(name="Hours", value=f"{totals['hours']:,.1f}", inline=True)
+        embed.add_field(name="Gross Revenue", value=f"${totals['gross']:,.2f}", inline=True)
+        embed.add_field(name="Total Chatter Cut", value=f"${totals['cut']:,.2f}", inline=True)
+        embed.add_field(name="Platform Fee", value=f"${(totals['gross'] * 0.2):,.2f}", inline=True)
+
+        groups = rollup["groups"]
+        if self.group_by == "bucket":
+            ordered = sorted(groups, key=lambda value: (value is None, value or ""))
+        else:
+            ordered = sorted(groups, key=lambda value: groups[value]["gross"], reverse=True)
+
+        lines = []
+        for value in ordered[:MAX_BREAKDOWN_LINES]:
+            bucket = groups[value]
+            lines.append(
+                f"**{self.label_for(self.group_by, value)}** — {bucket['count']} entries, "
+                f"${bucket['gross']:,.2f} gross, ${bucket['cut']:,.2f} cut"
+            )
+        if len(ordered) > MAX_BREAKDOWN_LINES:
+            lines.append(f"... and {len(ordered) - MAX_BREAKDOWN_LINES} more")
+
+        value = "\n".join(lines) or "No entries"
+        breakdown_name = self.bucket.capitalize() if self.group_by == "bucket" else DIMENSION_LABELS[self.group_by]
+        embed.add_field(name=f"By {breakdown_name}", value=value[:1024], inline=False)
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("❌ Only the person who ran this command can change the view.", ephemeral=True)
+            return False
+        return True
+
+    async def on_timeout(self):
+        # Release the cube and disable the controls once the view expires
+        self.cube = {}
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException as e:
+                logger.debug(f"Could not disable expired summary view: {e}")
+
+class ReportSlashCommands(commands.Cog, name="reports"):
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def get_ephemeral_setting(self, guild_id):
+        file_path = settings.get_guild_display_path(guild_id)
+        display_settings = await file_handlers.load_json(file_path, {
+                "ephemeral_responses": True,
+                "show_average": True,
+                "agency_name": "Agency",
+                "show_ids": True,
+                "bot_name": "Shift Calculator"
+        })
+        guild_settings = display_settings
+        return guild_settings.get('ephemeral_responses',
+            settings.DEFAULT_DISPLAY_SETTINGS['ephemeral_responses'])
+
+    @app_commands.command(name="summary", description="Interactive earnings summary by period, role, shift and user")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.describe(
+        from_date="Start date (dd/mm/yyyy)",
+        to_date="End date (dd/mm/yyyy)",
+        bucket="Also break earnings down by week or month"
+    )
+    @app_commands.choices(
+        bucket=[
+            app_commands.Choice(name="Week", value="week"),
+            app_commands.Choice(name="Month", value="month")
+        ]
+    )
+    async def summary(
+        self,
+        interaction: discord.Interaction,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        bucket: Optional[app_commands.Choice[str]] = None
+    ):
+        """Build the earnings cube once and explore it with drill-down selects"""
+        ephemeral = await self.get_ephemeral_setting(interaction.guild.id)
+        logger.info(f"User {interaction.user.name} ({interaction.user.id}) used /summary with from_date={from_date}, to_date={to_date}, bucket={bucket.value if bucket else None}")
+
+        try:
+            from_date_obj = datetime.strptime(from_date, settings.DATE_FORMAT) if from_date else None
+            to_date_obj = datetime.strptime(to_date, settings.DATE_FORMAT) if to_date else None
+        except ValueError:
+            await interaction.response.send_message(f"❌ Invalid date format. Please use {settings.DATE_FORMAT}.", ephemeral=ephemeral)
+            return
+
+        await interaction.response.defer(ephemeral=ephemeral)
+
+        try:
+            bucket_value = bucket.value if bucket else None
+            cube = await summaries.build_cube(interaction.guild.id, bucket_value, from_date_obj, to_date_obj)
+            if not cube:
+                await interaction.followup.send("No earnings recorded for the selected range.", ephemeral=ephemeral)
+                return
+
+            members = await MemberDirectory.build(interaction.guild, {key[3] for key in cube})
+            date_range = f"{from_date or '...'} to {to_date or '...'}" if from_date or to_date else "All Time"
+            view = SummaryCubeView(interaction.user.id, cube, members, f"📊 Earnings Summary — {date_range}", bucket_value)
+            view.message = await interaction.followup.send(embed=view.render(), view=view, ephemeral=ephemeral, wait=True)
+        except Exception as e:
+            logger.error(f"Summary command error: {e}", exc_info=True)
+            await interaction.followup.send(f"❌ Command failed: {str(e)}", ephemeral=ephemeral)
+
+    @app_commands.command(name="leaderboard", description="Rank users by gross, cut, hours, sales or revenue per hour")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.describe(
+        metric="What to rank by",
+        window="Time window to rank over",
+        from_date="Start date for a custom window (dd/mm/yyyy)",
+        to_date="End date for a custom window (dd/mm/yyyy)",
+        size="Number of users to show"
+    )
+    @app_commands.choices(
+        metric=[app_commands.Choice(name=name, value=value) for value, name in leaderboard.METRICS.items()],
+        window=[
+            app_commands.Choice(name="This week", value="week"),
+            app_commands.Choice(name="Last 30 days", value="30d"),
+            app_commands.Choice(name="All time", value="all"),
+            app_commands.Choice(name="Custom range", value="custom")
+        ]
+    )
+    async def show_leaderboard(
+        self,
+        interaction: discord.Interaction,
+        metric: app_commands.Choice[str],
+        window: Optional[app_commands.Choice[str]] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        size: Optional[app_commands.Range[int, 1, settings.LEADERBOARD_MAX_SIZE]] = 10
+    ):
+        """Show the top users for a metric over a time window"""
+        ephemeral = await self.get_ephemeral_setting(interaction.guild.id)
+        window_value = window.value if window else ("custom" if from_date or to_date else "all")
+        logger.info(f"User {interaction.user.name} ({interaction.user.id}) used /leaderboard with metric={metric.value}, window={window_value}, from_date={from_date}, to_date={to_date}, size={size}")
+
+        try:
+            from_date_obj = datetime.strptime(from_date, settings.DATE_FORMAT) if from_date else None
+            to_date_obj = datetime.strptime(to_date, settings.DATE_FORMAT) if to_date else None
+        except ValueError:
+            await interaction.response.send_message(f"❌ Invalid date format. Please use {settings.DATE_FORMAT}.", ephemeral=ephemeral)
+            return
+
+        if window_value == "custom" and not (from_date_obj or to_date_obj):
+            await interaction.response.send_message("❌ A custom window needs a from_date, a to_date or both.", ephemeral=ephemeral)
+            return
+
+        await interaction.response.defer(ephemeral=ephemeral)
+
+        try:
+            start, end = leaderboard.resolve_window(window_value, from_date_obj, to_date_obj)
+            result = await leaderboard.leaderboard(interaction.guild.id, metric.value, size or 10, start, end)
+
+            if start or end:
+                date_range = f"{start.strftime(settings.DATE_FORMAT) if start else '...'} to {end.strftime(settings.DATE_FORMAT) if end else '...'}"
+            else:
+                date_range = "All Time"
+            embed = discord.Embed(
+                title=f"🏆 {metric.name} Leaderboard",
+                description=date_range,
+                color=discord.Color.gold()
+            )
+
+            rows = result["rows"]
+            if not rows:
+                embed.add_field(name="No entries", value="No earnings recorded for this window.", inline=False)
+            else:
+                members = await MemberDirectory.build(interaction.guild, [row["user"] for row in rows])
+                lines = []
+                for rank, row in enumerate(rows, start=1):
+                    member = members.get(row["user"])
+                    name = member.label if member else row["user"]
+                    if metric.value == "count":
+                        value = f"{row['count']} sales"
+                    elif metric.value == "hours":
+                        value = f"{row['hours']:,.1f} h"
+                    else:
+                        value = f"${row[metric.value]:,.2f}" + ("/h" if metric.value == "rph" else "")
+                    lines.append(f"**{rank}.** {name} — {value}")
+                embed.add_field(name="Ranking", value="\n".join(lines)[:1024], inline=False)
+
+            embed.set_footer(text=f"Top {len(rows)} of {result['users']} users")
+            await interaction.followup.send(embed=embed, ephemeral=ephemeral)
+        except Exception as e:
+            logger.error(f"Leaderboard command error: {e}", exc_info=True)
+            await interaction.followup.send(f"❌ Command failed: {str(e)}", ephemeral=ephemeral)
+
+    async def model_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        index = await model_index.get_index(interaction.guild.id)
+        current = current.lower()
+        return [
+            app_commands.Choice(name=model[:100], value=model[:100])
+            for model in index.models()
+            if current in model.lower()
+        ][:MAX_AUTOCOMPLETE_CHOICES]
+
+    @app_commands.command(name="model-report", description="Revenue attributed to each model, or to one model's chatters")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.describe(
+        model="Show one model's totals and top chatters",
+        from_date="Start date (dd/mm/yyyy)",
+        to_date="End date (dd/mm/yyyy)"
+    )
+    @app_commands.autocomplete(model=model_autocomplete)
+    async def model_report(
+        self,
+        interaction: discord.Interaction,
+        model: Optional[str] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None
+    ):
+        """Report per-model revenue from the model index; multi-model sales are split evenly"""
+        ephemeral = await self.get_ephemeral_setting(interaction.guild.id)
+        logger.info(f"User {interaction.user.name} ({interaction.user.id}) used /model-report with model={model}, from_date={from_date}, to_date={to_date}")
+
+        try:
+            from_date_obj = datetime.strptime(from_date, settings.DATE_FORMAT) if from_date else None
+            to_date_obj = datetime.strptime(to_date, settings.DATE_FORMAT) if to_date else None
+        except ValueError:
+            await interaction.response.send_message(f"❌ Invalid date format. Please use {settings.DATE_FORMAT}.", ephemeral=ephemeral)
+            return
+
+        await interaction.response.defer(ephemeral=ephemeral)
+
+        try:
+            index = await model_index.get_index(interaction.guild.id)
+            date_range = f"{from_date or '...'} to {to_date or '...'}" if from_date or to_date else "All Time"
+
+            def describe(rollup):
+                return (
+                    f"{rollup['sales']} sales ({rollup['share']:,.1f} attributed), "
+                    f"${rollup['gross']:,.2f} gross, ${rollup['cut']:,.2f} cut, {rollup['hours']:,.1f}h"
+                )
+
+            if model:
+                contributors = index.contributors(model, from_date_obj, to_date_obj)
+                if not contributors:
+                    await interaction.followup.send(f"No sales recorded for model `{model}` in this range.", ephemeral=ephemeral)
+                    return
+
+                totals = {key: sum(row[key] for row in contributors.values()) for key in ("sales", "share", "gross", "cut", "hours")}
+                ranked = sorted(contributors.items(), key=lambda item: item[1]["gross"], reverse=True)[:MAX_BREAKDOWN_LINES]
+                members = await MemberDirectory.build(interaction.guild, [user for user, _ in ranked])
+
+                embed = discord.Embed(title=f"🎭 Model Report — {model}", description=date_range, color=discord.Color.purple())
+                embed.add_field(name="Totals", value=describe(totals), inline=False)
+                lines = []
+                for user, rollup in ranked:
+                    member = members.get(user)
+                    lines.append(f"**{member.label if member else user}** — {describe(rollup)}")
+                if len(contributors) > len(ranked):
+                    lines.append(f"... and {len(contributors) - len(ranked)} more")
+                embed.add_field(name="Top Chatters", value="\n".join(lines)[:1024], inline=False)
+            else:
+                report = index.report(from_date_obj, to_date_obj)
+                if not report:
+                    await interaction.followup.send("No sales recorded for the selected range.", ephemeral=ephemeral)
+                    return
+
+                ranked = sorted(report.items(), key=lambda item: item[1]["gross"], reverse=True)
+                embed = discord.Embed(title="🎭 Model Report", description=date_range, color=discord.Color.purple())
+                lines = [f"**{name}** — {describe(rollup)}" for name, rollup in ranked[:MAX_BREAKDOWN_LINES]]
+                if len(ranked) > MAX_BREAKDOWN_LINES:
+                    lines.append(f"... and {len(ranked) - MAX_BREAKDOWN_LINES} more")
+                embed.add_field(name="By Model", value="\n".join(lines)[:1024], inline=False)
+
+            embed.set_footer(text="Sales with several models are split evenly between them")
+            await interaction.followup.send(embed=embed, ephemeral=ephemeral)
+        except Exception as e:
+            logger.error(f"Model report command error: {e}", exc_info=True)
+            await interaction.followup.send(f"❌ Command failed: {str(e)}", ephemeral=ephemeral)
+
+    @app_commands.command(name="shift-history", description="Clocked shifts and hours worked over a time window")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.describe(
+        user="List one user's shifts instead of hours per user",
+        window="Time window of shift starts",
+        from_date="Start date for a custom window (dd/mm/yyyy)",
+        to_date="End date for a custom window (dd/mm/yyyy)"
+    )
+    @app_commands.choices(
+        window=[
+            app_commands.Choice(name="This week", value="week"),
+            app_commands.Choice(name="Last 30 days", value="30d"),
+            app_commands.Choice(name="All time", value="all"),
+            app_commands.Choice(name="Custom range", value="custom")
+        ]
+    )
+    async def shift_history(
+        self,
+        interaction: discord.Interaction,
+        user: Optional[discord.Member] = None,
+        window: Optional[app_commands.Choice[str]] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None
+    ):
+        """Report shifts from the shift log; the window is a range lookup in its time index"""
+        ephemeral = await self.get_ephemeral_setting(interaction.guild.id)
+        window_value = window.value if window else ("custom" if from_date or to_date else "week")
+        logger.info(f"User {interaction.user.name} ({interaction.user.id}) used /shift-history with user={user.id if user else None}, window={window_value}, from_date={from_date}, to_date={to_date}")
+
+        try:
+            from_date_obj = datetime.strptime(from_date, settings.DATE_FORMAT) if from_date else None
+            to_date_obj = datetime.strptime(to_date, settings.DATE_FORMAT) if to_date else None
+        except ValueError:
+            await interaction.response.send_message(f"❌ Invalid date format. Please use {settings.DATE_FORMAT}.", ephemeral=ephemeral)
+            return
+
+        if window_value == "custom" and not (from_date_obj or to_date_obj):
+            await interaction.response.send_message("❌ A custom window needs a from_date, a to_date or both.", ephemeral=ephemeral)
+            return
+
+        await interaction.response.defer(ephemeral=ephemeral)
+
+        try:
+            start, end = leaderboard.resolve_window(window_value, from_date_obj, to_date_obj, datetime.now(timezone.utc).replace(tzinfo=None))
+            # Clock times are UTC; the end date is inclusive
+            start_ts = int(start.replace(tzinfo=timezone.utc).timestamp()) if start else None
+            end_ts = int((end + timedelta(days=1)).replace(tzinfo=timezone.utc).timestamp()) if end else None
+            shifts = await shift_log.shifts(interaction.guild.id, user.id if user else None, start_ts, end_ts)
+
+            if start or end:
+                date_range = f"{start.strftime(settings.DATE_FORMAT) if start else '...'} to {end.strftime(settings.DATE_FORMAT) if end else '...'}"
+            else:
+                date_range = "All Time"
+            embed = discord.Embed(title="🕒 Shift History", description=date_range, color=discord.Color.from_rgb(0, 150, 255))
+
+            if not shifts:
+                embed.add_field(name="No shifts", value="No clocked shifts in this window.", inline=False)
+            elif user:
+                total_hours = sum(shift.hours_worked for shift in shifts)
+                total_overage = sum(shift.overage_seconds for shift in shifts)
+                embed.add_field(
+                    name=user.display_name,
+                    value=f"{len(shifts)} shifts, {total_hours:,.2f}h worked, {total_overage // 60} min over break limits",
+                    inline=False
+                )
+                lines = [
+                    f"<t:{shift.start}:f> → <t:{shift.end}:t> — {shift.hours_worked:,.2f}h"
+                    + (f", {shift.break_seconds // 60} min break" if shift.break_seconds else "")
+                    for shift in shifts[-MAX_BREAKDOWN_LINES:]
+                ]
+                if len(shifts) > MAX_BREAKDOWN_LINES:
+                    lines.insert(0, f"... {len(shifts) - MAX_BREAKDOWN_LINES} earlier shifts")
+                embed.add_field(name="Shifts", value="\n".join(lines)[:1024], inline=False)
+            else:
+                totals = {}
+                for shift in shifts:
+                    count, hours = totals.get(shift.user_id, (0, 0.0))
+                    totals[shift.user_id] = (count + 1, hours + shift.hours_worked)
+                ranked = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)
+                members = await MemberDirectory.build(interaction.guild, [user_id for user_id, _ in ranked[:MAX_BREAKDOWN_LINES]])
+                lines = []
+                for user_id, (count, hours) in ranked[:MAX_BREAKDOWN_LINES]:
+                    member = members.get(user_id)
+                    lines.append(f"**{member.label if member else f'<@{user_id}>'}** — {count} shifts, {hours:,.2f}h")
+                if len(ranked) > MAX_BREAKDOWN_LINES:
+                    lines.append(f"... and {len(ranked) - MAX_BREAKDOWN_LINES} more")
+                embed.add_field(name="Hours Worked", value="\n".join(lines)[:1024], inline=False)
+
+            embed.set_footer(text="Hours worked exclude breaks")
+            await interaction.followup.send(embed=embed, ephemeral=ephemeral)
+        except Exception as e:
+            logger.error(f"Shift history command error: {e}", exc_info=True)
+            await interaction.followup.send(f"❌ Command failed: {str(e)}", ephemeral=ephemeral)
+
+async def setup(bot):
+    await bot.add_cog(ReportSlashCommands(bot))
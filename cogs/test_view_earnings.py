@@ -0,0 +1,68 @@
+import unittest
+from types import SimpleNamespace
+from datetime import datetime, timezone
+from unittest import mock
+
+from cogs.calculator_slash import CalculatorSlashCommands
+
+GUILD_ID = 4242
+
+EARNINGS = {
+    "<@1>": [
+        {"id": "1-a", "date": "01/01/2025", "period": "weekly", "gross_revenue": "100.00", "total_cut": "20.00"},
+        {"id": "3-c", "date": "03/01/2025", "period": "weekly", "gross_revenue": "300.00", "total_cut": "60.00"},
+    ],
+    "<@2>": [
+        {"id": "2-b", "date": "02/01/2025", "period": "weekly", "gross_revenue": "200.00", "total_cut": "40.00"},
+    ],
+}
+
+def _interaction():
+    guild = mock.MagicMock(id=GUILD_ID)
+    guild.get_member.side_effect = lambda user_id: SimpleNamespace(display_name=f"User {user_id}", name=f"user{user_id}")
+    interaction = mock.MagicMock(guild=guild, created_at=datetime.now(timezone.utc))
+    interaction.user.guild_permissions.administrator = True
+    interaction.user.avatar = None
+    interaction.response = mock.AsyncMock()
+    interaction.followup = mock.AsyncMock()
+    return interaction
+
+class ViewEarningsAllDataTest(unittest.IsolatedAsyncioTestCase):
+    async def _view(self, **kwargs):
+        cog = CalculatorSlashCommands(mock.MagicMock())
+        interaction = _interaction()
+        with mock.patch.object(cog, "get_ephemeral_setting", mock.AsyncMock(return_value=True)), \
+             mock.patch("utils.file_handlers.load_earnings", mock.AsyncMock(return_value=EARNINGS)):
+            await CalculatorSlashCommands.view_earnings.callback(
+                cog, interaction, display_entries=False, all_data=True, **kwargs
+            )
+        return interaction
+
+    def _totals(self, interaction):
+        embed = interaction.followup.send.await_args_list[0].kwargs["embed"]
+        return {field.name: field.value for field in embed.fields}
+
+    async def test_totals_cover_every_user(self):
+        interaction = await self._view(entries=10)
+        totals = self._totals(interaction)
+        self.assertIn("$600.00", totals["Total Gross"])
+        self.assertIn("$120.00", totals["Total Cut"])
+
+    async def test_entries_limits_latest_entries(self):
+        interaction = await self._view(entries=2)
+        totals = self._totals(interaction)
+        self.assertIn("$500.00", totals["Total Gross"])
+        self.assertIn("$100.00", totals["Total Cut"])
+
+class ListEntryLengthTest(unittest.TestCase):
+    def test_length_matches_formatted_entry(self):
+        cog = CalculatorSlashCommands(mock.MagicMock())
+        entry = {**EARNINGS["<@1>"][0], "user_id": 1, "user": "User 1 (@user1)"}
+        for role in ("straße", "ßtraße", "chatter"):
+            for flags in ((False, False, False), (True, True, True)):
+                entry["role"] = role
+                text = cog.format_list_entry(_interaction(), 12, entry, *flags)
+                self.assertEqual(cog.list_entry_length(12, entry, *flags), len(text))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,11 @@ VERSION = "1.0.2"
 DATA_DIRECTORY = "data"
 CONFIG_DIR = os.path.join(DATA_DIRECTORY, "config")
 EARNINGS_DIR = os.path.join(DATA_DIRECTORY, "earnings")
+SNAPSHOT_DIR = os.path.join(DATA_DIRECTORY, "snapshots") # Content-addressed config and earnings backups
+SNAPSHOT_COMPRESSION_LEVEL = 6 # zlib level for snapshot blobs
+ADMIN_JOB_PROGRESS_INTERVAL = 2 # Seconds between progress updates of copy, backup and restore jobs
+EARNINGS_SYNC_BATCH_SIZE = 1000 # Documents per cursor batch when pulling earnings changes
+EARNINGS_CURSOR_BATCH_SIZE = 500 # Documents per cursor batch when streaming earnings reads
 os.makedirs(CONFIG_DIR, exist_ok=True)
 os.makedirs(EARNINGS_DIR, exist_ok=True)
 
@@ -55,11 +60,32 @@ DEFAULT_CLOCK_DATA = {
     },
     "bonuses_penalties": {}
 }
+BREAK_ALERT_REFRESH_SECONDS = 15 # How often an open overstay alert is updated
+CLOCK_WRITE_MODE = os.getenv("CLOCK_WRITE_MODE", "immediate") # "immediate" writes every clock event; "buffered" coalesces them in memory
+CLOCK_FLUSH_INTERVAL_MS = int(os.getenv("CLOCK_FLUSH_INTERVAL_MS", 500)) # Max delay before buffered clock writes are stored
+SHIFT_PREFILL_WINDOW_HOURS = 12 # A clocked shift ending this recently prefills the hours-worked modal
+SHIFT_PREFILL_TIMEOUT_SECONDS = 1.5 # Longest wait for the shift index before opening the modal without prefill
 
 # Formatting
 DATE_FORMAT = "%d/%m/%Y"
 DECIMAL_PLACES = 2
 
+# Report generation
+DEPARTED_MEMBER_CACHE_SIZE = 5000 # Names remembered per guild for members who have left
+PAGINATOR_TTL = 600 # Seconds an earnings paginator stays interactive after its last use
+PDF_DETAIL_ROW_BUDGET = int(os.getenv("PDF_DETAIL_ROW_BUDGET", 5000)) # Max rows in the PDF detailed table
+PDF_DETAIL_CHUNK_ROWS = 250 # Rows per table chunk in the PDF detailed table
+PDF_CHART_PAGE_BUDGET = int(os.getenv("PDF_CHART_PAGE_BUDGET", 40)) # Max per-user chart pages in a PDF
+CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", os.cpu_count() or 1)) # Worker processes for chart rendering
+CHART_POINT_BUDGET = 500 # Max plotted points per chart series before LTTB downsampling
+CHART_DAILY_BIN_MAX_DAYS = 180 # Charts spanning up to this many days are binned per day
+CHART_WEEKLY_BIN_MAX_DAYS = 730 # ...then per week up to this span, per month beyond
+CHART_CACHE_MAX_BYTES = 64 * 1024 * 1024 # Rendered chart LRU cache size
+XLSX_WIDTH_SAMPLE_ROWS = 1000 # Leading rows measured for Excel column widths
+LEADERBOARD_MAX_SIZE = 25 # Max users shown on a leaderboard
+LEADERBOARD_CACHE_SIZE = 256 # Cached leaderboard results
+LEADERBOARD_CACHE_TTL = 300 # Seconds a cached leaderboard is trusted without an in-process save
+
 os.makedirs(DATA_DIRECTORY, exist_ok=True)
 
 # def get_earnings_file_name_without_ext(): # TODO: remove
@@ -133,12 +159,24 @@ def get_guild_earnings_path(guild_id: int) -> str:
     """Get path to guild's earnings file"""
     return get_guild_earnings_file(guild_id, EARNINGS_FILE)
 
+def get_guild_earnings_sync_path(guild_id: int) -> str:
+    """Get path to guild's earnings sync state (watermark and entry digests)"""
+    return get_guild_earnings_file(guild_id, "earnings_sync.json")
+
 # NOTE: CLOCK
 
 def get_guild_clock_data_path(guild_id: int) -> str:
     """Get path to guild's clock data file"""
     return get_guild_file(guild_id, "clock_data.json")
 
+def get_guild_shift_log_path(guild_id: int) -> str:
+    """Get path to guild's binary shift log"""
+    return get_guild_file(guild_id, "shift_log.bin")
+
+def get_guild_bonus_history_path(guild_id: int) -> str:
+    """Get path to guild's log of applied bonuses and penalties"""
+    return get_guild_file(guild_id, "bonus_history.jsonl")
+
 MONGO_COLLECTION_MAPPING = {
     "role_percentages.json": "roles",
     "shift_config.json": "shifts",
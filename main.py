@@ -10,6 +10,7 @@ from discord.ext import commands
 from discord import app_commands
 from logging.handlers import RotatingFileHandler
 from utils.db import set_current_mongo_client
+from utils import charts, clock_store
 from threading import Thread
 from flask import Flask, render_template
 
@@ -41,6 +42,7 @@ class BotInstance:
         self.mongo_client = None
         self.database = None
         self.bot = None
+        self.clock_buffer = None
 
     async def setup_hook(self):
         """Initialize bot instance with all handlers and extensions"""
@@ -54,6 +56,8 @@ class BotInstance:
             except Exception as e:
                 logger.error(f"Failed to connect to MongoDB for bot: {e}")
 
+        self.clock_buffer = clock_store.start_write_buffer()
+
         intents = discord.Intents.default()
         intents.members = True
         intents.message_content = True
@@ -181,6 +185,8 @@ class BotInstance:
         finally:
             if self.bot:
                 await self.bot.close()
+            if self.clock_buffer:
+                await self.clock_buffer.close()
             if self.mongo_client:
                 self.mongo_client.close()
 
@@ -204,7 +210,10 @@ async def main():
         BotInstance(token, mongo_uri)
         for _, (token, mongo_uri) in tokens_and_uris.items()
     ]
-    await asyncio.gather(*(bot.start() for bot in bots))
+    try:
+        await asyncio.gather(*(bot.start() for bot in bots))
+    finally:
+        charts.shutdown_render_pool()
 
 def run_web():
     app = Flask(__name__, static_folder='assets', static_url_path='/assets')
@@ -0,0 +1,139 @@
+import time
+import asyncio
+import logging
+import discord
+import threading
+
+from discord import ui
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+from config import settings
+
+logger = logging.getLogger("xof_calculator.admin_jobs")
+
+class JobBusy(Exception):
+    """Another heavy admin job is already running for the guild"""
+
+class JobCancelled(Exception):
+    """The job was cancelled by the user who started it"""
+
+class AdminJob:
+    """
+    State of one heavy admin job.
+
+    File work runs in worker threads through run(). Workers report with
+    progress() and call check_cancelled() at points where stopping leaves
+    the data consistent; cancel() only takes effect there.
+    """
+
+    def __init__(self, guild_id: int, name: str, user_id: Optional[int] = None):
+        self.guild_id = guild_id
+        self.name = name
+        self.user_id = user_id
+        self.started = time.monotonic()
+        self.done = 0
+        self.total = 0
+        self.status = "Starting"
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check_cancelled(self):
+        """Raise JobCancelled if cancellation was requested"""
+        if self._cancel.is_set():
+            raise JobCancelled(self.name)
+
+    def progress(self, done: int, total: int, status: Optional[str] = None):
+        """Record progress; safe to call from worker threads"""
+        self.done, self.total = done, total
+        if status:
+            self.status = status
+
+    async def run(self, func: Callable[..., Any], *args, status: Optional[str] = None, **kwargs) -> Any:
+        """Run blocking file work in the thread pool"""
+        self.check_cancelled()
+        if status:
+            self.status = status
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    def render(self) -> str:
+        elapsed = time.monotonic() - self.started
+        line = f"⏳ **{self.name}** — {self.status}"
+        if self.total:
+            line += f" ({self.done}/{self.total})"
+        line += f" · {elapsed:.0f}s"
+        if self.cancelled:
+            line += "\nCancelling..."
+        return line
+
+class JobCancelView(ui.View):
+    """Cancel button shown under a job's progress message"""
+
+    def __init__(self, job: AdminJob):
+        super().__init__(timeout=None)
+        self.job = job
+        cancel_button = ui.Button(label="Cancel", style=discord.ButtonStyle.secondary)
+        cancel_button.callback = self.on_cancel
+        self.add_item(cancel_button)
+
+    async def on_cancel(self, interaction: discord.Interaction):
+        if self.job.user_id is not None and interaction.user.id != self.job.user_id:
+            await interaction.response.send_message("❌ Only the user who started this job can cancel it.", ephemeral=True)
+            return
+        self.job.cancel()
+        await interaction.response.edit_message(content=self.job.render(), view=None)
+
+# {guild_id: job}; heavy admin jobs run one at a time per guild
+_running: Dict[int, AdminJob] = {}
+
+def running_job(guild_id: int) -> Optional[AdminJob]:
+    return _running.get(guild_id)
+
+async def _report(job: AdminJob, interaction: discord.Interaction, cancellable: bool):
+    view = JobCancelView(job) if cancellable else None
+    while True:
+        await asyncio.sleep(settings.ADMIN_JOB_PROGRESS_INTERVAL)
+        try:
+            await interaction.edit_original_response(content=job.render(), view=None if job.cancelled else view)
+        except discord.HTTPException as e:
+            logger.debug(f"Could not update progress of {job.name} for guild {job.guild_id}: {e}")
+
+@asynccontextmanager
+async def admin_job(
+    guild_id: int,
+    name: str,
+    interaction: Optional[discord.Interaction] = None,
+    cancellable: bool = True
+) -> AsyncIterator[AdminJob]:
+    """
+    Run a heavy admin job for a guild.
+
+    While the job runs, the interaction's original response is edited with
+    its progress every ADMIN_JOB_PROGRESS_INTERVAL seconds, with a Cancel
+    button for the user who started it unless cancellable is False. The
+    caller must have responded to (or deferred) the interaction, and should
+    replace the progress message with the result when done.
+
+    Raises:
+        JobBusy: If the guild already has a job running
+    """
+    current = _running.get(guild_id)
+    if current is not None:
+        raise JobBusy(current.name)
+
+    job = AdminJob(guild_id, name, interaction.user.id if interaction else None)
+    _running[guild_id] = job
+    reporter = asyncio.create_task(_report(job, interaction, cancellable)) if interaction else None
+    logger.info(f"Started admin job '{name}' for guild {guild_id}")
+    try:
+        yield job
+    finally:
+        if reporter:
+            reporter.cancel()
+        _running.pop(guild_id, None)
+        logger.info(f"Admin job '{name}' for guild {guild_id} finished after {time.monotonic() - job.started:.1f}s")
@@ -0,0 +1,100 @@
+import logging
+import discord
+
+from typing import Dict, Optional
+from collections import Counter
+
+logger = logging.getLogger("xof_calculator.alert_delivery")
+
+class AlertDelivery:
+    """
+    Sends, edits and deletes alert messages by stored channel and message ID.
+
+    Channels come from the gateway cache, with a REST fetch only when the
+    cache misses. Messages are edited and deleted through PartialMessage
+    handles, so no fetch_message call is needed. A handle that turns out to
+    be stale (NotFound) is dropped and the caller falls back to sending a
+    new message.
+
+    The counters record REST calls made and avoided:
+        channel_cache_hits: channel lookups served without fetch_channel
+        channel_fetches: fetch_channel calls made on cache misses
+        message_fetches_saved: edits/deletes made without fetch_message
+        stale_messages: stored message IDs that no longer existed
+    """
+
+    def __init__(self):
+        self.stats: Counter = Counter()
+
+    async def get_text_channel(self, guild: discord.Guild, channel_id: int) -> Optional[discord.abc.Messageable]:
+        """
+        Resolve a channel alerts can be posted in.
+
+        Args:
+            guild: Guild that owns the channel
+            channel_id: Stored channel ID
+
+        Returns:
+            The channel, or None if it's gone, inaccessible or not text-based
+        """
+        channel = guild.get_channel_or_thread(channel_id)
+        if channel is not None:
+            self.stats["channel_cache_hits"] += 1
+        else:
+            try:
+                channel = await guild.fetch_channel(channel_id)
+                self.stats["channel_fetches"] += 1
+            except (discord.NotFound, discord.Forbidden):
+                logger.warning(f"Alert channel {channel_id} not found or no permission in guild {guild.id}.")
+                return None
+
+        if not isinstance(channel, (discord.TextChannel, discord.Thread)):
+            logger.warning(f"Alert channel {channel_id} in guild {guild.id} is not a text channel. Type: {type(channel)}")
+            return None
+        return channel
+
+    async def edit_or_send(self, channel, message_id: Optional[int], **kwargs) -> int:
+        """
+        Edit the stored alert message, or send a new one.
+
+        Args:
+            channel: Channel from get_text_channel
+            message_id: Stored alert message ID, if any
+            **kwargs: Message content (embed=..., content=...)
+
+        Returns:
+            ID of the message now holding the alert
+
+        Raises:
+            discord.HTTPException: If sending a new message fails
+        """
+        if message_id:
+            try:
+                await channel.get_partial_message(message_id).edit(**kwargs)
+                self.stats["message_fetches_saved"] += 1
+                return message_id
+            except discord.NotFound:
+                self.stats["stale_messages"] += 1
+                logger.info(f"Alert message {message_id} in channel {channel.id} not found. Sending a new one.")
+
+        message = await channel.send(**kwargs)
+        return message.id
+
+    async def delete(self, channel, message_id: int) -> bool:
+        """
+        Delete a stored alert message.
+
+        Returns:
+            True if the message was deleted, False if it was already gone
+        """
+        try:
+            await channel.get_partial_message(message_id).delete()
+            self.stats["message_fetches_saved"] += 1
+            return True
+        except discord.NotFound:
+            self.stats["stale_messages"] += 1
+            return False
+
+    def snapshot(self) -> Dict[str, int]:
+        """Current counter values"""
+        return dict(self.stats)
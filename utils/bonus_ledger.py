@@ -0,0 +1,135 @@
+import os
+import json
+import asyncio
+import logging
+import aiofiles
+
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+from config import settings
+from utils import clock_store
+from utils.db import get_current_mongo_client
+
+logger = logging.getLogger("xof_calculator.bonus_ledger")
+
+class Ledger:
+    """
+    One user's active bonuses and penalties, keyed by item ID.
+
+    Items keep their stored (insertion) order. A sorted list of IDs serves
+    short-ID prefix lookups with a binary search.
+    """
+
+    def __init__(self, items: Iterable[Dict[str, Any]] = ()):
+        self.items: Dict[str, Dict[str, Any]] = {item["id"]: item for item in items}
+        self._ids: List[str] = sorted(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, item: Dict[str, Any]):
+        if item["id"] not in self.items:
+            self._ids.insert(bisect_left(self._ids, item["id"]), item["id"])
+        self.items[item["id"]] = item
+
+    def remove(self, item_id: str) -> Optional[Dict[str, Any]]:
+        item = self.items.pop(item_id, None)
+        if item is not None:
+            del self._ids[bisect_left(self._ids, item_id)]
+        return item
+
+    def find(self, prefix: str, item_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Items whose ID starts with prefix, optionally of one type"""
+        matches = []
+        for item_id in self._ids[bisect_left(self._ids, prefix):]:
+            if not item_id.startswith(prefix):
+                break
+            item = self.items[item_id]
+            if item_type is None or item["type"] == item_type:
+                matches.append(item)
+        return matches
+
+    def of_type(self, item_type: str) -> List[Dict[str, Any]]:
+        return [item for item in self.items.values() if item["type"] == item_type]
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Items in stored order, as kept in clock data"""
+        return list(self.items.values())
+
+def from_clock_data(clock_data: Dict[str, Any], user_id: int) -> Ledger:
+    """A user's ledger from already loaded clock data"""
+    return Ledger(clock_data["bonuses_penalties"].get(str(user_id), []))
+
+async def load(guild_id: int, user_id: int) -> Ledger:
+    """Load a user's ledger from clock data"""
+    return from_clock_data(await clock_store.load(guild_id), user_id)
+
+async def save(guild_id: int, user_id: int, ledger: Ledger) -> bool:
+    """Store a user's ledger"""
+    return await clock_store.save_bonuses_penalties(guild_id, user_id, ledger.to_list())
+
+def _insert_history_mongo(guild_id: int, records: List[Dict[str, Any]]) -> bool:
+    try:
+        db = get_current_mongo_client().get_database()
+    except RuntimeError:
+        return False
+    db["bonus_history"].insert_many([{"guild_id": str(guild_id), **record} for record in records])
+    return True
+
+async def archive(guild_id: int, user_id: int, items: List[Dict[str, Any]], entry_id: Optional[str] = None) -> bool:
+    """
+    Append applied items to the guild's bonus history.
+
+    Each item is stored with the user, the time it was applied and the
+    earnings entry it was applied to, in the bonus_history collection when
+    MongoDB is configured and as a JSON line in the guild's history file.
+
+    Returns:
+        True if the items were stored in MongoDB or the file
+    """
+    if not items:
+        return True
+    applied_at = datetime.now(timezone.utc).isoformat()
+    records = [{**item, "user_id": str(user_id), "applied_at": applied_at, "entry_id": entry_id} for item in items]
+
+    db_success = False
+    try:
+        db_success = await asyncio.to_thread(_insert_history_mongo, guild_id, records)
+    except Exception as e:
+        logger.error(f"Error archiving bonuses/penalties to MongoDB for guild {guild_id}: {e}")
+
+    file_success = False
+    path = settings.get_guild_bonus_history_path(guild_id)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        async with aiofiles.open(path, "a", encoding="utf-8") as f:
+            await f.write("".join(json.dumps(record) + "\n" for record in records))
+        file_success = True
+    except Exception as e:
+        logger.error(f"Error archiving bonuses/penalties to {path}: {e}")
+
+    return db_success or file_success
+
+async def consume(guild_id: int, user_id: int, item_ids: Iterable[str], entry_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Remove applied items from a user's ledger by ID and archive them.
+
+    Items added after the calculation was previewed aren't in item_ids, so
+    they stay active. IDs no longer in the ledger are ignored.
+
+    Args:
+        guild_id: Guild of the ledger
+        user_id: User whose items were applied
+        item_ids: IDs of the applied items
+        entry_id: Earnings entry the items were applied to
+
+    Returns:
+        The items that were consumed
+    """
+    ledger = await load(guild_id, user_id)
+    consumed = [item for item in map(ledger.remove, item_ids) if item is not None]
+    if consumed:
+        await save(guild_id, user_id, ledger)
+        await archive(guild_id, user_id, consumed, entry_id)
+    return consumed
@@ -0,0 +1,334 @@
+import io
+import json
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from config import settings
+
+logger = logging.getLogger("xof_calculator.charts")
+
+# Shared worker pool for chart rendering, created on first use
+_render_pool: Optional[ProcessPoolExecutor] = None
+
+# Rendered PNG bytes keyed by chart_key, least recently used first
+_chart_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_chart_cache_bytes = 0
+cache_stats = {"hits": 0, "misses": 0}
+
+BIN_LABELS = {"D": "Daily totals", "W": "Weekly totals", "M": "Monthly totals"}
+
+def choose_bin(dates: Sequence) -> str:
+    """
+    Pick a time bin for a date range.
+
+    Args:
+        dates: Dates covered by a chart
+
+    Returns:
+        Pandas period alias: "D" (day), "W" (week) or "M" (month)
+    """
+    if len(dates) == 0:
+        return "D"
+    span_days = (max(dates) - min(dates)).days
+    if span_days <= settings.CHART_DAILY_BIN_MAX_DAYS:
+        return "D"
+    if span_days <= settings.CHART_WEEKLY_BIN_MAX_DAYS:
+        return "W"
+    return "M"
+
+def bin_series(dates: Sequence, values: Sequence[float], freq: str) -> Tuple[List, List[float]]:
+    """
+    Sum values into day, week or month bins.
+
+    Empty bins are left out rather than filled with zeros so sparse
+    histories keep their shape.
+
+    Args:
+        dates: Entry dates
+        values: Entry values
+        freq: Pandas period alias ("D", "W" or "M")
+
+    Returns:
+        Tuple of (bin start datetimes, summed values), sorted by date
+    """
+    if len(dates) == 0:
+        return [], []
+    index = pd.DatetimeIndex(dates).to_period(freq).start_time
+    binned = pd.Series(np.asarray(values, dtype=float)).groupby(index).sum()
+    return binned.index.to_pydatetime().tolist(), binned.tolist()
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, for every bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket. Peaks and troughs survive, flat runs
+    collapse.
+
+    Args:
+        xs: Sorted x coordinates
+        ys: y coordinates
+        threshold: Number of points to keep
+
+    Returns:
+        Indices of the kept points, in order
+    """
+    count = len(xs)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+
+    x = np.asarray(xs, dtype=float)
+    y = np.asarray(ys, dtype=float)
+    bucket_size = (count - 2) / (threshold - 2)
+    kept = [0]
+    previous = 0
+
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        if next_start >= next_end:
+            avg_x, avg_y = x[-1], y[-1]
+        else:
+            avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(areas.argmax())
+        kept.append(previous)
+
+    kept.append(count - 1)
+    return kept
+
+def downsample_series(
+    series: Sequence[Tuple[str, Sequence, Sequence[float]]],
+    point_budget: int
+) -> Tuple[List[Tuple[str, List, List[float]]], str]:
+    """
+    Bin every series of a chart to a common granularity, then apply LTTB
+    to any series still above the point budget.
+
+    Args:
+        series: List of (label, dates, values) tuples
+        point_budget: Maximum points per series
+
+    Returns:
+        Tuple of (downsampled series, bin alias used)
+    """
+    bounds = [bound for _, dates, _ in series if len(dates) for bound in (min(dates), max(dates))]
+    freq = choose_bin(bounds)
+
+    prepared = []
+    for label, dates, values in series:
+        binned_dates, binned_values = bin_series(dates, values, freq)
+        if len(binned_dates) > point_budget:
+            xs = mdates.date2num(binned_dates)
+            kept = lttb(xs, binned_values, point_budget)
+            binned_dates = [binned_dates[i] for i in kept]
+            binned_values = [binned_values[i] for i in kept]
+        prepared.append((label, binned_dates, binned_values))
+    return prepared, freq
+
+def render_line_chart(spec: Dict[str, Any]) -> bytes:
+    """
+    Render a date-based line chart to PNG bytes.
+
+    Uses the object-oriented Figure API so it never touches pyplot's global
+    state and can safely run inside worker processes. Series are binned and
+    downsampled first (see downsample_series), so render time does not grow
+    with history size.
+
+    Args:
+        spec: Chart specification with keys:
+            title: Chart title
+            series: List of (label, dates, values) tuples; dates sorted
+            figsize: Figure size in inches (default (7, 4))
+            dpi: Output resolution (default 150)
+            legend: Optional legend kwargs
+            style: Line format for every series (default 'o-')
+            styles: Optional per-series line formats, overriding style
+            point_budget: Max points per series (default CHART_POINT_BUDGET)
+
+    Returns:
+        PNG image bytes
+    """
+    fig = Figure(figsize=spec.get("figsize", (7, 4)))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    series, freq = downsample_series(
+        spec.get("series", []),
+        spec.get("point_budget", settings.CHART_POINT_BUDGET)
+    )
+    styles = spec.get("styles") or [spec.get("style", "o-")] * len(series)
+    for (label, dates, values), style in zip(series, styles):
+        ax.plot(dates, values, style, label=label)
+
+    ax.set_title(spec.get("title", ""))
+    if freq != "D":
+        ax.set_xlabel(BIN_LABELS[freq])
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m/%y'))
+    for tick in ax.get_xticklabels():
+        tick.set_rotation(45)
+    ax.legend(**spec.get("legend", {}))
+    ax.grid(True, linestyle='--', alpha=0.7)
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=spec.get("dpi", 150), bbox_inches='tight')
+    return buffer.getvalue()
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    """Get or create the shared chart rendering pool"""
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(
+            max_workers=settings.CHART_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _render_pool
+
+def render_many(specs: List[Dict[str, Any]]) -> List[bytes]:
+    """
+    Render several charts, in parallel worker processes when worthwhile.
+
+    This call blocks; run it through an executor from async code.
+
+    Args:
+        specs: List of chart specifications (see render_line_chart)
+
+    Returns:
+        List of PNG image bytes in the same order as specs
+    """
+    global _render_pool
+
+    if len(specs) < 2 or settings.CHART_RENDER_WORKERS < 2:
+        return [render_line_chart(spec) for spec in specs]
+
+    try:
+        return list(_get_render_pool().map(render_line_chart, specs))
+    except BrokenProcessPool as e:
+        logger.error(f"Chart render pool failed, rendering in-process: {e}")
+        _render_pool = None
+        return [render_line_chart(spec) for spec in specs]
+
+def shutdown_render_pool():
+    """Stop the shared chart rendering pool if it was started"""
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+def dataset_version(entries: Sequence[Dict[str, Any]]) -> str:
+    """
+    Fingerprint the entries a set of charts is drawn from.
+
+    Any change to an entry's id, date, amounts or owner yields a new
+    version, so cached charts never outlive the data they show.
+
+    Args:
+        entries: Earnings entries behind the charts
+
+    Returns:
+        Hex digest identifying this exact dataset
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for entry in entries:
+        digest.update(repr((
+            entry.get('id'),
+            entry.get('date'),
+            entry.get('gross_revenue'),
+            entry.get('total_cut'),
+            entry.get('hours_worked'),
+            entry.get('user_id'),
+            entry.get('user')
+        )).encode('utf-8'))
+    return digest.hexdigest()
+
+def chart_key(version: str, spec: Dict[str, Any]) -> str:
+    """
+    Build the cache key for a chart: dataset version, spec, size and dpi.
+
+    The series data themselves are derived from the dataset, so only their
+    labels and lengths go into the key.
+
+    Args:
+        version: Value from dataset_version
+        spec: Chart specification (see render_line_chart)
+
+    Returns:
+        Cache key string
+    """
+    shape = {key: value for key, value in spec.items() if key != "series"}
+    shape["figsize"] = spec.get("figsize", (7, 4))
+    shape["dpi"] = spec.get("dpi", 150)
+    shape["series"] = [(label, len(values)) for label, _, values in spec.get("series", [])]
+    payload = json.dumps(shape, sort_keys=True, default=str)
+    return hashlib.blake2b(f"{version}|{payload}".encode('utf-8'), digest_size=16).hexdigest()
+
+def _cache_put(key: str, image: bytes):
+    """Store a rendered chart, evicting least recently used ones over the byte budget"""
+    global _chart_cache_bytes
+    if key in _chart_cache:
+        return
+    _chart_cache[key] = image
+    _chart_cache_bytes += len(image)
+    while _chart_cache_bytes > settings.CHART_CACHE_MAX_BYTES and _chart_cache:
+        _, evicted = _chart_cache.popitem(last=False)
+        _chart_cache_bytes -= len(evicted)
+
+async def render_cached(specs: List[Dict[str, Any]], version: str) -> List[bytes]:
+    """
+    Render charts through the shared LRU cache.
+
+    Cached charts are returned as-is; the rest are rendered together off
+    the event loop (see render_many) and cached for every export format
+    and later request that asks for the same chart.
+
+    Args:
+        specs: List of chart specifications
+        version: Value from dataset_version for the entries behind the charts
+
+    Returns:
+        List of PNG image bytes in the same order as specs
+    """
+    keys = [chart_key(version, spec) for spec in specs]
+    images: List[Optional[bytes]] = []
+    missing = []
+
+    for index, key in enumerate(keys):
+        image = _chart_cache.get(key)
+        if image is not None:
+            _chart_cache.move_to_end(key)
+            cache_stats["hits"] += 1
+        else:
+            missing.append(index)
+            cache_stats["misses"] += 1
+        images.append(image)
+
+    if missing:
+        rendered = await asyncio.get_running_loop().run_in_executor(
+            None, render_many, [specs[index] for index in missing]
+        )
+        for index, image in zip(missing, rendered):
+            images[index] = image
+            _cache_put(keys[index], image)
+
+    return images
@@ -0,0 +1,172 @@
+import copy
+import asyncio
+import logging
+
+from typing import Any, Dict, Optional, Tuple
+from contextvars import ContextVar
+from config import settings
+from utils import file_handlers
+from utils.db import get_current_mongo_client
+from utils.write_buffer import WriteBuffer
+
+logger = logging.getLogger("xof_calculator.clock_store")
+
+# Top-level sections of a guild's clock data
+SECTIONS = ("users", "settings", "bonuses_penalties")
+
+# Path of keys inside clock_data, e.g. ("users", "1234")
+Path = Tuple[str, ...]
+
+# Per-guild locks serializing read-modify-write of the clock data file
+_guild_locks: Dict[int, asyncio.Lock] = {}
+
+# Write-behind buffer of the current bot instance, when CLOCK_WRITE_MODE is "buffered"
+_write_buffer: ContextVar[Optional[WriteBuffer]] = ContextVar("clock_write_buffer", default=None)
+
+def _lock(guild_id: int) -> asyncio.Lock:
+    if guild_id not in _guild_locks:
+        _guild_locks[guild_id] = asyncio.Lock()
+    return _guild_locks[guild_id]
+
+def _with_defaults(data: Any) -> Dict[str, Any]:
+    """Fill in missing sections without sharing the module-level default"""
+    data = data if isinstance(data, dict) else {}
+    for section in SECTIONS:
+        if not isinstance(data.get(section), dict):
+            data[section] = copy.deepcopy(settings.DEFAULT_CLOCK_DATA.get(section, {}))
+    return data
+
+def _set_path(data: Dict[str, Any], path: Path, value: Any):
+    node = data
+    for key in path[:-1]:
+        node = node.setdefault(key, {})
+    node[path[-1]] = value
+
+async def _load_stored(guild_id: int) -> Dict[str, Any]:
+    data = await file_handlers.load_json(settings.get_guild_clock_data_path(guild_id), copy.deepcopy(settings.DEFAULT_CLOCK_DATA))
+    return _with_defaults(data)
+
+async def load(guild_id: int) -> Dict[str, Any]:
+    """
+    Load a guild's clock data.
+
+    Returns:
+        Clock data with "users", "settings" and "bonuses_penalties" sections;
+        callers may mutate it freely
+    """
+    buffer = _write_buffer.get()
+    if buffer:
+        return await buffer.load(guild_id)
+    return await _load_stored(guild_id)
+
+async def load_from(guild_id: int, stored: Any) -> Dict[str, Any]:
+    """
+    Clock data from an already fetched copy of the stored document.
+
+    Lets callers that read clock_data along with other guild config reuse
+    it; with a write buffer active the buffered copy is returned instead,
+    since it may hold changes not yet written.
+    """
+    buffer = _write_buffer.get()
+    if buffer:
+        return await buffer.load(guild_id)
+    return _with_defaults(copy.deepcopy(stored))
+
+def _mongo_set(guild_id: int, updates: Dict[Path, Any]) -> bool:
+    try:
+        db = get_current_mongo_client().get_database()
+    except RuntimeError:
+        return False
+    fields = {".".join(("clock_data",) + path): value for path, value in updates.items()}
+    fields["id"] = str(guild_id)
+    db["guild_configs"].update_one({"guild_id": str(guild_id)}, {"$set": fields}, upsert=True)
+    return True
+
+async def _write_stored(guild_id: int, updates: Dict[Path, Any], snapshot: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Write paths to MongoDB and the JSON file.
+
+    Args:
+        guild_id: Guild to update
+        updates: {path: value}
+        snapshot: Complete clock data to write to the file as-is; without
+            it the file is re-read and patched with the updates
+    """
+    db_success = False
+    try:
+        db_success = await asyncio.to_thread(_mongo_set, guild_id, updates)
+    except Exception as e:
+        logger.error(f"Error updating clock data in MongoDB for guild {guild_id}: {e}")
+
+    path = settings.get_guild_clock_data_path(guild_id)
+    async with _lock(guild_id):
+        if snapshot is None:
+            snapshot = _with_defaults(await file_handlers.load_json_from_file(path, copy.deepcopy(settings.DEFAULT_CLOCK_DATA)))
+            for key_path, value in updates.items():
+                _set_path(snapshot, key_path, value)
+        file_success = await file_handlers.save_json_to_file(path, snapshot)
+
+    return db_success or file_success
+
+async def set_paths(guild_id: int, updates: Dict[Path, Any]) -> bool:
+    """
+    Write individual parts of a guild's clock data.
+
+    Only the given paths are written, so concurrent updates to different
+    users (or settings) can't overwrite each other. With MongoDB each path
+    becomes a $set on guild_configs.clock_data.<path>. The JSON file is
+    re-read, patched and written under a per-guild lock.
+
+    With a write buffer active the update is applied in memory and written
+    in the background within CLOCK_FLUSH_INTERVAL_MS.
+
+    Args:
+        guild_id: Guild to update
+        updates: {path: value}, e.g. {("users", "1234"): state}
+
+    Returns:
+        True if the data was stored (or buffered)
+    """
+    if not updates:
+        return True
+    for path in updates:
+        if not path or path[0] not in SECTIONS:
+            raise ValueError(f"Invalid clock data path: {path}")
+
+    buffer = _write_buffer.get()
+    if buffer:
+        await buffer.apply(guild_id, updates)
+        return True
+    return await _write_stored(guild_id, updates)
+
+async def save_user_state(guild_id: int, user_id: int, state: Dict[str, Any]) -> bool:
+    """Store one user's clock state"""
+    return await set_paths(guild_id, {("users", str(user_id)): state})
+
+async def save_settings(guild_id: int, **values: Any) -> bool:
+    """Store clock settings by name, e.g. save_settings(guild_id, max_breaks_per_shift=3)"""
+    return await set_paths(guild_id, {("settings", key): value for key, value in values.items()})
+
+async def save_bonuses_penalties(guild_id: int, user_id: int, items: list) -> bool:
+    """Store one user's active bonuses and penalties"""
+    return await set_paths(guild_id, {("bonuses_penalties", str(user_id)): items})
+
+def start_write_buffer() -> Optional[WriteBuffer]:
+    """
+    Buffer clock writes for the current bot instance if CLOCK_WRITE_MODE is
+    "buffered". Call from the instance's own task so its handlers inherit it.
+
+    Returns:
+        The buffer to close on shutdown, or None in "immediate" mode
+    """
+    if settings.CLOCK_WRITE_MODE != "buffered":
+        return None
+    buffer = WriteBuffer(
+        _load_stored,
+        _write_stored,
+        settings.CLOCK_FLUSH_INTERVAL_MS / 1000,
+        fingerprint=lambda guild_id: file_handlers.get_file_fingerprint(settings.get_guild_clock_data_path(guild_id))
+    )
+    _write_buffer.set(buffer)
+    logger.info(f"Buffering clock writes, flushing every {settings.CLOCK_FLUSH_INTERVAL_MS} ms")
+    return buffer
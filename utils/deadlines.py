@@ -0,0 +1,82 @@
+import time
+import heapq
+import asyncio
+import logging
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger("xof_calculator.deadlines")
+
+class DeadlineScheduler:
+    """
+    Min-heap of wall-clock deadlines with one sleeping consumer.
+
+    The consumer sleeps until the earliest deadline, or indefinitely when
+    nothing is scheduled, and is woken early whenever an earlier deadline
+    is added. Rescheduling or cancelling a key leaves its old heap entry in
+    place; stale entries are skipped when they reach the top.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._deadlines: Dict[Hashable, float] = {}
+        self._counter = 0
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, key: Hashable, when: float):
+        """
+        Schedule (or reschedule) a key.
+
+        Args:
+            key: Identifies what is due; one deadline per key
+            when: Deadline as a Unix timestamp
+        """
+        self._deadlines[key] = when
+        self._counter += 1
+        heapq.heappush(self._heap, (when, self._counter, key))
+        if self._heap[0][2] == key and self._heap[0][0] == when:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable) -> bool:
+        """Forget a key's deadline; returns False if none was scheduled"""
+        return self._deadlines.pop(key, None) is not None
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        """The key's scheduled deadline, if any"""
+        return self._deadlines.get(key)
+
+    def _pop_due(self, now: float) -> List[Hashable]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, _, key = heapq.heappop(self._heap)
+            if self._deadlines.get(key) == when:
+                del self._deadlines[key]
+                due.append(key)
+        # Drop stale entries so the next sleep targets a live deadline
+        while self._heap and self._deadlines.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return due
+
+    async def run(self, callback: Callable[[Any], Awaitable[None]]):
+        """
+        Call callback(key) for each key as its deadline passes, forever.
+
+        Callbacks run one at a time and may schedule keys again. Errors are
+        logged and don't stop the loop.
+        """
+        while True:
+            for key in self._pop_due(time.time()):
+                try:
+                    await callback(key)
+                except Exception as e:
+                    logger.error(f"Deadline callback failed for {key}: {e}", exc_info=True)
+
+            self._wakeup.clear()
+            timeout = max(0.0, self._heap[0][0] - time.time()) if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
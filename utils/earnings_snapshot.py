@@ -0,0 +1,100 @@
+import logging
+
+from typing import Any, Dict, Iterable, List, Optional
+from config import settings
+from utils import file_handlers
+
+logger = logging.getLogger("xof_calculator.earnings_snapshot")
+
+class EarningsSnapshot:
+    """
+    A guild's earnings as loaded at one point, with a sale ID → owner index.
+
+    Commands that preview a change and apply it after confirmation keep the
+    snapshot between the two steps. is_current() tells whether the ledger
+    was saved since, in which case it has to be reloaded.
+    """
+
+    def __init__(self, guild_id: int, data: Dict[str, List[Dict[str, Any]]], fingerprint: tuple):
+        self.guild_id = guild_id
+        self.data = data
+        self.fingerprint = fingerprint
+        self._owners: Optional[Dict[str, str]] = None
+
+    @classmethod
+    async def load(cls, guild_id: int) -> "EarningsSnapshot":
+        path = settings.get_guild_earnings_path(guild_id)
+        fingerprint = file_handlers.get_file_fingerprint(path)
+        data = await file_handlers.load_json(path, {})
+        return cls(guild_id, data, fingerprint)
+
+    @property
+    def path(self) -> str:
+        return settings.get_guild_earnings_path(self.guild_id)
+
+    def is_current(self) -> bool:
+        """True if the earnings haven't been saved since this snapshot was taken"""
+        return file_handlers.get_file_fingerprint(self.path) == self.fingerprint
+
+    @property
+    def owners(self) -> Dict[str, str]:
+        """{sale_id: user_key}, built on first use"""
+        if self._owners is None:
+            self._owners = {
+                entry["id"]: user_key
+                for user_key, entries in self.data.items()
+                for entry in entries
+            }
+        return self._owners
+
+    def match(self, sale_ids: Optional[Iterable[str]] = None, user_keys: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+        """
+        Sales selected by ID and/or user.
+
+        Args:
+            sale_ids: Sale IDs to select; None selects every sale of user_keys
+            user_keys: Restrict to these users ('<@id>'); None means any user
+
+        Returns:
+            {user_key: [sale_id, ...]} for users with at least one match
+        """
+        users = set(user_keys) if user_keys is not None else None
+        matches: Dict[str, List[str]] = {}
+        if sale_ids is None:
+            for user_key in users or ():
+                ids = [entry["id"] for entry in self.data.get(user_key, [])]
+                if ids:
+                    matches[user_key] = ids
+            return matches
+
+        for sale_id in dict.fromkeys(sale_ids):
+            owner = self.owners.get(sale_id)
+            if owner is not None and (users is None or owner in users):
+                matches.setdefault(owner, []).append(sale_id)
+        return matches
+
+    async def remove(self, matches: Dict[str, List[str]]) -> bool:
+        """
+        Delete matched sales from the snapshot and from storage.
+
+        Only the owners' lists are rebuilt. In MongoDB the removed IDs become
+        tombstones in one bulk write (earnings_sync.mark_deleted), so other
+        copies pull the removal; the JSON file is written from the snapshot
+        without reading it again.
+
+        Args:
+            matches: Result of match()
+
+        Returns:
+            True if the removal was stored
+        """
+        removed_ids = [sale_id for ids in matches.values() for sale_id in ids]
+        for user_key, ids in matches.items():
+            id_set = set(ids)
+            self.data[user_key] = [entry for entry in self.data.get(user_key, []) if entry["id"] not in id_set]
+        for sale_id in removed_ids:
+            self.owners.pop(sale_id, None)
+
+        success = await file_handlers.delete_earnings_entries(self.path, self.data, removed_ids)
+        self.fingerprint = file_handlers.get_file_fingerprint(self.path)
+        return success
@@ -0,0 +1,196 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+
+from pymongo import ReturnDocument, UpdateOne
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from config import settings
+
+logger = logging.getLogger("xof_calculator.earnings_sync")
+
+# Added to earnings queries so tombstones of deleted entries are skipped
+ACTIVE_ENTRIES = {"deleted": {"$ne": True}}
+
+# Fields that describe where an entry is stored rather than the entry itself
+SYNC_FIELDS = ("_id", "guild_id", "updated_at", "deleted")
+
+# Pushes of one process must not interleave between diffing and saving the state
+_lock = threading.Lock()
+
+def entry_digest(user_mention: str, entry: Dict[str, Any]) -> str:
+    """Hash of an entry's content and owner, ignoring sync fields"""
+    content = {key: value for key, value in entry.items() if key not in SYNC_FIELDS}
+    content["user_mention"] = user_mention
+    return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+def load_state(guild_id: Any) -> Dict[str, Any]:
+    """
+    The guild's sync state.
+
+    "watermark" is the highest change sequence known to be reflected in the
+    local file; "digests" maps each entry ID to its digest as last synced.
+    """
+    try:
+        with open(settings.get_guild_earnings_sync_path(guild_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {"watermark": 0, "digests": {}}
+
+def save_state(guild_id: Any, state: Dict[str, Any]):
+    path = settings.get_guild_earnings_sync_path(guild_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(temp_path, path)
+
+def _reserve_sequence(db, guild_id: str, count: int) -> int:
+    """Reserve count change sequence numbers and return the last one"""
+    counter = db["earnings_sync"].find_one_and_update(
+        {"guild_id": guild_id},
+        {"$inc": {"seq": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return counter["seq"]
+
+def _write_changes(db, guild_id: str, state: Dict[str, Any], changed: List[tuple], deleted: List[str]) -> int:
+    count = len(changed) + len(deleted)
+    if not count:
+        return 0
+    last = _reserve_sequence(db, guild_id, count)
+    first = last - count + 1
+
+    operations = []
+    for seq, (user_mention, entry) in enumerate(changed, start=first):
+        document = {key: value for key, value in entry.items() if key != "_id"}
+        document.update(user_mention=user_mention, guild_id=guild_id, updated_at=seq, deleted=False)
+        operations.append(UpdateOne({"id": entry["id"], "guild_id": guild_id}, {"$set": document}, upsert=True))
+    for seq, entry_id in enumerate(deleted, start=first + len(changed)):
+        operations.append(UpdateOne({"id": entry_id, "guild_id": guild_id}, {"$set": {"deleted": True, "updated_at": seq}}))
+    db["earnings"].bulk_write(operations, ordered=False)
+
+    # Only advance past our own changes if nobody else wrote since the last sync;
+    # otherwise the next pull fetches theirs (and harmlessly ours) first
+    if first == state["watermark"] + 1:
+        state["watermark"] = last
+    return count
+
+def push_changes(db, guild_id: Any, data: Dict[str, List[Dict[str, Any]]]) -> int:
+    """
+    Write entries added, edited or removed since the last sync.
+
+    Local changes are found by comparing entry digests with the sync state.
+    Each change gets the next number of the guild's change sequence as
+    updated_at; removed entries are kept as tombstones so other copies
+    learn about the removal. Everything goes out in one bulk_write.
+
+    Args:
+        db: MongoDB database
+        guild_id: Guild of the earnings
+        data: The guild's complete earnings, grouped by user_mention
+
+    Returns:
+        Number of changes written
+    """
+    guild_id = str(guild_id)
+    with _lock:
+        state = load_state(guild_id)
+        digests = state["digests"]
+        current = {}
+        changed = []
+        for user_mention, entries in data.items():
+            for entry in entries:
+                digest = entry_digest(user_mention, entry)
+                current[entry["id"]] = digest
+                if digests.get(entry["id"]) != digest:
+                    changed.append((user_mention, entry))
+        deleted = [entry_id for entry_id in digests if entry_id not in current]
+
+        count = _write_changes(db, guild_id, state, changed, deleted)
+        if count:
+            state["digests"] = current
+            save_state(guild_id, state)
+        return count
+
+def mark_deleted(db, guild_id: Any, entry_ids: Iterable[str]) -> int:
+    """
+    Replace removed entries with tombstones without diffing the whole ledger.
+
+    Returns:
+        Number of tombstones written
+    """
+    guild_id = str(guild_id)
+    with _lock:
+        state = load_state(guild_id)
+        entry_ids = list(dict.fromkeys(entry_ids))
+        count = _write_changes(db, guild_id, state, [], entry_ids)
+        for entry_id in entry_ids:
+            state["digests"].pop(entry_id, None)
+        save_state(guild_id, state)
+        return count
+
+def pull_changes(
+    db,
+    guild_id: Any,
+    data: Dict[str, List[Dict[str, Any]]],
+    prepare: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None
+) -> Tuple[int, Dict[str, Any]]:
+    """
+    Apply changes newer than the watermark to local earnings.
+
+    Changes stream through a cursor in sequence order, batch_size
+    EARNINGS_SYNC_BATCH_SIZE. Without a sync state everything is pulled,
+    including legacy documents that have no updated_at. The sync state is
+    not saved here: it must only advance once the local file is written.
+
+    Args:
+        db: MongoDB database
+        guild_id: Guild of the earnings
+        data: Local earnings, grouped by user_mention; updated in place
+        prepare: Optional function normalising a pulled entry, or returning
+            None to leave the local copy alone
+
+    Returns:
+        Number of changes applied, and the new sync state for save_state
+    """
+    guild_id = str(guild_id)
+    with _lock:
+        state = load_state(guild_id)
+        query: Dict[str, Any] = {"guild_id": guild_id}
+        if state["watermark"]:
+            query["updated_at"] = {"$gt": state["watermark"]}
+        cursor = db["earnings"].find(query, {"_id": 0}).sort("updated_at", 1).batch_size(settings.EARNINGS_SYNC_BATCH_SIZE)
+
+        # {entry_id: entry or None for a removal}; later changes replace earlier ones
+        updates: Dict[str, Optional[Dict[str, Any]]] = {}
+        for document in cursor:
+            state["watermark"] = max(state["watermark"], document.get("updated_at", 0))
+            entry = None
+            if not document.get("deleted"):
+                entry = {key: value for key, value in document.items() if key not in ("updated_at", "deleted")}
+                if prepare is not None:
+                    entry = prepare(entry)
+                    if entry is None:
+                        continue
+            updates.pop(document["id"], None)
+            updates[document["id"]] = entry
+
+        if updates:
+            for user_mention in list(data):
+                entries = data[user_mention]
+                if any(entry["id"] in updates for entry in entries):
+                    data[user_mention] = [entry for entry in entries if entry["id"] not in updates]
+                    if not data[user_mention]:
+                        del data[user_mention]
+            for entry_id, entry in updates.items():
+                state["digests"].pop(entry_id, None)
+                if entry is None:
+                    continue
+                user_mention = entry.get("user_mention", "unknown_sender")
+                data.setdefault(user_mention, []).append(entry)
+                state["digests"][entry_id] = entry_digest(user_mention, entry)
+
+        return len(updates), state
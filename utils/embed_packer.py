@@ -0,0 +1,163 @@
+import logging
+import discord
+
+from typing import Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("xof_calculator.embed_packer")
+
+# Discord limits
+MAX_FIELDS_PER_EMBED = 25
+MAX_FIELD_NAME = 256
+MAX_FIELD_VALUE = 1024
+MAX_TITLE = 256
+MAX_FOOTER = 2048
+MAX_EMBED_CHARS = 6000  # Also the combined limit for all embeds in one message
+MAX_EMBEDS_PER_MESSAGE = 10
+
+# Characters kept free on every message for a "Page x/y" style footer
+FOOTER_RESERVE = 80
+
+Field = Tuple[str, str, bool]
+
+def field_length(name: str, value: str) -> int:
+    """Characters a field counts towards the embed limit"""
+    return len(name) + len(value)
+
+def group_lines(line_lengths: Sequence[int], overhead: int, limit: int = MAX_FIELD_VALUE) -> List[int]:
+    """
+    Greedily group text lines into field values.
+
+    Args:
+        line_lengths: Length of each line, including its newline
+        overhead: Fixed characters every field value carries (header, code fences)
+        limit: Maximum length of a field value
+
+    Returns:
+        Number of lines in each field, in order
+
+    Raises:
+        ValueError: If a single line can't fit in a field
+    """
+    counts = []
+    current, used = 0, overhead
+    for length in line_lengths:
+        if overhead + length > limit:
+            raise ValueError(f"Line of {length} characters can't fit in a {limit} character field")
+        if current and used + length > limit:
+            counts.append(current)
+            current, used = 0, overhead
+        current += 1
+        used += length
+    if current:
+        counts.append(current)
+    return counts
+
+def layout(field_lengths: Sequence[int], title_length: int = 0, footer_reserve: int = FOOTER_RESERVE) -> List[List[int]]:
+    """
+    Bin-pack fields, in order, into embeds and messages.
+
+    Each message carries the title once and a footer; fields fill embeds of
+    at most MAX_FIELDS_PER_EMBED fields, and embeds fill messages of at most
+    MAX_EMBEDS_PER_MESSAGE embeds whose combined length stays within
+    MAX_EMBED_CHARS.
+
+    Args:
+        field_lengths: Length of each field (name + value)
+        title_length: Length of the title shown on each message
+        footer_reserve: Characters reserved for the footer of each message
+
+    Returns:
+        For every message, the number of fields in each of its embeds
+
+    Raises:
+        ValueError: If a single field can't fit in a message
+    """
+    base = min(title_length, MAX_TITLE) + footer_reserve
+    messages: List[List[int]] = []
+    embeds: List[int] = []
+    used = base
+
+    for length in field_lengths:
+        if base + length > MAX_EMBED_CHARS:
+            raise ValueError(f"Field of {length} characters can't fit in a message")
+
+        fits_message = used + length <= MAX_EMBED_CHARS
+        needs_embed = not embeds or embeds[-1] >= MAX_FIELDS_PER_EMBED
+        if not fits_message or (needs_embed and len(embeds) >= MAX_EMBEDS_PER_MESSAGE):
+            messages.append(embeds)
+            embeds, used = [], base
+            needs_embed = True
+
+        if needs_embed:
+            embeds.append(0)
+        embeds[-1] += 1
+        used += length
+
+    if embeds:
+        messages.append(embeds)
+    return messages
+
+def build_messages(
+    fields: Sequence[Field],
+    new_embed: Callable[[int], discord.Embed],
+    plan: Optional[List[List[int]]] = None,
+    footer_reserve: int = FOOTER_RESERVE
+) -> List[List[discord.Embed]]:
+    """
+    Build embeds for fields packed by character budget.
+
+    Args:
+        fields: (name, value, inline) tuples
+        new_embed: Factory called with the message index; the embed it returns
+            starts each message (its title counts towards the budget, and it
+            must return the same title for every index above 0)
+        plan: Optional precomputed layout for these fields
+        footer_reserve: Characters reserved for the footer of each message
+
+    Returns:
+        List of messages, each a list of embeds
+    """
+    if plan is None:
+        # Later messages may carry a longer title (e.g. "... (continued)")
+        title_length = max(len(new_embed(0).title or ""), len(new_embed(1).title or ""))
+        plan = layout([field_length(name, value) for name, value, _ in fields], title_length, footer_reserve)
+
+    messages = []
+    position = 0
+    for message_index, embed_counts in enumerate(plan):
+        embeds = []
+        for embed_index, count in enumerate(embed_counts):
+            if embed_index == 0:
+                embed = new_embed(message_index)
+            else:
+                # Follow-on embeds share the first one's color and read as one card
+                embed = discord.Embed(color=embeds[0].color)
+            for name, value, inline in fields[position:position + count]:
+                embed.add_field(name=name, value=value, inline=inline)
+            position += count
+            embeds.append(embed)
+        messages.append(embeds)
+    return messages
+
+def check_message(embeds: Sequence[discord.Embed]):
+    """
+    Verify a message's embeds respect every Discord limit.
+
+    Raises:
+        ValueError: Describing the first limit exceeded
+    """
+    if len(embeds) > MAX_EMBEDS_PER_MESSAGE:
+        raise ValueError(f"{len(embeds)} embeds in one message")
+    total = sum(len(embed) for embed in embeds)
+    if total > MAX_EMBED_CHARS:
+        raise ValueError(f"{total} characters in one message")
+    for embed in embeds:
+        if len(embed.fields) > MAX_FIELDS_PER_EMBED:
+            raise ValueError(f"{len(embed.fields)} fields in one embed")
+        if embed.title and len(embed.title) > MAX_TITLE:
+            raise ValueError(f"Title of {len(embed.title)} characters")
+        if embed.footer.text and len(embed.footer.text) > MAX_FOOTER:
+            raise ValueError(f"Footer of {len(embed.footer.text)} characters")
+        for field in embed.fields:
+            if len(field.name) > MAX_FIELD_NAME or len(field.value) > MAX_FIELD_VALUE:
+                raise ValueError(f"Field of {len(field.name)}/{len(field.value)} characters")
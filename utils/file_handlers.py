@@ -8,9 +8,11 @@ import aiofiles
 import inspect
 
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
+from itertools import islice
+from typing import AsyncIterator, Dict, Iterable, List, Any, Optional, Tuple, Union
+from utils import earnings_sync
 from utils.db import get_current_mongo_client
-from config.settings import MONGO_COLLECTION_MAPPING
+from config.settings import EARNINGS_CURSOR_BATCH_SIZE, MONGO_COLLECTION_MAPPING, get_guild_earnings_path, get_guild_file
 
 logger = logging.getLogger("xof_calculator.file_handlers")
 
@@ -26,6 +28,33 @@ async def get_file_lock(filename: str) -> asyncio.Lock:
         _file_locks[filename] = asyncio.Lock()
     return _file_locks[filename]
 
+# Saves made through this module per file, so caches can tell when data changed
+_write_versions: Dict[str, int] = {}
+
+def get_write_version(filename: str) -> int:
+    """Number of times a file has been saved by this process"""
+    return _write_versions.get(filename, 0)
+
+def get_file_fingerprint(filename: str) -> tuple:
+    """
+    Identify the current contents of a file without reading it.
+
+    Combines saves made by this process with the file's modification time
+    and size, so copies and restores done outside save_json are noticed too.
+
+    Args:
+        filename: Path to the file
+
+    Returns:
+        Hashable fingerprint that changes whenever the file does
+    """
+    try:
+        stat = os.stat(filename)
+        on_disk = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        on_disk = None
+    return (get_write_version(filename), on_disk)
+
 def normalize_date_format(date_str: str) -> str:
     """
     Normalize the date format to dd/mm/yyyy.
@@ -66,22 +95,9 @@ async def load_json(filename: str, default: Optional[Union[Dict, List]] = None)
             db = client.get_database()
 
             if collection_name == "earnings":
-                data = list(db[collection_name].find({"guild_id": str(guild_id)}))
-                for entry in data:
-                    entry.pop("_id", None)
-                    entry["models"] = entry["models"] if isinstance(entry["models"], list) else [entry["models"]]
-                    try:
-                        entry["date"] = normalize_date_format(entry["date"])
-                    except ValueError as e:
-                        logger.error(f"Skipping entry with invalid date: {entry}. Error: {e}")
-                        continue
-
                 earnings_dict = {}
-                for entry in data:
-                    user_mention = entry.get("user_mention", "unknown_sender")
-                    if user_mention not in earnings_dict:
-                        earnings_dict[user_mention] = []
-                    earnings_dict[user_mention].append(entry)
+                async for user_mention, entry in _iter_mongo_earnings(db, guild_id):
+                    earnings_dict.setdefault(user_mention, []).append(entry)
 
                 if earnings_dict:
                     logger.info(f"Data successfully loaded from MongoDB collection: {collection_name}")
@@ -105,6 +121,107 @@ async def load_json(filename: str, default: Optional[Union[Dict, List]] = None)
 
     return await load_json_from_file(filename, default)
 
+def _prepare_earnings_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    if "models" in entry:
+        entry["models"] = entry["models"] if isinstance(entry["models"], list) else [entry["models"]]
+    if "date" in entry:
+        try:
+            entry["date"] = normalize_date_format(entry["date"])
+        except ValueError as e:
+            logger.error(f"Earnings entry {entry.get('id')} has an invalid date: {e}")
+    return entry
+
+async def _iter_mongo_earnings(
+    db,
+    guild_id: str,
+    fields: Optional[Iterable[str]] = None,
+    user_mention: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    query = {"guild_id": str(guild_id), **earnings_sync.ACTIVE_ENTRIES}
+    if user_mention is not None:
+        query["user_mention"] = user_mention
+    projection = {"_id": 0}
+    if fields is not None:
+        projection.update({field: 1 for field in fields}, user_mention=1)
+
+    cursor = db["earnings"].find(query, projection).batch_size(EARNINGS_CURSOR_BATCH_SIZE)
+    try:
+        while True:
+            # Each batch is fetched off the event loop; rows are handed out as it arrives
+            batch = await asyncio.to_thread(lambda: list(islice(cursor, EARNINGS_CURSOR_BATCH_SIZE)))
+            if not batch:
+                return
+            for entry in batch:
+                yield entry.get("user_mention", "unknown_sender"), _prepare_earnings_entry(entry)
+    finally:
+        cursor.close()
+
+async def iter_earnings(
+    guild_id: Union[int, str],
+    fields: Optional[Iterable[str]] = None,
+    user_mention: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Stream a guild's earnings entries.
+
+    With MongoDB the entries come through a cursor in batches of
+    EARNINGS_CURSOR_BATCH_SIZE, so consumers can process rows as they
+    arrive instead of holding every document at once. Like load_json, it
+    falls back to the JSON file when MongoDB is unavailable, fails or has no
+    entries for the guild, even when only one user's entries are requested.
+
+    Args:
+        guild_id: Guild of the earnings
+        fields: Optional entry fields to fetch; every field when None
+        user_mention: Optional user ('<@id>') to restrict to
+
+    Yields:
+        (user_mention, entry) pairs
+    """
+    fields = list(fields) if fields is not None else None
+    try:
+        db = get_current_mongo_client().get_database()
+    except RuntimeError:
+        db = None
+
+    if db is not None:
+        found = False
+        try:
+            async for row in _iter_mongo_earnings(db, guild_id, fields, user_mention):
+                found = True
+                yield row
+            if not found and user_mention is not None:
+                # The user has no entries, but the file is only a fallback for the whole guild
+                found = await asyncio.to_thread(
+                    db["earnings"].find_one, {"guild_id": str(guild_id), **earnings_sync.ACTIVE_ENTRIES}, {"_id": 1}
+                ) is not None
+        except Exception as e:
+            if found:
+                raise
+            logger.error(f"Error streaming earnings from MongoDB for guild_id {guild_id}: {e}")
+        if found:
+            return
+
+    data = await load_json_from_file(get_guild_earnings_path(guild_id), {})
+    for owner, entries in data.items():
+        if user_mention is not None and owner != user_mention:
+            continue
+        for entry in entries:
+            if fields is not None:
+                entry = {field: entry[field] for field in fields if field in entry}
+            yield owner, entry
+
+async def load_earnings(
+    guild_id: Union[int, str],
+    fields: Optional[Iterable[str]] = None,
+    user_mention: Optional[str] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Earnings grouped by user_mention, built from iter_earnings"""
+    earnings_data: Dict[str, List[Dict[str, Any]]] = {}
+    async for owner, entry in iter_earnings(guild_id, fields, user_mention):
+        earnings_data.setdefault(owner, []).append(entry)
+    return earnings_data
+
 async def load_json_from_file(filename: str, default: Optional[Union[Dict, List]] = None) -> Union[Dict, List]:
     """
     Safely load a JSON file
@@ -156,6 +273,45 @@ async def load_json_from_file(filename: str, default: Optional[Union[Dict, List]
             logger.error(f"Unexpected error loading {file_path}: {e}")
             return default
         
+def _find_guild_config(guild_id: str, fields: List[str]) -> Optional[Dict]:
+    client = get_current_mongo_client()
+    return client.get_database()["guild_configs"].find_one({"guild_id": guild_id}, {field: 1 for field in fields})
+
+async def load_guild_configs(guild_id: Union[int, str], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load several of a guild's config files in one go.
+
+    With MongoDB this is a single guild_configs lookup projected to the
+    requested fields; otherwise the files are read concurrently. Missing
+    data falls back to the defaults, as with load_json.
+
+    Args:
+        guild_id: Guild to load
+        defaults: {filename: default}, e.g. {"display_settings.json": {...}};
+            every filename must be in MONGO_COLLECTION_MAPPING
+
+    Returns:
+        {filename: data}
+    """
+    filenames = list(defaults)
+    fields = {filename: MONGO_COLLECTION_MAPPING[filename] for filename in filenames}
+
+    try:
+        guild_config = await asyncio.to_thread(_find_guild_config, str(guild_id), list(fields.values()))
+        if not guild_config:
+            logger.warning(f"No guild configuration found for guild_id: {guild_id}")
+            guild_config = {}
+        return {filename: guild_config.get(fields[filename], defaults[filename]) for filename in filenames}
+    except RuntimeError:
+        pass # No MongoDB client for this bot instance
+    except Exception as e:
+        logger.error(f"Error loading guild configuration from MongoDB for guild {guild_id}: {e}")
+
+    results = await asyncio.gather(*(
+        load_json_from_file(get_guild_file(guild_id, filename), defaults[filename]) for filename in filenames
+    ))
+    return dict(zip(filenames, results))
+
 async def save_json(filename: str, data: Union[Dict, List], pretty: bool = True, make_backup: bool = True) -> bool:
     """
     Save data to both a JSON file and MongoDB if applicable.
@@ -179,11 +335,8 @@ async def save_json(filename: str, data: Union[Dict, List], pretty: bool = True,
                             entry["guild_id"] = guild_id
                             entry["models"] = entry["models"] if isinstance(entry["models"], list) else [entry["models"]]
 
-                            db[collection_name].update_one(
-                                {"id": entry["id"], "guild_id": guild_id},
-                                {"$set": entry},
-                                upsert=True
-                            )
+                    # Only entries changed since the last sync are written
+                    await asyncio.to_thread(earnings_sync.push_changes, db, guild_id, data)
                     db_success = True
                 else:
                     logger.error("Invalid data type for earnings. Expected a dictionary grouped by user_mention.") 
@@ -208,6 +361,43 @@ async def save_json(filename: str, data: Union[Dict, List], pretty: bool = True,
 
     return db_success or file_success
 
+async def delete_earnings_entries(filename: str, data: Dict[str, List], entry_ids: List[str]) -> bool:
+    """
+    Store the removal of earnings entries.
+
+    MongoDB gets one bulk write turning the entries into tombstones (see
+    earnings_sync) instead of an upsert of every remaining entry; the file
+    is written from data, which must already have the entries removed.
+
+    Args:
+        filename: Path to the guild's earnings file
+        data: Earnings without the removed entries
+        entry_ids: IDs of the removed entries
+
+    Returns:
+        True if the removal was stored in MongoDB or the file
+    """
+    guild_id = os.path.basename(os.path.dirname(filename))
+
+    db_success = False
+    try:
+        db = get_current_mongo_client().get_database()
+        removed = await asyncio.to_thread(earnings_sync.mark_deleted, db, guild_id, entry_ids)
+        logger.info(f"Removed {removed} earnings entries from MongoDB for guild_id: {guild_id}")
+        db_success = True
+    except RuntimeError:
+        pass # No MongoDB client for this bot instance
+    except Exception as e:
+        logger.error(f"Error removing earnings entries from MongoDB: {e}")
+
+    file_success = False
+    try:
+        file_success = await save_json_to_file(filename, data)
+    except Exception as e:
+        logger.error(f"Error saving data to file: {filename}: {e}")
+
+    return db_success or file_success
+
 async def save_json_to_file(filename: str, data: Union[Dict, List], pretty: bool = True, make_backup: bool = True) -> bool:
     """
     Safely save data to a JSON file with atomic write operations
@@ -226,14 +416,22 @@ async def save_json_to_file(filename: str, data: Union[Dict, List], pretty: bool
     lock = await get_file_lock(file_path)
     
     async with lock:
+        _write_versions[file_path] = _write_versions.get(file_path, 0) + 1
         try:
             # Create parent directory if it doesn't exist
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             
-            # Create backup of existing file
+            # Create backup of existing file. A hard link shares the old
+            # contents instead of copying them; os.replace below points the
+            # file at new contents and leaves the link holding the old ones.
             if os.path.exists(file_path) and make_backup:
                 try:
-                    shutil.copy2(file_path, backup_path)
+                    try:
+                        if os.path.lexists(backup_path):
+                            os.remove(backup_path)
+                        os.link(file_path, backup_path)
+                    except OSError:
+                        shutil.copy2(file_path, backup_path)
                 except Exception as backup_error:
                     logger.warning(f"Failed to create backup of {file_path}: {backup_error}")
             
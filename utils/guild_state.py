@@ -0,0 +1,47 @@
+import copy
+import logging
+
+from typing import Any, Dict, List, NamedTuple
+from config import settings
+from utils import clock_store, file_handlers
+
+logger = logging.getLogger("xof_calculator.guild_state")
+
+DISPLAY_FILE = "display_settings.json"
+CLOCK_FILE = "clock_data.json"
+
+class GuildState(NamedTuple):
+    """Display settings and clock data of a guild, read together once per command"""
+    guild_id: int
+    display: Dict[str, Any]
+    clock: Dict[str, Any]
+
+    @property
+    def ephemeral(self) -> bool:
+        return self.display.get("ephemeral_responses", True)
+
+    @property
+    def clock_settings(self) -> Dict[str, Any]:
+        return self.clock.get("settings", {})
+
+    @property
+    def manager_role_ids(self) -> List[str]:
+        return self.clock_settings.get("bonus_penalty_manager_roles", [])
+
+async def load(guild_id: int) -> GuildState:
+    """
+    Read a guild's display settings and clock data in one go.
+
+    With MongoDB this is one guild_configs lookup; with files both are read
+    concurrently. Clock data still comes from the write buffer when one is
+    active.
+
+    Returns:
+        A snapshot the caller may mutate; write changes through clock_store
+    """
+    configs = await file_handlers.load_guild_configs(guild_id, {
+        DISPLAY_FILE: copy.deepcopy(settings.DEFAULT_DISPLAY_SETTINGS),
+        CLOCK_FILE: copy.deepcopy(settings.DEFAULT_CLOCK_DATA),
+    })
+    clock = await clock_store.load_from(guild_id, configs[CLOCK_FILE])
+    return GuildState(guild_id, configs[DISPLAY_FILE], clock)
@@ -0,0 +1,247 @@
+import time
+import heapq
+import asyncio
+import logging
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from config import settings
+from utils import earnings_sync, file_handlers
+from utils.db import get_current_mongo_client
+from utils.summaries import ENTRY_FIELDS, _parse_date, _to_float
+
+logger = logging.getLogger("xof_calculator.leaderboard")
+
+# Ranking metrics and their display names
+METRICS = {
+    "gross": "Gross Revenue",
+    "cut": "Chatter Cut",
+    "hours": "Hours Worked",
+    "count": "Sales",
+    "rph": "Revenue per Hour",
+}
+
+# Named windows; "custom" takes explicit dates
+WINDOWS = ("week", "30d", "all", "custom")
+
+# {(guild_id, metric, limit, from_date, to_date): (version, cached_at, result)}, most recently used last
+_cache: "OrderedDict[tuple, Tuple[tuple, float, Dict[str, Any]]]" = OrderedDict()
+
+def resolve_window(
+    window: str,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None,
+    today: Optional[datetime] = None
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Turn a named window into an inclusive date range.
+
+    Args:
+        window: One of WINDOWS
+        from_date: Start date for the "custom" window
+        to_date: End date for the "custom" window
+        today: Reference day, defaults to the current date
+
+    Returns:
+        (from_date, to_date); None means unbounded
+    """
+    today = (today or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    if window == "week":
+        return today - timedelta(days=today.weekday()), today
+    if window == "30d":
+        return today - timedelta(days=29), today
+    if window == "all":
+        return None, None
+    if window == "custom":
+        return from_date, to_date
+    raise ValueError(f"Unknown leaderboard window: {window}")
+
+def _rate(gross: float, hours: float) -> float:
+    return gross / hours if hours > 0 else 0.0
+
+def build_leaderboard_pipeline(
+    guild_id: int,
+    metric: str,
+    limit: int,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Build the aggregation pipeline ranking users by a metric.
+
+    Entries are grouped per user server-side, then sorted and limited, so
+    only the top rows and the participant count leave the database.
+
+    Args:
+        guild_id: Guild to rank
+        metric: One of METRICS
+        limit: Number of users to return
+        from_date: Optional inclusive start date
+        to_date: Optional inclusive end date
+
+    Returns:
+        Pipeline producing one document with "top" and "meta" facets
+    """
+    pipeline: List[Dict[str, Any]] = [{"$match": {"guild_id": str(guild_id), **earnings_sync.ACTIVE_ENTRIES}}]
+
+    if from_date or to_date:
+        pipeline.append({"$addFields": {"_parsed_date": {"$dateFromString": {
+            "dateString": "$date",
+            "format": "%d/%m/%Y",
+            "onError": {"$dateFromString": {"dateString": "$date", "onError": None}}
+        }}}})
+        date_match: Dict[str, Any] = {}
+        if from_date:
+            date_match["$gte"] = from_date
+        if to_date:
+            date_match["$lte"] = to_date
+        pipeline.append({"$match": {"_parsed_date": date_match}})
+
+    pipeline.append({"$group": {
+        "_id": "$user_mention",
+        "count": {"$sum": 1},
+        "gross": {"$sum": {"$convert": {"input": "$gross_revenue", "to": "double", "onError": 0, "onNull": 0}}},
+        "cut": {"$sum": {"$convert": {"input": "$total_cut", "to": "double", "onError": 0, "onNull": 0}}},
+        "hours": {"$sum": {"$convert": {"input": "$hours_worked", "to": "double", "onError": 0, "onNull": 0}}},
+    }})
+    if metric == "rph":
+        pipeline.append({"$addFields": {"rph": {
+            "$cond": [{"$gt": ["$hours", 0]}, {"$divide": ["$gross", "$hours"]}, 0]
+        }}})
+
+    pipeline.append({"$facet": {
+        "top": [{"$sort": {metric: -1, "_id": 1}}, {"$limit": limit}],
+        "meta": [{"$count": "users"}],
+    }})
+    return pipeline
+
+def _run_pipeline(pipeline: List[Dict[str, Any]]) -> Dict[str, Any]:
+    db = get_current_mongo_client().get_database()
+    result = next(db["earnings"].aggregate(pipeline), {})
+    rows = [
+        {
+            "user": doc["_id"],
+            "count": doc["count"],
+            "gross": doc["gross"],
+            "cut": doc["cut"],
+            "hours": doc["hours"],
+            "rph": _rate(doc["gross"], doc["hours"]),
+        }
+        for doc in result.get("top", [])
+    ]
+    meta = result.get("meta") or []
+    return {"rows": rows, "users": meta[0]["users"] if meta else 0}
+
+def add_user_entry(
+    rollups: Dict[str, Dict[str, Any]],
+    sender: str,
+    entry: Dict[str, Any],
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None
+):
+    """
+    Fold one entry into its user's running totals.
+
+    Args:
+        rollups: {user_mention: row}, updated in place; users only appear
+            once they have an entry in the date range
+        sender: User mention the entry belongs to
+        entry: Earnings entry
+        from_date, to_date: As in build_leaderboard_pipeline
+    """
+    if from_date or to_date:
+        entry_date = _parse_date(entry.get("date"))
+        if entry_date is None or (from_date and entry_date < from_date) or (to_date and entry_date > to_date):
+            return
+    row = rollups.get(sender)
+    if row is None:
+        row = rollups[sender] = {"user": sender, "count": 0, "gross": 0.0, "cut": 0.0, "hours": 0.0}
+    row["count"] += 1
+    row["gross"] += _to_float(entry.get("gross_revenue"))
+    row["cut"] += _to_float(entry.get("total_cut"))
+    row["hours"] += _to_float(entry.get("hours_worked"))
+
+def top_users(rollups: Dict[str, Dict[str, Any]], metric: str, limit: int) -> Dict[str, Any]:
+    """
+    Local equivalent of the leaderboard pipeline's result.
+
+    Entries are folded into one running total per user by add_user_entry as
+    they are read, and the top users are picked with a bounded heap, so
+    neither a per-entry list nor a full sort is built.
+
+    Args:
+        rollups: Per-user totals built by add_user_entry
+        metric, limit: As in build_leaderboard_pipeline
+
+    Returns:
+        {"rows": [row, ...], "users": participants} where each row has user,
+        count, gross, cut, hours and rph
+    """
+    for row in rollups.values():
+        row["rph"] = _rate(row["gross"], row["hours"])
+    top = heapq.nsmallest(limit, rollups.values(), key=lambda row: (-row[metric], row["user"]))
+    return {"rows": top, "users": len(rollups)}
+
+async def leaderboard(
+    guild_id: int,
+    metric: str = "gross",
+    limit: int = 10,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Rank a guild's users by an earnings metric.
+
+    Results are cached per guild, metric, size and date range. A cached
+    result is reused until the earnings are saved again (or the file changes
+    on disk), and for at most LEADERBOARD_CACHE_TTL seconds to pick up writes
+    made by other processes.
+
+    Args:
+        guild_id: Guild to rank
+        metric: One of METRICS
+        limit: Number of users to return, at most LEADERBOARD_MAX_SIZE
+        from_date: Optional inclusive start date
+        to_date: Optional inclusive end date
+
+    Returns:
+        {"rows": [row, ...], "users": participants} where each row has user,
+        count, gross, cut, hours and rph
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown leaderboard metric: {metric}")
+    limit = max(1, min(limit, settings.LEADERBOARD_MAX_SIZE))
+
+    key = (guild_id, metric, limit, from_date, to_date)
+    version = file_handlers.get_file_fingerprint(settings.get_guild_earnings_path(guild_id))
+    cached = _cache.get(key)
+    if cached and cached[0] == version and time.monotonic() - cached[1] < settings.LEADERBOARD_CACHE_TTL:
+        _cache.move_to_end(key)
+        return cached[2]
+
+    result = None
+    try:
+        get_current_mongo_client()
+        use_mongo = True
+    except RuntimeError:
+        use_mongo = False
+
+    if use_mongo:
+        pipeline = build_leaderboard_pipeline(guild_id, metric, limit, from_date, to_date)
+        try:
+            result = await asyncio.to_thread(_run_pipeline, pipeline)
+        except Exception as e:
+            logger.error(f"Leaderboard aggregation failed for guild {guild_id}, falling back to local ranking: {e}")
+
+    if result is None:
+        rollups: Dict[str, Dict[str, Any]] = {}
+        async for sender, entry in file_handlers.iter_earnings(guild_id, ENTRY_FIELDS):
+            add_user_entry(rollups, sender, entry, from_date, to_date)
+        result = top_users(rollups, metric, limit)
+
+    _cache[key] = (version, time.monotonic(), result)
+    _cache.move_to_end(key)
+    while len(_cache) > settings.LEADERBOARD_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return result
@@ -0,0 +1,135 @@
+import re
+import asyncio
+import logging
+import discord
+
+from typing import Dict, Iterable, NamedTuple, Optional, Union
+from collections import OrderedDict
+from config import settings
+from utils.db import get_current_mongo_client
+
+logger = logging.getLogger("xof_calculator.members")
+
+# Per-guild {user_id: (display_name, name)} of members seen before, most recently used last
+_known_names: Dict[int, "OrderedDict[int, tuple]"] = {}
+
+class MemberInfo(NamedTuple):
+    """Resolved member names; mirrors the discord.Member attributes reports use"""
+    id: int
+    display_name: str
+    name: str
+    present: bool
+
+    @property
+    def label(self) -> str:
+        """'Display Name (@username)' as shown in reports"""
+        return f"{self.display_name} (@{self.name})"
+
+def parse_user_id(user_key: Union[str, int]) -> Optional[int]:
+    """
+    Extract the numeric ID from an earnings user key such as '<@123>'.
+
+    Args:
+        user_key: Mention string or ID
+
+    Returns:
+        User ID, or None if the key holds no digits
+    """
+    if isinstance(user_key, int):
+        return user_key
+    match = re.search(r'\d+', str(user_key))
+    return int(match.group()) if match else None
+
+def _remember(guild_id: int, user_id: int, names: tuple):
+    """Record a member's names in the guild's LRU"""
+    cache = _known_names.setdefault(guild_id, OrderedDict())
+    cache[user_id] = names
+    cache.move_to_end(user_id)
+    while len(cache) > settings.DEPARTED_MEMBER_CACHE_SIZE:
+        cache.popitem(last=False)
+
+def _load_synced_names(guild_id: int, user_ids: list) -> Dict[int, tuple]:
+    """Look up names in the guild_members collection synced by admin_sync"""
+    try:
+        db = get_current_mongo_client().get_database()
+    except RuntimeError:
+        return {}
+
+    names = {}
+    cursor = db["guild_members"].find(
+        {"guild_id": str(guild_id), "id": {"$in": user_ids}},
+        {"_id": 0, "id": 1, "name": 1, "display_name": 1}
+    )
+    for doc in cursor:
+        user_id = parse_user_id(doc.get("id"))
+        if user_id is not None:
+            names[user_id] = (doc.get("display_name") or doc.get("name") or "Unknown", doc.get("name") or "unknown")
+    return names
+
+class MemberDirectory:
+    """
+    Members of one guild, resolved once per distinct user for a request.
+
+    Current members come from the gateway cache. Departed members fall back
+    to a per-guild LRU of names seen before, then to the guild_members
+    collection, so reports can still name them without fetch_user calls.
+    """
+
+    def __init__(self, guild: discord.Guild):
+        self.guild = guild
+        self._members: Dict[int, Optional[MemberInfo]] = {}
+
+    @classmethod
+    async def build(cls, guild: discord.Guild, user_keys: Iterable[Union[str, int]]) -> "MemberDirectory":
+        """
+        Resolve every distinct user key once.
+
+        Args:
+            guild: Guild the users belong to
+            user_keys: Earnings keys ('<@id>') or user IDs; duplicates are fine
+
+        Returns:
+            Populated MemberDirectory
+        """
+        directory = cls(guild)
+        cache = _known_names.get(guild.id, {})
+        missing = []
+
+        for user_id in {parse_user_id(key) for key in user_keys}:
+            if user_id is None:
+                continue
+            member = guild.get_member(user_id)
+            if member:
+                names = (member.display_name, member.name)
+                _remember(guild.id, user_id, names)
+                directory._members[user_id] = MemberInfo(user_id, *names, True)
+            elif user_id in cache:
+                directory._members[user_id] = MemberInfo(user_id, *cache[user_id], False)
+            else:
+                missing.append(user_id)
+
+        if missing:
+            try:
+                synced = await asyncio.to_thread(_load_synced_names, guild.id, missing)
+            except Exception as e:
+                logger.warning(f"Could not load departed member names for guild {guild.id}: {e}")
+                synced = {}
+            for user_id in missing:
+                names = synced.get(user_id)
+                if names:
+                    _remember(guild.id, user_id, names)
+                directory._members[user_id] = MemberInfo(user_id, *names, False) if names else None
+
+        return directory
+
+    def get(self, user_key: Union[str, int]) -> Optional[MemberInfo]:
+        """
+        Look up a resolved member.
+
+        Args:
+            user_key: Earnings key ('<@id>') or user ID
+
+        Returns:
+            MemberInfo, or None if the user is unknown
+        """
+        return self._members.get(parse_user_id(user_key))
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+from config import settings
+from utils import file_handlers
+from utils.summaries import _parse_date, _to_float, split_models
+
+logger = logging.getLogger("xof_calculator.model_index")
+
+# {guild_id: (earnings fingerprint the index matches, index)}
+_indexes: Dict[int, Tuple[tuple, "ModelIndex"]] = {}
+
+def _empty_rollup() -> Dict[str, float]:
+    return {"sales": 0, "share": 0.0, "gross": 0.0, "cut": 0.0, "hours": 0.0}
+
+def _credit(rollup: Dict[str, float], ref: "SaleRef", sign: int = 1):
+    rollup["sales"] += sign
+    rollup["share"] += sign * ref.share
+    rollup["gross"] += sign * ref.gross
+    rollup["cut"] += sign * ref.cut
+    rollup["hours"] += sign * ref.hours
+
+class SaleRef:
+    """A model's share of one sale"""
+    __slots__ = ("user", "date", "share", "gross", "cut", "hours")
+
+    def __init__(self, user: str, date: Optional[datetime], share: float, gross: float, cut: float, hours: float):
+        self.user = user
+        self.date = date
+        self.share = share
+        self.gross = gross
+        self.cut = cut
+        self.hours = hours
+
+class ModelIndex:
+    """
+    Inverted index from model name to the sales it took part in.
+
+    A sale with several models is split evenly between them: each model is
+    credited with an equal share of the gross revenue, chatter cut and hours,
+    so per-model figures add up to the guild's totals. Running per-model
+    rollups are kept alongside the references for all-time reports.
+    """
+
+    def __init__(self):
+        self.refs: Dict[str, Dict[str, SaleRef]] = {}
+        self.rollups: Dict[str, Dict[str, float]] = {}
+        self._entry_models: Dict[str, List[str]] = {}
+
+    def add(self, user: str, entry: Dict[str, Any]):
+        """Index one earnings entry"""
+        entry_id = entry.get("id")
+        if entry_id is None:
+            return
+        if entry_id in self._entry_models:
+            self.remove(entry_id)
+
+        models = split_models(entry.get("models")) or ["Unassigned"]
+        count = len(models)
+        date = _parse_date(entry.get("date"))
+        gross = _to_float(entry.get("gross_revenue")) / count
+        cut = _to_float(entry.get("total_cut")) / count
+        hours = _to_float(entry.get("hours_worked")) / count
+
+        for model in models:
+            ref = SaleRef(user, date, 1 / count, gross, cut, hours)
+            self.refs.setdefault(model, {})[entry_id] = ref
+            _credit(self.rollups.setdefault(model, _empty_rollup()), ref)
+        self._entry_models[entry_id] = models
+
+    def remove(self, entry_id: str) -> bool:
+        """Drop one earnings entry; returns False if it wasn't indexed"""
+        models = self._entry_models.pop(entry_id, None)
+        if models is None:
+            return False
+        for model in models:
+            ref = self.refs[model].pop(entry_id)
+            _credit(self.rollups[model], ref, -1)
+            if not self.refs[model]:
+                del self.refs[model]
+                del self.rollups[model]
+        return True
+
+    def models(self) -> List[str]:
+        """Indexed model names, alphabetically"""
+        return sorted(self.refs, key=str.lower)
+
+    def report(self, from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Per-model totals, optionally restricted to an inclusive date range.
+
+        Returns:
+            {model: {sales, share, gross, cut, hours}}
+        """
+        if not from_date and not to_date:
+            return {model: dict(rollup) for model, rollup in self.rollups.items()}
+
+        report = {}
+        for model, refs in self.refs.items():
+            rollup = _empty_rollup()
+            for ref in refs.values():
+                if _in_range(ref.date, from_date, to_date):
+                    _credit(rollup, ref)
+            if rollup["sales"]:
+                report[model] = rollup
+        return report
+
+    def contributors(self, model: str, from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Per-user totals for one model, optionally restricted to a date range.
+
+        Returns:
+            {user_mention: {sales, share, gross, cut, hours}}
+        """
+        users: Dict[str, Dict[str, float]] = {}
+        for ref in self.refs.get(model, {}).values():
+            if _in_range(ref.date, from_date, to_date):
+                _credit(users.setdefault(ref.user, _empty_rollup()), ref)
+        return users
+
+def _in_range(date: Optional[datetime], from_date: Optional[datetime], to_date: Optional[datetime]) -> bool:
+    if not from_date and not to_date:
+        return True
+    return date is not None and not (from_date and date < from_date) and not (to_date and date > to_date)
+
+def build_index(earnings_data: Dict[str, List[Dict[str, Any]]]) -> ModelIndex:
+    """Index every entry of a guild's earnings"""
+    index = ModelIndex()
+    for user, entries in earnings_data.items():
+        for entry in entries:
+            index.add(user, entry)
+    return index
+
+async def get_index(guild_id: int) -> ModelIndex:
+    """
+    Return the guild's model index, building it if the earnings changed
+    in a way the index wasn't told about.
+    """
+    path = settings.get_guild_earnings_path(guild_id)
+    fingerprint = file_handlers.get_file_fingerprint(path)
+    cached = _indexes.get(guild_id)
+    if cached and cached[0] == fingerprint:
+        return cached[1]
+
+    earnings_data = await file_handlers.load_json(path, {})
+    index = await asyncio.to_thread(build_index, earnings_data)
+    _indexes[guild_id] = (fingerprint, index)
+    logger.info(f"Built model index for guild {guild_id}: {len(index.refs)} models")
+    return index
+
+def apply_changes(
+    guild_id: int,
+    previous_fingerprint: tuple,
+    added: Iterable[Tuple[str, Dict[str, Any]]] = (),
+    removed_ids: Iterable[str] = ()
+):
+    """
+    Update a loaded index after earnings were saved.
+
+    If the index didn't match the earnings as they were right before the
+    save, it is dropped instead and rebuilt on next use.
+
+    Args:
+        guild_id: Guild whose earnings were saved
+        previous_fingerprint: get_file_fingerprint of the earnings taken before saving
+        added: (user_mention, entry) pairs that were added
+        removed_ids: IDs of entries that were removed
+    """
+    cached = _indexes.get(guild_id)
+    if not cached:
+        return
+    if cached[0] != previous_fingerprint:
+        del _indexes[guild_id]
+        return
+
+    index = cached[1]
+    for entry_id in removed_ids:
+        index.remove(entry_id)
+    for user, entry in added:
+        index.add(user, entry)
+    _indexes[guild_id] = (file_handlers.get_file_fingerprint(settings.get_guild_earnings_path(guild_id)), index)
@@ -0,0 +1,129 @@
+import logging
+
+from typing import Iterable, List, Optional, Sequence
+from xml.sax.saxutils import escape
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import LongTable, Paragraph, Spacer, TableStyle
+
+logger = logging.getLogger("xof_calculator.pdf_builder")
+
+PAGE_WIDTH = 468  # Standard letter width in points
+
+# Fixed column widths so reportlab doesn't measure every cell of every chunk
+DETAIL_COL_WIDTHS_ALL = [28, 118, 56, 58, 50, 36, 62, 60]
+DETAIL_COL_WIDTHS_USER = [30, 70, 80, 70, 50, 84, 84]
+
+# Matches the detail table body text, for cells that wrap within their fixed width
+DETAIL_CELL_STYLE = ParagraphStyle("DetailCell", fontName="Helvetica", fontSize=9, leading=11, alignment=TA_CENTER)
+
+DETAIL_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.grey),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0,0), (-1,0), 12),
+    ('BACKGROUND', (0,1), (-1,-1), colors.beige),
+    ('GRID', (0,0), (-1,-1), 1, colors.black),
+    ('FONTSIZE', (0,1), (-1,-1), 9),  # More readable body text
+    ('PADDING', (0,0), (-1,-1), 3),    # Cell padding
+    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'), # Vertical alignment
+])
+
+APPENDIX_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.grey),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('GRID', (0,0), (-1,-1), 1, colors.black),
+    ('FONTSIZE', (0,1), (-1,-1), 9),
+    ('PADDING', (0,0), (-1,-1), 3),
+    ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.whitesmoke, colors.beige])
+])
+
+def chunk_rows(rows: Sequence[List[str]], chunk_size: int) -> Iterable[Sequence[List[str]]]:
+    """Yield consecutive slices of at most chunk_size rows"""
+    for start in range(0, len(rows), chunk_size):
+        yield rows[start:start + chunk_size]
+
+def wrap_cell(text: str) -> Paragraph:
+    """A detail table cell that wraps long text instead of overflowing its column"""
+    return Paragraph(escape(text), DETAIL_CELL_STYLE)
+
+def build_detail_tables(
+    headers: List[str],
+    rows: Sequence[List[str]],
+    chunk_size: int,
+    col_widths: Optional[List[float]] = None
+) -> List[LongTable]:
+    """
+    Split detail rows into LongTable chunks with a repeated header row.
+
+    Reportlab re-measures the remainder of a table every time it splits it
+    across a page, so one huge table costs quadratic layout time. Bounded
+    chunks keep layout linear in the number of rows.
+
+    Args:
+        headers: Header row repeated on every chunk and page
+        rows: Table body rows
+        chunk_size: Maximum rows per LongTable
+        col_widths: Optional fixed column widths
+
+    Returns:
+        List of styled LongTable flowables
+    """
+    tables = []
+    for chunk in chunk_rows(rows, max(1, chunk_size)):
+        table = LongTable([headers] + list(chunk), colWidths=col_widths, repeatRows=1)
+        table.setStyle(DETAIL_TABLE_STYLE)
+        tables.append(table)
+    return tables
+
+def build_summary_appendix(
+    styles,
+    total_rows: int,
+    rendered_rows: int,
+    group_label: str,
+    group_totals: List[List[str]],
+    skipped_charts: Optional[List[str]] = None
+) -> list:
+    """
+    Build the appendix shown when a report exceeds its row or chart budget.
+
+    Args:
+        styles: Reportlab stylesheet
+        total_rows: Number of entries in the report
+        rendered_rows: Number of entries shown in the detailed table
+        group_label: Header for the grouping column (e.g. "User" or "Role")
+        group_totals: Rows of [group, entries, hours, gross, earnings]
+        skipped_charts: Names of users whose charts were left out
+
+    Returns:
+        List of flowables
+    """
+    elements = [Paragraph("Summary Appendix", styles["Heading2"]), Spacer(1, 6)]
+
+    if rendered_rows < total_rows:
+        elements.append(Paragraph(
+            f"The detailed table shows the first {rendered_rows:,} of {total_rows:,} entries. "
+            f"Export as CSV or Excel for the full ledger.",
+            styles["BodyText"]
+        ))
+        elements.append(Spacer(1, 6))
+
+    if skipped_charts:
+        elements.append(Paragraph(
+            f"Individual charts were omitted for {len(skipped_charts)} users: "
+            f"{', '.join(skipped_charts)}",
+            styles["BodyText"]
+        ))
+        elements.append(Spacer(1, 6))
+
+    headers = [group_label, "Entries", "Hours", "Gross Revenue", "Earnings"]
+    widths = [PAGE_WIDTH*0.36, PAGE_WIDTH*0.12, PAGE_WIDTH*0.14, PAGE_WIDTH*0.19, PAGE_WIDTH*0.19]
+    for table in build_detail_tables(headers, group_totals, 500, widths):
+        table.setStyle(APPENDIX_TABLE_STYLE)
+        elements.append(table)
+
+    return elements
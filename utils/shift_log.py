@@ -0,0 +1,180 @@
+import os
+import struct
+import asyncio
+import logging
+import aiofiles
+
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Optional
+from config import settings
+from utils.db import get_current_mongo_client
+
+logger = logging.getLogger("xof_calculator.shift_log")
+
+# user_id, start, end (Unix seconds), break seconds, overage seconds
+RECORD = struct.Struct("<QqqII")
+
+class Shift(NamedTuple):
+    """One completed shift"""
+    user_id: int
+    start: int
+    end: int
+    break_seconds: int
+    overage_seconds: int
+
+    @property
+    def worked_seconds(self) -> int:
+        return max(0, self.end - self.start - self.break_seconds)
+
+    @property
+    def hours_worked(self) -> float:
+        return self.worked_seconds / 3600
+
+class ShiftIndex:
+    """Shifts of one guild, sorted by start time, overall and per user"""
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.shifts: List[Shift] = []
+        self.user_starts: Dict[int, List[int]] = {}
+        self.user_shifts: Dict[int, List[Shift]] = {}
+
+    def add(self, shift: Shift):
+        for starts, shifts in ((self.starts, self.shifts), (self.user_starts.setdefault(shift.user_id, []), self.user_shifts.setdefault(shift.user_id, []))):
+            if not starts or shift.start >= starts[-1]:
+                # Shifts are logged as they end, so this is the common case
+                starts.append(shift.start)
+                shifts.append(shift)
+            else:
+                position = bisect_left(starts, shift.start)
+                starts.insert(position, shift.start)
+                shifts.insert(position, shift)
+
+    def query(self, user_id: Optional[int] = None, start: Optional[int] = None, end: Optional[int] = None) -> List[Shift]:
+        """
+        Shifts starting in [start, end), oldest first.
+
+        Args:
+            user_id: Optional user to restrict to
+            start: Optional inclusive lower bound (Unix seconds)
+            end: Optional exclusive upper bound (Unix seconds)
+        """
+        if user_id is None:
+            starts, shifts = self.starts, self.shifts
+        else:
+            starts, shifts = self.user_starts.get(user_id, []), self.user_shifts.get(user_id, [])
+        low = bisect_left(starts, start) if start is not None else 0
+        high = bisect_left(starts, end) if end is not None else len(starts)
+        return shifts[low:high]
+
+# {guild_id: index}, loaded on first use
+_indexes: Dict[int, ShiftIndex] = {}
+_load_locks: Dict[int, asyncio.Lock] = {}
+
+def _read_file(path: str) -> List[Shift]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        data = f.read()
+    usable = len(data) - len(data) % RECORD.size
+    if usable != len(data):
+        logger.warning(f"Ignoring {len(data) - usable} trailing bytes of a partial record in {path}")
+    return [Shift(*fields) for fields in RECORD.iter_unpack(data[:usable])]
+
+def _read_mongo(guild_id: int) -> Optional[List[Shift]]:
+    try:
+        db = get_current_mongo_client().get_database()
+    except RuntimeError:
+        return None
+    cursor = db["shift_logs"].find(
+        {"guild_id": str(guild_id)},
+        {"_id": 0, "user_id": 1, "start": 1, "end": 1, "break_seconds": 1, "overage_seconds": 1}
+    )
+    return [Shift(int(doc["user_id"]), doc["start"], doc["end"], doc.get("break_seconds", 0), doc.get("overage_seconds", 0)) for doc in cursor]
+
+def _insert_mongo(guild_id: int, shift: Shift) -> bool:
+    try:
+        db = get_current_mongo_client().get_database()
+    except RuntimeError:
+        return False
+    db["shift_logs"].insert_one({"guild_id": str(guild_id), **shift._asdict()})
+    return True
+
+async def _load(guild_id: int) -> ShiftIndex:
+    """Build the guild's index from the log file merged with the shift_logs collection"""
+    shifts = {}
+    # The file holds every shift appended on this host; MongoDB may hold shifts from other hosts
+    for shift in await asyncio.to_thread(_read_file, settings.get_guild_shift_log_path(guild_id)):
+        shifts[(shift.user_id, shift.start)] = shift
+    try:
+        for shift in await asyncio.to_thread(_read_mongo, guild_id) or []:
+            shifts.setdefault((shift.user_id, shift.start), shift)
+    except Exception as e:
+        logger.error(f"Error loading shift log from MongoDB for guild {guild_id}: {e}")
+
+    index = ShiftIndex()
+    for shift in sorted(shifts.values(), key=lambda s: s.start):
+        index.add(shift)
+    return index
+
+async def get_index(guild_id: int) -> ShiftIndex:
+    """The guild's shift index, loaded from the log file and MongoDB on first use"""
+    index = _indexes.get(guild_id)
+    if index is not None:
+        return index
+
+    async with _load_locks.setdefault(guild_id, asyncio.Lock()):
+        if guild_id not in _indexes:
+            _indexes[guild_id] = await _load(guild_id)
+        return _indexes[guild_id]
+
+async def append(guild_id: int, shift: Shift) -> bool:
+    """
+    Record a completed shift.
+
+    The shift is appended as one fixed-size record to the guild's log file,
+    inserted into the shift_logs collection when MongoDB is configured, and
+    added to the in-memory index if it is loaded. Holds the guild's load
+    lock, so a concurrent first load sees either none or all of it.
+
+    Returns:
+        True if the shift was stored in MongoDB or the file
+    """
+    async with _load_locks.setdefault(guild_id, asyncio.Lock()):
+        db_success = False
+        try:
+            db_success = await asyncio.to_thread(_insert_mongo, guild_id, shift)
+        except Exception as e:
+            logger.error(f"Error saving shift to MongoDB for guild {guild_id}: {e}")
+
+        file_success = False
+        path = settings.get_guild_shift_log_path(guild_id)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            async with aiofiles.open(path, "ab") as f:
+                await f.write(RECORD.pack(*shift))
+            file_success = True
+        except Exception as e:
+            logger.error(f"Error appending shift to {path}: {e}")
+
+        if guild_id in _indexes:
+            _indexes[guild_id].add(shift)
+        return db_success or file_success
+
+async def shifts(guild_id: int, user_id: Optional[int] = None, start: Optional[int] = None, end: Optional[int] = None) -> List[Shift]:
+    """Shifts starting in [start, end), optionally for one user; see ShiftIndex.query"""
+    return (await get_index(guild_id)).query(user_id, start, end)
+
+async def hours_worked(guild_id: int, user_id: int, start: Optional[int] = None, end: Optional[int] = None) -> float:
+    """Hours worked (shift time minus breaks) by a user in shifts starting in [start, end)"""
+    return sum(shift.hours_worked for shift in await shifts(guild_id, user_id, start, end))
+
+async def latest_shift(guild_id: int, user_id: int, since: Optional[int] = None) -> Optional[Shift]:
+    """The user's most recent shift, optionally only if it ended at or after `since`"""
+    user_shifts = (await get_index(guild_id)).user_shifts.get(user_id)
+    if not user_shifts:
+        return None
+    shift = max(user_shifts[-3:], key=lambda s: s.end)
+    if since is not None and shift.end < since:
+        return None
+    return shift
@@ -0,0 +1,274 @@
+import os
+import json
+import zlib
+import hashlib
+import logging
+import threading
+
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from config import settings
+
+logger = logging.getLogger("xof_calculator.snapshot_store")
+
+# Snapshot kinds and the file names that are split into per-user chunks
+KINDS = ("config", "earnings")
+CHUNKED_FILES = (settings.EARNINGS_FILE,)
+
+SNAPSHOT_ID_FORMAT = "%Y%m%d-%H%M%S"
+
+# Working files that never belong in a snapshot
+_SKIPPED_SUFFIXES = (".bak", ".tmp")
+
+# The store is shared by every bot instance and used from worker threads
+_lock = threading.RLock()
+
+Progress = Optional[Callable[[int, int], None]]
+
+def _blob_path(digest: str) -> str:
+    return os.path.join(settings.SNAPSHOT_DIR, "blobs", digest[:2], digest)
+
+def _index_path(guild_id: Any, kind: str) -> str:
+    return os.path.join(settings.SNAPSHOT_DIR, "manifests", str(guild_id), kind, "index.json")
+
+def _manifest_path(guild_id: Any, kind: str, snapshot_id: str) -> str:
+    return os.path.join(settings.SNAPSHOT_DIR, "manifests", str(guild_id), kind, f"{snapshot_id}.json")
+
+def _refs_path() -> str:
+    return os.path.join(settings.SNAPSHOT_DIR, "refs.json")
+
+def _read_json(path: str, default: Any) -> Any:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+def _write_json(path: str, data: Any):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+def _put_blob(content: bytes) -> str:
+    """Store content once under its SHA-256 and return the digest"""
+    digest = hashlib.sha256(content).hexdigest()
+    path = _blob_path(digest)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(zlib.compress(content, settings.SNAPSHOT_COMPRESSION_LEVEL))
+        os.replace(temp_path, path)
+    return digest
+
+def _get_blob(digest: str) -> bytes:
+    with open(_blob_path(digest), "rb") as f:
+        content = zlib.decompress(f.read())
+    if hashlib.sha256(content).hexdigest() != digest:
+        raise ValueError(f"Snapshot blob {digest} is corrupted")
+    return content
+
+def _chunk_earnings(content: bytes) -> Optional[List[Tuple[str, bytes]]]:
+    """Split an earnings file into one chunk per user, or None if it isn't a user dict"""
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    return [(user_key, json.dumps(entries, separators=(",", ":")).encode()) for user_key, entries in data.items()]
+
+def _snapshot_files(source_dir: str, include: Optional[Callable[[str], bool]]) -> List[str]:
+    files = []
+    for root, _, names in os.walk(source_dir):
+        for name in names:
+            if name.endswith(_SKIPPED_SUFFIXES) or ".corrupted." in name:
+                continue
+            relative = os.path.relpath(os.path.join(root, name), source_dir)
+            if include is None or include(relative):
+                files.append(relative)
+    return sorted(files)
+
+def _new_snapshot_id(index: List[Dict[str, Any]]) -> str:
+    taken = {entry["id"] for entry in index}
+    moment = datetime.now()
+    while moment.strftime(SNAPSHOT_ID_FORMAT) in taken:
+        moment += timedelta(seconds=1)
+    return moment.strftime(SNAPSHOT_ID_FORMAT)
+
+def _manifest_blobs(manifest: Dict[str, Any]) -> List[str]:
+    digests = []
+    for entry in manifest["files"].values():
+        if "blob" in entry:
+            digests.append(entry["blob"])
+        else:
+            digests.extend(entry["chunks"].values())
+    return digests
+
+def create_snapshot(
+    guild_id: Any,
+    kind: str,
+    source_dir: str,
+    include: Optional[Callable[[str], bool]] = None,
+    progress: Progress = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Snapshot the files of a guild directory.
+
+    Each file is stored as a compressed blob named by its content hash, so
+    files that didn't change since an earlier snapshot (of any guild) take
+    no extra space. Earnings files are split per user, so only users whose
+    entries changed add new blobs. The snapshot itself is a small manifest
+    listing the blobs, and it is recorded in the guild's manifest index.
+
+    Args:
+        guild_id: Guild the snapshot belongs to
+        kind: One of KINDS
+        source_dir: Directory to snapshot
+        include: Optional filter on paths relative to source_dir
+        progress: Optional callback(done, total) called after each file
+
+    Returns:
+        The index entry of the new snapshot, or None if there was nothing to snapshot
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown snapshot kind: {kind}")
+    if not os.path.isdir(source_dir):
+        return None
+    files = _snapshot_files(source_dir, include)
+    if not files:
+        return None
+
+    contents = []
+    for relative in files:
+        with open(os.path.join(source_dir, relative), "rb") as f:
+            contents.append((relative, f.read()))
+    stored_bytes = sum(len(content) for _, content in contents)
+
+    # Blobs are written and referenced in one step so a concurrent prune can't drop them in between
+    with _lock:
+        manifest_files = {}
+        for done, (relative, content) in enumerate(contents, start=1):
+            chunks = _chunk_earnings(content) if os.path.basename(relative) in CHUNKED_FILES else None
+            if chunks is None:
+                manifest_files[relative] = {"blob": _put_blob(content), "size": len(content)}
+            else:
+                manifest_files[relative] = {"chunks": {key: _put_blob(chunk) for key, chunk in chunks}, "size": len(content)}
+            if progress:
+                progress(done, len(contents))
+
+        index = _read_json(_index_path(guild_id, kind), [])
+        snapshot_id = _new_snapshot_id(index)
+        manifest = {
+            "id": snapshot_id,
+            "guild_id": str(guild_id),
+            "kind": kind,
+            "created_at": datetime.now().isoformat(),
+            "files": manifest_files
+        }
+        _write_json(_manifest_path(guild_id, kind, snapshot_id), manifest)
+
+        refs = _read_json(_refs_path(), {})
+        for digest in set(_manifest_blobs(manifest)):
+            refs[digest] = refs.get(digest, 0) + 1
+        _write_json(_refs_path(), refs)
+
+        entry = {"id": snapshot_id, "created_at": manifest["created_at"], "files": len(files), "size": stored_bytes}
+        index.append(entry)
+        _write_json(_index_path(guild_id, kind), index)
+
+    logger.info(f"Created {kind} snapshot {snapshot_id} for guild {guild_id} ({len(files)} files)")
+    return entry
+
+def list_snapshots(guild_id: Any, kind: str) -> List[Dict[str, Any]]:
+    """Index entries of a guild's snapshots, newest first"""
+    with _lock:
+        index = _read_json(_index_path(guild_id, kind), [])
+    return sorted(index, key=lambda entry: entry["id"], reverse=True)
+
+def restore_snapshot(
+    guild_id: Any,
+    kind: str,
+    snapshot_id: str,
+    target_dir: str,
+    progress: Progress = None
+) -> List[str]:
+    """
+    Write a snapshot's files back into a directory.
+
+    Files are written atomically; files in target_dir that aren't in the
+    snapshot are left alone.
+
+    Returns:
+        Relative paths of the restored files
+
+    Raises:
+        KeyError: If the snapshot doesn't exist
+    """
+    with _lock:
+        manifest = _read_json(_manifest_path(guild_id, kind, snapshot_id), None)
+        if manifest is None:
+            raise KeyError(snapshot_id)
+
+        # Read every blob before writing anything, so a corrupted blob leaves the target untouched
+        contents = []
+        for relative, entry in manifest["files"].items():
+            if "blob" in entry:
+                contents.append((relative, _get_blob(entry["blob"])))
+            else:
+                data = {user_key: json.loads(_get_blob(digest)) for user_key, digest in entry["chunks"].items()}
+                contents.append((relative, json.dumps(data, indent=4).encode()))
+
+    restored = []
+    for done, (relative, content) in enumerate(contents, start=1):
+        path = os.path.join(target_dir, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+        restored.append(relative)
+        if progress:
+            progress(done, len(contents))
+
+    logger.info(f"Restored {kind} snapshot {snapshot_id} for guild {guild_id} into {target_dir}")
+    return restored
+
+def delete_snapshots(guild_id: Any, kind: str, snapshot_ids: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """
+    Delete snapshots and the blobs no other snapshot uses.
+
+    Returns:
+        (deleted IDs, IDs that weren't found)
+    """
+    deleted, missing = [], []
+    with _lock:
+        index = _read_json(_index_path(guild_id, kind), [])
+        known = {entry["id"] for entry in index}
+        refs = _read_json(_refs_path(), {})
+
+        for snapshot_id in snapshot_ids:
+            manifest_path = _manifest_path(guild_id, kind, snapshot_id)
+            manifest = _read_json(manifest_path, None) if snapshot_id in known else None
+            if manifest is None:
+                missing.append(snapshot_id)
+                continue
+            for digest in set(_manifest_blobs(manifest)):
+                refs[digest] = refs.get(digest, 1) - 1
+                if refs[digest] <= 0:
+                    refs.pop(digest)
+                    try:
+                        os.remove(_blob_path(digest))
+                    except FileNotFoundError:
+                        pass
+            os.remove(manifest_path)
+            known.discard(snapshot_id)
+            deleted.append(snapshot_id)
+
+        if deleted:
+            _write_json(_refs_path(), refs)
+            _write_json(_index_path(guild_id, kind), [entry for entry in index if entry["id"] in known])
+
+    return deleted, missing
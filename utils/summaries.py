@@ -0,0 +1,490 @@
+import re
+import asyncio
+import logging
+
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from config import settings
+from utils import earnings_sync, file_handlers
+from utils.db import get_current_mongo_client
+
+logger = logging.getLogger("xof_calculator.summaries")
+
+# Entry fields the local rollups read; streamed loads fetch only these
+ENTRY_FIELDS = ("date", "period", "role", "shift", "models", "gross_revenue", "total_cut", "hours_worked")
+
+# Entry field each grouping dimension reads
+GROUP_FIELDS = {
+    "period": "period",
+    "role": "role",
+    "shift": "shift",
+    "model": "models",
+}
+
+def _empty_bucket() -> Dict[str, Any]:
+    return {"count": 0, "users": 0, "gross": 0.0, "cut": 0.0, "hours": 0.0}
+
+def _parse_date(value: str) -> Optional[datetime]:
+    """Parse a stored entry date, accepting dd/mm/yyyy and yyyy-mm-dd"""
+    for fmt in (settings.DATE_FORMAT, "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def split_models(value: Any) -> List[str]:
+    """
+    Normalize an entry's models to a list of names.
+
+    Entries store models as a comma-joined string, while MongoDB holds a
+    list (sometimes a one-item list of that string).
+
+    Args:
+        value: Stored models value
+
+    Returns:
+        Distinct model names in their original order
+    """
+    if value is None:
+        return []
+    parts = value if isinstance(value, list) else [value]
+    models = []
+    for part in parts:
+        for name in str(part).split(","):
+            name = name.strip()
+            if name and name not in models:
+                models.append(name)
+    return models
+
+def build_pipeline(
+    guild_id: int,
+    group_by: Optional[str] = None,
+    period: Optional[str] = None,
+    user_mention: Optional[str] = None,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Build the aggregation pipeline for an earnings summary.
+
+    Args:
+        guild_id: Guild to summarize
+        group_by: Optional dimension from GROUP_FIELDS
+        period: Optional period name (case-insensitive)
+        user_mention: Optional '<@id>' key to restrict to one user
+        from_date: Optional inclusive start date
+        to_date: Optional inclusive end date
+
+    Returns:
+        Pipeline producing one document with "totals" and "groups" facets
+    """
+    match: Dict[str, Any] = {"guild_id": str(guild_id), **earnings_sync.ACTIVE_ENTRIES}
+    if period:
+        match["period"] = {"$regex": f"^{re.escape(period)}$", "$options": "i"}
+    if user_mention:
+        match["user_mention"] = user_mention
+    pipeline: List[Dict[str, Any]] = [{"$match": match}]
+
+    if from_date or to_date:
+        # Dates are stored as dd/mm/yyyy strings, with some legacy ISO dates
+        pipeline.append({"$addFields": {"_parsed_date": {"$dateFromString": {
+            "dateString": "$date",
+            "format": "%d/%m/%Y",
+            "onError": {"$dateFromString": {"dateString": "$date", "onError": None}}
+        }}}})
+        date_match: Dict[str, Any] = {}
+        if from_date:
+            date_match["$gte"] = from_date
+        if to_date:
+            date_match["$lte"] = to_date
+        pipeline.append({"$match": {"_parsed_date": date_match}})
+
+    def group_stage(key, share=None):
+        def amount(field):
+            value = {"$convert": {"input": f"${field}", "to": "double", "onError": 0, "onNull": 0}}
+            return {"$sum": {"$multiply": [value, share]} if share else value}
+
+        return {"$group": {
+            "_id": key,
+            "count": {"$sum": 1},
+            "users": {"$addToSet": "$user_mention"},
+            "gross": amount("gross_revenue"),
+            "cut": amount("total_cut"),
+            "hours": amount("hours_worked"),
+        }}
+
+    project = {"$project": {"count": 1, "users": {"$size": "$users"}, "gross": 1, "cut": 1, "hours": 1}}
+    facets: Dict[str, Any] = {"totals": [group_stage(None), project]}
+
+    if group_by:
+        field = GROUP_FIELDS[group_by]
+        if field == "models":
+            # Same crediting rule as split_models and the model index: the
+            # stored value (a list, or a comma-joined string) is split into
+            # distinct trimmed names, and each model counts the sale once
+            # while getting 1/n of its amounts
+            facets["groups"] = [
+                {"$addFields": {"_models": {"$setUnion": [{"$filter": {
+                    "input": {"$map": {
+                        "input": {"$reduce": {
+                            "input": {"$cond": [
+                                {"$isArray": "$models"},
+                                "$models",
+                                {"$cond": [{"$eq": [{"$ifNull": ["$models", None]}, None]}, [], ["$models"]]}
+                            ]},
+                            "initialValue": [],
+                            "in": {"$concatArrays": ["$$value", {"$split": [{"$toString": "$$this"}, ","]}]}
+                        }},
+                        "as": "name",
+                        "in": {"$trim": {"input": "$$name"}}
+                    }},
+                    "as": "name",
+                    "cond": {"$ne": ["$$name", ""]}
+                }}, []]}}},
+                {"$addFields": {"_share": {"$divide": [1, {"$max": [{"$size": "$_models"}, 1]}]}}},
+                {"$unwind": {"path": "$_models", "preserveNullAndEmptyArrays": True}},
+                group_stage("$_models", "$_share"),
+                project
+            ]
+        else:
+            facets["groups"] = [group_stage(f"${field}"), project]
+
+    pipeline.append({"$facet": facets})
+    return pipeline
+
+def _run_pipeline(pipeline: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Run a summary pipeline and shape its single result document"""
+    db = get_current_mongo_client().get_database()
+    result = next(db["earnings"].aggregate(pipeline), {})
+
+    def shape(doc):
+        return {key: doc.get(key, 0) for key in ("count", "users", "gross", "cut", "hours")}
+
+    totals = result.get("totals") or []
+    return {
+        "totals": shape(totals[0]) if totals else _empty_bucket(),
+        "groups": {doc["_id"]: shape(doc) for doc in result.get("groups", [])},
+    }
+
+class SummaryRollup:
+    """
+    Running totals of the local summary, folded one entry at a time.
+
+    Args:
+        group_by, period, user_mention, from_date, to_date: As in build_pipeline
+    """
+
+    def __init__(
+        self,
+        group_by: Optional[str] = None,
+        period: Optional[str] = None,
+        user_mention: Optional[str] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None
+    ):
+        self.field = GROUP_FIELDS[group_by] if group_by else None
+        self.period = period.lower() if period else None
+        self.user_mention = user_mention
+        self.from_date = from_date
+        self.to_date = to_date
+        self.totals = _empty_bucket()
+        self.total_users = set()
+        self.groups: Dict[Any, Dict[str, Any]] = {}
+        self.group_users: Dict[Any, set] = {}
+
+    def add(self, sender: str, entry: Dict[str, Any]):
+        """Fold one entry in, skipping it if it falls outside the filters"""
+        if self.user_mention and sender != self.user_mention:
+            return
+        if self.period and str(entry.get("period", "")).lower() != self.period:
+            return
+        if self.from_date or self.to_date:
+            entry_date = _parse_date(entry.get("date"))
+            if entry_date is None or (self.from_date and entry_date < self.from_date) or (self.to_date and entry_date > self.to_date):
+                return
+
+        gross = _to_float(entry.get("gross_revenue"))
+        cut = _to_float(entry.get("total_cut"))
+        hours = _to_float(entry.get("hours_worked"))
+        self.totals["count"] += 1
+        self.totals["gross"] += gross
+        self.totals["cut"] += cut
+        self.totals["hours"] += hours
+        self.total_users.add(sender)
+
+        if self.field is None:
+            return
+        if self.field == "models":
+            # Each model counts the sale once and gets 1/n of its amounts
+            keys = split_models(entry.get(self.field)) or [None]
+        else:
+            keys = [entry.get(self.field)]
+        share = 1 / len(keys)
+        for key in keys:
+            bucket = self.groups.setdefault(key, _empty_bucket())
+            bucket["count"] += 1
+            bucket["gross"] += gross * share
+            bucket["cut"] += cut * share
+            bucket["hours"] += hours * share
+            self.group_users.setdefault(key, set()).add(sender)
+
+def summarize_entries(rollup: SummaryRollup) -> Dict[str, Any]:
+    """
+    Local equivalent of the aggregation pipeline's result.
+
+    Args:
+        rollup: Entries folded into a SummaryRollup
+
+    Returns:
+        Dictionary with "totals" and "groups" buckets
+    """
+    totals = dict(rollup.totals, users=len(rollup.total_users))
+    groups = {key: dict(bucket, users=len(rollup.group_users[key])) for key, bucket in rollup.groups.items()}
+    return {"totals": totals, "groups": groups}
+
+async def summarize(
+    guild_id: int,
+    group_by: Optional[str] = None,
+    period: Optional[str] = None,
+    user_mention: Optional[str] = None,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Summarize a guild's earnings: entry count, distinct users, gross, cut and
+    hours, in total and optionally per period, role, shift or model.
+
+    With MongoDB configured the work runs server-side as a $match/$group
+    pipeline, so only the resulting numbers are transferred. Otherwise the
+    earnings are streamed and rolled up locally as they are read.
+
+    Args:
+        guild_id: Guild to summarize
+        group_by: Optional dimension: "period", "role", "shift" or "model"
+        period: Optional period name (case-insensitive)
+        user_mention: Optional '<@id>' key to restrict to one user
+        from_date: Optional inclusive start date
+        to_date: Optional inclusive end date
+
+    Returns:
+        {"totals": bucket, "groups": {key: bucket}} where each bucket has
+        count, users, gross, cut and hours
+    """
+    if group_by is not None and group_by not in GROUP_FIELDS:
+        raise ValueError(f"Unknown summary dimension: {group_by}")
+
+    try:
+        get_current_mongo_client()
+        use_mongo = True
+    except RuntimeError:
+        use_mongo = False
+
+    if use_mongo:
+        pipeline = build_pipeline(guild_id, group_by, period, user_mention, from_date, to_date)
+        try:
+            return await asyncio.to_thread(_run_pipeline, pipeline)
+        except Exception as e:
+            logger.error(f"Summary aggregation failed for guild {guild_id}, falling back to local rollup: {e}")
+
+    rollup = SummaryRollup(group_by, period, user_mention, from_date, to_date)
+    async for sender, entry in file_handlers.iter_earnings(guild_id, ENTRY_FIELDS, user_mention):
+        rollup.add(sender, entry)
+    return summarize_entries(rollup)
+
+# Dimensions of the summary cube, in cell key order
+CUBE_DIMENSIONS = ("period", "role", "shift", "user", "bucket")
+
+# Time bucket label formats, valid for both strftime and Mongo $dateToString
+BUCKET_FORMATS = {
+    "week": "%G-W%V",
+    "month": "%Y-%m",
+}
+
+def _bucket_label(entry_date: Optional[datetime], bucket: Optional[str]) -> Optional[str]:
+    if not bucket or entry_date is None:
+        return None
+    return entry_date.strftime(BUCKET_FORMATS[bucket])
+
+def build_cube_pipeline(
+    guild_id: int,
+    bucket: Optional[str] = None,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Build the aggregation pipeline for a period x role x shift x user
+    (x time bucket) cube.
+
+    Args:
+        guild_id: Guild to summarize
+        bucket: Optional time bucket: "week" or "month"
+        from_date: Optional inclusive start date
+        to_date: Optional inclusive end date
+
+    Returns:
+        Pipeline producing one document per non-empty cube cell
+    """
+    pipeline: List[Dict[str, Any]] = [{"$match": {"guild_id": str(guild_id), **earnings_sync.ACTIVE_ENTRIES}}]
+
+    if from_date or to_date or bucket:
+        pipeline.append({"$addFields": {"_parsed_date": {"$dateFromString": {
+            "dateString": "$date",
+            "format": "%d/%m/%Y",
+            "onError": {"$dateFromString": {"dateString": "$date", "onError": None}}
+        }}}})
+    if from_date or to_date:
+        date_match: Dict[str, Any] = {}
+        if from_date:
+            date_match["$gte"] = from_date
+        if to_date:
+            date_match["$lte"] = to_date
+        pipeline.append({"$match": {"_parsed_date": date_match}})
+
+    key = {"period": "$period", "role": "$role", "shift": "$shift", "user": "$user_mention"}
+    if bucket:
+        key["bucket"] = {"$dateToString": {"date": "$_parsed_date", "format": BUCKET_FORMATS[bucket], "onNull": None}}
+
+    pipeline.append({"$group": {
+        "_id": key,
+        "count": {"$sum": 1},
+        "gross": {"$sum": {"$convert": {"input": "$gross_revenue", "to": "double", "onError": 0, "onNull": 0}}},
+        "cut": {"$sum": {"$convert": {"input": "$total_cut", "to": "double", "onError": 0, "onNull": 0}}},
+        "hours": {"$sum": {"$convert": {"input": "$hours_worked", "to": "double", "onError": 0, "onNull": 0}}},
+    }})
+    return pipeline
+
+def _run_cube_pipeline(pipeline: List[Dict[str, Any]]) -> Dict[tuple, Dict[str, float]]:
+    db = get_current_mongo_client().get_database()
+    cube = {}
+    for doc in db["earnings"].aggregate(pipeline):
+        key = tuple(doc["_id"].get(dimension) for dimension in CUBE_DIMENSIONS)
+        cube[key] = {"count": doc["count"], "gross": doc["gross"], "cut": doc["cut"], "hours": doc["hours"]}
+    return cube
+
+def add_cube_entry(
+    cube: Dict[tuple, Dict[str, float]],
+    sender: str,
+    entry: Dict[str, Any],
+    bucket: Optional[str] = None,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None
+):
+    """
+    Fold one entry into a cube, the local equivalent of the cube pipeline.
+
+    Args:
+        cube: {(period, role, shift, user, bucket): {count, gross, cut, hours}}, updated in place
+        sender: User mention the entry belongs to
+        entry: Earnings entry
+        bucket, from_date, to_date: As in build_cube_pipeline
+    """
+    entry_date = _parse_date(entry.get("date")) if (from_date or to_date or bucket) else None
+    if from_date or to_date:
+        if entry_date is None or (from_date and entry_date < from_date) or (to_date and entry_date > to_date):
+            return
+
+    key = (entry.get("period"), entry.get("role"), entry.get("shift"), sender, _bucket_label(entry_date, bucket))
+    cell = cube.get(key)
+    if cell is None:
+        cell = cube[key] = {"count": 0, "gross": 0.0, "cut": 0.0, "hours": 0.0}
+    cell["count"] += 1
+    cell["gross"] += _to_float(entry.get("gross_revenue"))
+    cell["cut"] += _to_float(entry.get("total_cut"))
+    cell["hours"] += _to_float(entry.get("hours_worked"))
+
+async def build_cube(
+    guild_id: int,
+    bucket: Optional[str] = None,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None
+) -> Dict[tuple, Dict[str, float]]:
+    """
+    Compute the period x role x shift x user (x week/month) earnings cube.
+
+    One aggregation query with MongoDB, otherwise one pass over the streamed
+    earnings. Any slice or breakdown can then be read with rollup_cube
+    without touching the ledger again.
+
+    Args:
+        guild_id: Guild to summarize
+        bucket: Optional time bucket: "week" or "month"
+        from_date: Optional inclusive start date
+        to_date: Optional inclusive end date
+
+    Returns:
+        {(period, role, shift, user, bucket): {count, gross, cut, hours}}
+    """
+    if bucket is not None and bucket not in BUCKET_FORMATS:
+        raise ValueError(f"Unknown time bucket: {bucket}")
+
+    try:
+        get_current_mongo_client()
+        use_mongo = True
+    except RuntimeError:
+        use_mongo = False
+
+    if use_mongo:
+        pipeline = build_cube_pipeline(guild_id, bucket, from_date, to_date)
+        try:
+            return await asyncio.to_thread(_run_cube_pipeline, pipeline)
+        except Exception as e:
+            logger.error(f"Cube aggregation failed for guild {guild_id}, falling back to local pass: {e}")
+
+    cube: Dict[tuple, Dict[str, float]] = {}
+    async for sender, entry in file_handlers.iter_earnings(guild_id, ENTRY_FIELDS):
+        add_cube_entry(cube, sender, entry, bucket, from_date, to_date)
+    return cube
+
+def rollup_cube(
+    cube: Dict[tuple, Dict[str, float]],
+    filters: Optional[Dict[str, Any]] = None,
+    group_by: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Slice and roll up a cube built by build_cube.
+
+    Args:
+        cube: Cube cells
+        filters: Optional {dimension: value} to keep
+        group_by: Optional dimension to break totals down by
+
+    Returns:
+        {"totals": bucket, "groups": {value: bucket}} with count, users,
+        gross, cut and hours per bucket
+    """
+    filters = filters or {}
+    positions = {dimension: index for index, dimension in enumerate(CUBE_DIMENSIONS)}
+    checks = [(positions[dimension], value) for dimension, value in filters.items()]
+    user_position = positions["user"]
+    group_position = positions[group_by] if group_by else None
+
+    totals = _empty_bucket()
+    total_users = set()
+    groups: Dict[Any, Dict[str, Any]] = {}
+    group_users: Dict[Any, set] = {}
+
+    for key, cell in cube.items():
+        if any(key[position] != value for position, value in checks):
+            continue
+        targets = [(totals, total_users)]
+        if group_position is not None:
+            group_key = key[group_position]
+            targets.append((groups.setdefault(group_key, _empty_bucket()), group_users.setdefault(group_key, set())))
+        for target, users in targets:
+            target["count"] += cell["count"]
+            target["gross"] += cell["gross"]
+            target["cut"] += cell["cut"]
+            target["hours"] += cell["hours"]
+            users.add(key[user_position])
+
+    totals["users"] = len(total_users)
+    for group_key, bucket in groups.items():
+        bucket["users"] = len(group_users[group_key])
+    return {"totals": totals, "groups": groups}
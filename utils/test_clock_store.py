@@ -0,0 +1,71 @@
+import os
+import json
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+from config import settings
+from utils import clock_store, file_handlers
+
+CLOCK_INS = 300
+GUILD_ID = 4242
+
+async def _clock_in(user_id: int):
+    # The clock commands' pattern: read, yield to the loop, write the user's state
+    clock_data = await clock_store.load(GUILD_ID)
+    state = clock_data["users"].get(str(user_id), {})
+    state.update(status="clocked_in", clock_in_time=f"2025-01-01T00:00:{user_id % 60:02d}+00:00")
+    await asyncio.sleep(0)
+    await clock_store.save_user_state(GUILD_ID, user_id, state)
+
+class ConcurrentClockInTest(unittest.TestCase):
+    def setUp(self):
+        # clock_store works on relative data/ paths
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        # Each test runs its own event loop
+        clock_store._guild_locks.clear()
+        file_handlers._file_locks.clear()
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _stored(self):
+        with open(settings.get_guild_clock_data_path(GUILD_ID), "r") as f:
+            return json.load(f)
+
+    def _clock_in_all(self, buffered: bool):
+        async def run():
+            # An existing file, so loading the guild's data yields to the loop
+            await clock_store._write_stored(GUILD_ID, {("settings", "max_break_duration_minutes"): 15})
+            buffer = clock_store.start_write_buffer() if buffered else None
+            await asyncio.gather(
+                clock_store.save_settings(GUILD_ID, max_breaks_per_shift=3),
+                *(_clock_in(user_id) for user_id in range(CLOCK_INS))
+            )
+            if buffer:
+                await buffer.close()
+
+        with mock.patch.object(settings, "CLOCK_WRITE_MODE", "buffered" if buffered else "immediate"):
+            asyncio.run(run())
+
+    def _assert_all_kept(self):
+        stored = self._stored()
+        self.assertEqual(len(stored["users"]), CLOCK_INS)
+        self.assertTrue(all(state["status"] == "clocked_in" for state in stored["users"].values()))
+        self.assertEqual(stored["settings"]["max_breaks_per_shift"], 3)
+        self.assertEqual(stored["settings"]["max_break_duration_minutes"], 15)
+
+    def test_simultaneous_clock_ins_are_all_kept(self):
+        self._clock_in_all(buffered=False)
+        self._assert_all_kept()
+
+    def test_simultaneous_buffered_clock_ins_are_all_kept(self):
+        self._clock_in_all(buffered=True)
+        self._assert_all_kept()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import random
+import unittest
+import discord
+
+from utils import embed_packer
+
+def _new_embed(title):
+    return lambda index: discord.Embed(title=title if index == 0 else f"{title} (continued)")
+
+def _pack(field_lengths, title="Earnings"):
+    fields = [("", "x" * length, False) for length in field_lengths]
+    messages = embed_packer.build_messages(fields, _new_embed(title))
+    for embeds in messages:
+        # The footer the paginator adds must still fit
+        embeds[-1].set_footer(text="F" * embed_packer.FOOTER_RESERVE)
+        embed_packer.check_message(embeds)
+    return messages
+
+class EmbedPackerLimitsTest(unittest.TestCase):
+    def test_fields_per_embed(self):
+        messages = _pack([10] * 26)
+        self.assertEqual([len(embed.fields) for embed in messages[0]], [25, 1])
+
+    def test_embeds_per_message(self):
+        messages = _pack([1] * (25 * 10 + 1))
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(len(messages[0]), 10)
+
+    def test_characters_per_message(self):
+        messages = _pack([1000] * 7)
+        self.assertEqual(len(messages), 2)
+        for embeds in messages:
+            self.assertLessEqual(sum(len(embed) for embed in embeds), embed_packer.MAX_EMBED_CHARS)
+
+    def test_field_value_limit(self):
+        counts = embed_packer.group_lines([100] * 25, overhead=50)
+        self.assertEqual(counts, [9, 9, 7])
+        self.assertTrue(all(50 + 100 * count <= embed_packer.MAX_FIELD_VALUE for count in counts))
+        with self.assertRaises(ValueError):
+            embed_packer.group_lines([1000], overhead=50)
+
+    def test_order_preserved(self):
+        fields = [("", str(index), False) for index in range(300)]
+        messages = embed_packer.build_messages(fields, _new_embed("Earnings"))
+        values = [field.value for embeds in messages for embed in embeds for field in embed.fields]
+        self.assertEqual(values, [str(index) for index in range(300)])
+
+    def test_random_layouts_respect_every_limit(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            lengths = [rng.randint(1, embed_packer.MAX_FIELD_VALUE) for _ in range(rng.randint(1, 400))]
+            _pack(lengths, title="T" * rng.randint(0, 200))
+
+    def test_check_message_rejects_violations(self):
+        too_many = [discord.Embed() for _ in range(embed_packer.MAX_EMBEDS_PER_MESSAGE + 1)]
+        crowded = discord.Embed()
+        for _ in range(embed_packer.MAX_FIELDS_PER_EMBED + 1):
+            crowded.add_field(name="", value="x")
+        long_field = discord.Embed().add_field(name="", value="x" * (embed_packer.MAX_FIELD_VALUE + 1))
+        long_message = [discord.Embed(description="x" * 3001), discord.Embed(description="x" * 3000)]
+        for embeds in (too_many, [crowded], [long_field], long_message):
+            with self.assertRaises(ValueError):
+                embed_packer.check_message(embeds)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import time
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+from utils import shift_log
+from utils.shift_log import Shift
+
+GUILD_ID = 4242
+
+class ShiftLogLoadTest(unittest.TestCase):
+    def setUp(self):
+        # shift_log works on relative data/ paths
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        shift_log._indexes.clear()
+        shift_log._load_locks.clear()
+
+    def tearDown(self):
+        shift_log._indexes.clear()
+        shift_log._load_locks.clear()
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_file_and_mongo_records_are_merged(self):
+        file_only = Shift(1, 100, 200, 0, 0)
+        both = Shift(1, 300, 400, 10, 0)
+        mongo_only = Shift(2, 250, 350, 0, 0)
+
+        async def run():
+            with mock.patch.object(shift_log, "_insert_mongo", return_value=False):
+                await shift_log.append(GUILD_ID, file_only)
+                await shift_log.append(GUILD_ID, both)
+            shift_log._indexes.clear()
+            with mock.patch.object(shift_log, "_read_mongo", return_value=[both, mongo_only]):
+                return await shift_log.shifts(GUILD_ID)
+
+        self.assertEqual(asyncio.run(run()), [file_only, mongo_only, both])
+
+    def test_append_during_first_load_is_indexed(self):
+        shift = Shift(1, 100, 200, 0, 0)
+
+        def slow_read(guild_id):
+            # Reads the collection before the concurrent append writes it
+            time.sleep(0.1)
+            return []
+
+        async def run():
+            with mock.patch.object(shift_log, "_read_mongo", side_effect=slow_read), \
+                 mock.patch.object(shift_log, "_insert_mongo", return_value=True):
+                load = asyncio.create_task(shift_log.get_index(GUILD_ID))
+                await asyncio.sleep(0.01)
+                await shift_log.append(GUILD_ID, shift)
+                await load
+                return await shift_log.shifts(GUILD_ID)
+
+        self.assertEqual(asyncio.run(run()), [shift])
+
+if __name__ == "__main__":
+    unittest.main()
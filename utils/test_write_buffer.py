@@ -0,0 +1,56 @@
+import asyncio
+import unittest
+
+from utils.write_buffer import WriteBuffer
+
+INTERVAL = 0.05
+
+class WriteBufferStalenessTest(unittest.TestCase):
+    def _run(self, writer, updates_during_flush):
+        stored = {}
+
+        async def loader(key):
+            return {}
+
+        async def run():
+            buffer = WriteBuffer(loader, writer(stored), INTERVAL)
+            await buffer.apply("g", {("users", "a"): 1})
+            await asyncio.sleep(INTERVAL * 1.5)  # First flush is now in progress
+            for path, value in updates_during_flush.items():
+                await buffer.apply("g", {path: value})
+            await asyncio.sleep(INTERVAL * 8)
+            pending = dict(buffer._pending)
+            buffer._closed = True
+            return pending
+
+        return asyncio.run(run()), stored
+
+    def test_updates_applied_during_a_flush_are_written(self):
+        def writer(stored):
+            async def write(key, updates, snapshot):
+                await asyncio.sleep(INTERVAL)
+                stored.update(updates)
+                return True
+            return write
+
+        pending, stored = self._run(writer, {("users", "b"): 2})
+        self.assertEqual(pending, {})
+        self.assertEqual(stored, {("users", "a"): 1, ("users", "b"): 2})
+
+    def test_failed_writes_are_retried(self):
+        def writer(stored):
+            attempts = []
+            async def write(key, updates, snapshot):
+                attempts.append(updates)
+                if len(attempts) == 1:
+                    return False
+                stored.update(updates)
+                return True
+            return write
+
+        pending, stored = self._run(writer, {})
+        self.assertEqual(pending, {})
+        self.assertEqual(stored, {("users", "a"): 1})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import copy
+import asyncio
+import logging
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger("xof_calculator.write_buffer")
+
+Path = Tuple[str, ...]
+Loader = Callable[[Hashable], Awaitable[Dict[str, Any]]]
+Writer = Callable[[Hashable, Dict[Path, Any], Dict[str, Any]], Awaitable[bool]]
+Fingerprint = Callable[[Hashable], Any]
+
+class WriteBuffer:
+    """
+    Write-behind cache for small per-key documents.
+
+    Updates are applied to an in-memory copy of the document right away and
+    recorded as pending {path: value} changes. Changes to the same path
+    coalesce, and they are written together at most flush_interval seconds
+    after the first one, which bounds how stale the stored data can be.
+    close() flushes whatever is still pending.
+
+    While a key has no pending changes, its cached copy is dropped if the
+    fingerprint of the stored data changes (e.g. a backup was restored).
+    """
+
+    def __init__(self, loader: Loader, writer: Writer, flush_interval: float, fingerprint: Optional[Fingerprint] = None):
+        self._loader = loader
+        self._writer = writer
+        self._fingerprint = fingerprint
+        self.flush_interval = flush_interval
+        self._docs: Dict[Hashable, Dict[str, Any]] = {}
+        self._seen: Dict[Hashable, Any] = {}
+        self._pending: Dict[Hashable, Dict[Path, Any]] = {}
+        self._load_locks: Dict[Hashable, asyncio.Lock] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._closed = False
+        self.stats = {"updates": 0, "flushes": 0, "paths_written": 0}
+
+    def _cached(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """The cached document, unless it's missing or the stored data changed under it"""
+        doc = self._docs.get(key)
+        if doc is not None and (key in self._pending or not self._fingerprint or self._fingerprint(key) == self._seen.get(key)):
+            return doc
+        return None
+
+    async def _doc(self, key: Hashable) -> Dict[str, Any]:
+        doc = self._cached(key)
+        if doc is not None:
+            return doc
+        # One load per key: concurrent first updates must all land in the same copy
+        async with self._load_locks.setdefault(key, asyncio.Lock()):
+            doc = self._cached(key)
+            if doc is None:
+                doc = await self._loader(key)
+                self._docs[key] = doc
+                if self._fingerprint:
+                    self._seen[key] = self._fingerprint(key)
+            return doc
+
+    async def load(self, key: Hashable) -> Dict[str, Any]:
+        """Current document, including changes not yet written; safe to mutate"""
+        return copy.deepcopy(await self._doc(key))
+
+    async def apply(self, key: Hashable, updates: Dict[Path, Any]):
+        """
+        Apply updates in memory and schedule them to be written.
+
+        Args:
+            key: Document key
+            updates: {path: value}; each path is a tuple of nested keys
+        """
+        doc = await self._doc(key)
+        pending = self._pending.setdefault(key, {})
+        for path, value in updates.items():
+            value = copy.deepcopy(value)
+            node = doc
+            for part in path[:-1]:
+                node = node.setdefault(part, {})
+            node[path[-1]] = value
+            pending[path] = value
+        self.stats["updates"] += 1
+
+        if self._closed:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        # Shielded so close() cancelling the timer can't drop a flush in progress
+        await asyncio.shield(self.flush())
+        # This task still counted as the running timer during the flush, so changes
+        # applied meanwhile (and failed writes kept for retry) weren't scheduled
+        if self._pending and not self._closed:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self):
+        """Write every pending change now"""
+        async with self._flush_lock:
+            for key in list(self._pending):
+                updates = self._pending.pop(key)
+                if not updates:
+                    continue
+                snapshot = copy.deepcopy(self._docs[key])
+                try:
+                    success = await self._writer(key, updates, snapshot)
+                except Exception as e:
+                    logger.error(f"Error flushing buffered writes for {key}: {e}", exc_info=True)
+                    success = False
+
+                if not success:
+                    # Keep the changes for the next flush, behind anything newer
+                    retry = self._pending.setdefault(key, {})
+                    for path, value in updates.items():
+                        retry.setdefault(path, value)
+                    continue
+
+                self.stats["flushes"] += 1
+                self.stats["paths_written"] += len(updates)
+                if self._fingerprint:
+                    self._seen[key] = self._fingerprint(key)
+
+        if self._pending and not self._closed and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def close(self):
+        """Stop the flush timer and write everything still pending"""
+        self._closed = True
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush()
+        if self._pending:
+            logger.error(f"Write buffer closed with unwritten changes for: {list(self._pending)}")
+        logger.info(f"Write buffer closed: {self.stats}")
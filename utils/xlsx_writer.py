@@ -0,0 +1,139 @@
+import logging
+
+from typing import Any, Dict, Iterable, List, Sequence
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+
+logger = logging.getLogger("xof_calculator.xlsx_writer")
+
+CURRENCY_FORMAT = '"$"#,##0.00'
+HOURS_FORMAT = '0.0'
+
+# Columns summed into the Summary and By Role sheets
+NUMERIC_COLUMNS = ('gross_revenue', 'total_cut', 'hours_worked')
+
+def _cell_value(value: Any) -> Any:
+    """Normalize an entry value for a worksheet cell"""
+    if value is None:
+        return 'null'
+    if isinstance(value, (list, tuple)):
+        return ', '.join(str(v) for v in value)
+    return value
+
+def _to_float(value: Any) -> float:
+    """Coerce a stored numeric value, treating missing or malformed values as zero"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def estimate_column_widths(
+    headers: Sequence[str],
+    sample: Iterable[Sequence[Any]]
+) -> List[int]:
+    """
+    Estimate column widths from the header and a sample of rows.
+
+    Args:
+        headers: Column headers
+        sample: Rows used to measure cell lengths
+
+    Returns:
+        List of widths (characters + padding), one per column
+    """
+    widths = [len(str(header)) for header in headers]
+    for row in sample:
+        for index, value in enumerate(row):
+            widths[index] = max(widths[index], len(str(value)))
+    return [width + 2 for width in widths]
+
+def _set_widths(worksheet, widths: List[int]):
+    """Set column widths; in write-only mode this must happen before the first append"""
+    for index, width in enumerate(widths, start=1):
+        worksheet.column_dimensions[get_column_letter(index)].width = width
+
+def _styled(worksheet, value: Any, number_format: str) -> WriteOnlyCell:
+    """Create a write-only cell with a number format"""
+    cell = WriteOnlyCell(worksheet, value=value)
+    cell.number_format = number_format
+    return cell
+
+def write_earnings_workbook(
+    buffer,
+    entries: Sequence[Dict[str, Any]],
+    columns: List[str],
+    sample_rows: int = 1000
+) -> Dict[str, Any]:
+    """
+    Stream earnings entries into an xlsx workbook with constant memory.
+
+    Rows go through openpyxl's write-only mode, so cells are serialized as
+    they are appended instead of being kept in an in-memory workbook.
+    Column widths come from a sample of the first rows, and the Summary and
+    By Role sheets are built from totals accumulated during the same pass.
+
+    Args:
+        buffer: Writable binary file object
+        entries: Earnings entries
+        columns: Entry keys to write to the Earnings sheet, in order
+        sample_rows: Number of leading rows measured for column widths
+
+    Returns:
+        Dictionary with the accumulated totals and per-role totals
+    """
+    workbook = Workbook(write_only=True)
+
+    # Earnings sheet
+    earnings_sheet = workbook.create_sheet('Earnings')
+    sample = [
+        [_cell_value(entry.get(column)) for column in columns]
+        for entry in entries[:sample_rows]
+    ]
+    _set_widths(earnings_sheet, estimate_column_widths(columns, sample))
+    earnings_sheet.append(columns)
+
+    totals = {column: 0.0 for column in NUMERIC_COLUMNS}
+    by_role: Dict[str, Dict[str, float]] = {}
+
+    for entry in entries:
+        earnings_sheet.append([_cell_value(entry.get(column)) for column in columns])
+
+        role = entry.get('role')
+        role_totals = by_role.setdefault(role, {column: 0.0 for column in NUMERIC_COLUMNS}) if role is not None else None
+        for column in NUMERIC_COLUMNS:
+            value = _to_float(entry.get(column))
+            totals[column] += value
+            if role_totals is not None:
+                role_totals[column] += value
+
+    # Summary sheet
+    summary_sheet = workbook.create_sheet('Summary')
+    summary_rows = [
+        ('Total Gross Revenue', totals['gross_revenue'], CURRENCY_FORMAT),
+        ('Total Earnings', totals['total_cut'], CURRENCY_FORMAT),
+        ('Total Hours Worked', totals['hours_worked'], HOURS_FORMAT),
+    ]
+    _set_widths(summary_sheet, estimate_column_widths(
+        ['Metric', 'Value'],
+        [(label, f"{value:,.2f}") for label, value, _ in summary_rows]
+    ))
+    summary_sheet.append(['Metric', 'Value'])
+    for label, value, number_format in summary_rows:
+        summary_sheet.append([label, _styled(summary_sheet, value, number_format)])
+
+    # By Role sheet, same column layout as a pandas pivot_table on role
+    if 'role' in columns:
+        role_sheet = workbook.create_sheet('By Role')
+        role_headers = ['role'] + sorted(NUMERIC_COLUMNS)
+        role_rows = [
+            [role] + [role_totals[column] for column in sorted(NUMERIC_COLUMNS)]
+            for role, role_totals in sorted(by_role.items(), key=lambda item: str(item[0]))
+        ]
+        _set_widths(role_sheet, estimate_column_widths(role_headers, role_rows))
+        role_sheet.append(role_headers)
+        for row in role_rows:
+            role_sheet.append(row)
+
+    workbook.save(buffer)
+    return {'totals': totals, 'by_role': by_role}